@@ -4,34 +4,35 @@ from aiida.manage import manager
 from aiida_gui.app.workchain import router as workchain_router
 from aiida_gui.app.task import router as task_router
 from aiida_gui.app.process_node import router as process_router
-from aiida_gui.app.daemon import router as daemon_router
+from aiida_gui.app.daemon import router as daemon_router, daemon_monitor
 from aiida_gui.app.data_node import router as datanode_router
 from aiida_gui.app.group_node import router as groupnode_router
-from fastapi.staticfiles import StaticFiles
+from aiida_gui.app.jobs import router as jobs_router
+from aiida_gui.app.provenance import router as provenance_router
+from aiida_gui.app.compression import CompressionMiddleware
+from aiida_gui.app.responses import FastJSONResponse
+from aiida_gui.app.metrics import MetricsMiddleware, metrics
+from aiida_gui.app.coalesce import InvalidateOnWriteMiddleware
+from aiida_gui.app.profiling import ProfilingMiddleware, router as profiling_router
+from aiida_gui.app.static import (
+    InMemoryFile,
+    PrecompressedStaticFiles,
+    SinglePageApp,
+)
 from pathlib import Path
 import os
+import time
+import psutil
 
-from fastapi.responses import FileResponse
 from fastapi.exception_handlers import http_exception_handler
+from fastapi.responses import PlainTextResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from pydantic_settings import BaseSettings
-from aiida_gui.app.plugin import get_plugins, mount_plugins
-
-
-class BackendSettings(BaseSettings):
-    """
-    Settings can be set by setting the environment variables in upper case.
-    For example for setting `aiida_workgraph_gui_profile` one has to export
-    the evironment variable `AIIDA_WORKGRAPH_GUI_PROFILE`.
-    """
-
-    aiida_workgraph_gui_profile: str = ""  # if empty aiida uses default profile
+from aiida_gui.app.plugin import mount_plugins, plugin_registry
+from aiida_gui.app.settings import BackendSettings, backend_settings  # noqa: F401
 
-
-backend_settings = BackendSettings()
-
-app = FastAPI()
+# all the responses are rendered with orjson when it is installed
+app = FastAPI(default_response_class=FastJSONResponse)
 manager.get_manager().load_profile(backend_settings.aiida_workgraph_gui_profile)
 
 app.add_middleware(
@@ -43,6 +44,54 @@ app.add_middleware(
 )
 
 
+# seconds since the start of the server process, reported by `/debug`
+startup_timings = {"import": None, "first_response": None}
+_process_start = psutil.Process().create_time()
+
+
+class FirstResponseTimer:
+    """Record the time between the start of the import and the first response."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or startup_timings["first_response"] is not None:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if (
+                message["type"] == "http.response.start"
+                and startup_timings["first_response"] is None
+            ):
+                elapsed = time.time() - _process_start
+                startup_timings["first_response"] = elapsed
+                print(f"aiida-gui: first response after {elapsed:.2f} s")
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+app.add_middleware(FirstResponseTimer)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=backend_settings.aiida_gui_compression_minimum_size,
+)
+app.add_middleware(InvalidateOnWriteMiddleware)
+app.add_middleware(ProfilingMiddleware)
+# plugins are imported and mounted on the first request to their prefix
+mount_plugins(app, lazy=True)
+# outermost, so that the latency includes the other middlewares, and the
+# import of a plugin on its first request
+app.add_middleware(MetricsMiddleware)
+
+
+@app.on_event("startup")
+async def start_daemon_monitor():
+    # sample the daemon worker history even before the daemon page is opened
+    daemon_monitor.start()
+
+
 @app.get("/api", tags=["root"])
 async def read_root() -> dict:
     return {"message": "Welcome to AiiDA."}
@@ -50,10 +99,11 @@ async def read_root() -> dict:
 
 @app.get("/plugins")
 async def list_plugins():
-    plugins = get_plugins()
-    print(f"Found plugins: {plugins.keys()}")
-    plugin_names = [plugin_name for plugin_name in plugins.keys()]
-    return {"plugins": plugin_names}
+    # read from the entry points, without importing the plugins
+    return {
+        "plugins": plugin_registry.names(),
+        "metadata": plugin_registry.metadata(),
+    }
 
 
 app.include_router(workchain_router)
@@ -62,12 +112,26 @@ app.include_router(process_router)
 app.include_router(datanode_router)
 app.include_router(groupnode_router)
 app.include_router(daemon_router)
-mount_plugins(app)
+app.include_router(jobs_router)
+app.include_router(provenance_router)
+app.include_router(profiling_router)
+startup_timings["import"] = time.time() - _process_start
 
 
 @app.get("/debug")
 async def debug() -> dict:
-    return {"loaded_aiida_profile": manager.get_manager().get_profile()}
+    return {
+        "loaded_aiida_profile": manager.get_manager().get_profile(),
+        "startup_timings": startup_timings,
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """Per-route request and SQL metrics, in the Prometheus text format."""
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 @app.get("/backend-setting")
@@ -86,48 +150,51 @@ a request to the FastAPI server for /settings. Since this route isn't defined in
 so we use the index.html serve all routes except API specific ones, then load all static assets.
 """
 backend_dir = Path(__file__).parent
-build_dir = backend_dir / "../static"
-build_dir = os.getenv("REACT_BUILD_DIR", build_dir)
+build_dir = Path(os.getenv("REACT_BUILD_DIR", backend_dir / "../static"))
+# kept in memory and revalidated with their ETag
+index_html = InMemoryFile(build_dir / "index.html", "text/html")
+shims = {
+    name: InMemoryFile(build_dir / name, "application/javascript")
+    for name in (
+        "react-shim.js",
+        "react-jsx-runtime-shim.js",
+        "react-router-dom-shim.js",
+        "use-sync-external-store-shim.js",
+    )
+}
+# requests that no route matches get the app shell directly, the plugins
+# mounted later still take precedence as this only runs when nothing matched
+app.router.default = SinglePageApp(index_html, app.router.default)
 
 
 @app.exception_handler(StarletteHTTPException)
 async def _spa_server(req: Request, exc: StarletteHTTPException):
+    # an endpoint raised a 404 for a path that may be a client-side route
     if exc.status_code == 404:
-        return FileResponse(f"{build_dir}/index.html", media_type="text/html")
-    else:
-        return await http_exception_handler(req, exc)
+        response = index_html.response(req.headers)
+        if response is not None:
+            return response
+    return await http_exception_handler(req, exc)
+
+
+def _shim_route(name):
+    async def serve_shim(request: Request):
+        response = shims[name].response(request.headers)
+        if response is None:
+            raise StarletteHTTPException(status_code=404, detail="shim missing")
+        return response
+
+    return serve_shim
 
 
 if os.path.isdir(build_dir):
     app.mount(
         "/static/",
-        StaticFiles(directory=build_dir / "static"),
+        # serves the .br/.gz files written next to the assets by the build,
+        # with long-lived cache headers for the content-hashed ones
+        PrecompressedStaticFiles(directory=build_dir / "static"),
         name="React app static files",
     )
 
-    @app.get("/react-shim.js", include_in_schema=False)
-    async def react_shim():
-        path = build_dir / "react-shim.js"
-        if not path.is_file():
-            raise StarletteHTTPException(status_code=404, detail="shim missing")
-        return FileResponse(path, media_type="application/javascript")
-
-    @app.get("/react-jsx-runtime-shim.js", include_in_schema=False)
-    async def react_jsx_runtime_shim():
-        return FileResponse(
-            build_dir / "react-jsx-runtime-shim.js", media_type="application/javascript"
-        )
-
-    @app.get("/react-router-dom-shim.js", include_in_schema=False)
-    async def react_router_dom_shim():
-        path = build_dir / "react-router-dom-shim.js"
-        if not path.is_file():
-            raise StarletteHTTPException(status_code=404, detail="shim missing")
-        return FileResponse(path, media_type="application/javascript")
-
-    @app.get("/use-sync-external-store-shim.js", include_in_schema=False)
-    async def use_sync_external_store_shim():
-        path = build_dir / "use-sync-external-store-shim.js"
-        if not path.is_file():
-            raise StarletteHTTPException(status_code=404, detail="shim missing")
-        return FileResponse(path, media_type="application/javascript")
+    for name in shims:
+        app.add_api_route(f"/{name}", _shim_route(name), include_in_schema=False)
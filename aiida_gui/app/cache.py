@@ -0,0 +1,54 @@
+"""Small in-process caches shared by the routers."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """A thread-safe mapping whose entries expire ``ttl`` seconds after being set.
+
+    Expired entries are dropped lazily on access, and the oldest entries are
+    evicted once ``maxsize`` is reached.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                # dicts keep insertion order, so the first key is the oldest
+                del self._data[next(iter(self._data))]
+            self._data[key] = (expires, value)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop ``key``, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+
+_MISSING = object()
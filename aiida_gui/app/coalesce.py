@@ -0,0 +1,116 @@
+"""Share the computation of identical concurrent read requests.
+
+Every open tab of the process list polls the same page every few seconds.
+``SingleFlight.run`` runs the computation of a request in the threadpool and
+lets identical requests arriving meanwhile await the same result; the result
+is then kept for a short ``ttl`` for the requests that arrive just after.
+
+Any write request (POST, PUT, PATCH, DELETE) starts a new generation, so that
+reads after a write never get a result computed before it.
+
+The AiiDA session is thread-local: the session of the threadpool thread is
+closed once the computation is done, so that the idle threads do not keep a
+connection of the pool, open in a transaction on an old snapshot.
+"""
+from __future__ import annotations
+
+import asyncio
+import traceback
+from typing import Any, Callable, Dict, Hashable
+
+from starlette.concurrency import run_in_threadpool
+
+from aiida_gui.app.cache import TTLCache
+from aiida_gui.app.settings import backend_settings
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+_generation = 0
+_MISSING = object()
+
+
+def close_thread_session() -> None:
+    """Close the AiiDA session of the current thread, returning its connection."""
+    from aiida.manage import get_manager
+
+    manager = get_manager()
+    if manager.get_profile() is None:
+        return
+    try:
+        manager.get_profile_storage().get_session().close()
+    except Exception:
+        print(traceback.format_exc())
+
+
+def _run_and_close_session(func: Callable[..., Any], *args, **kwargs) -> Any:
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_thread_session()
+
+
+def bump_generation() -> None:
+    """Invalidate the results computed so far, by all the coalescers."""
+    global _generation
+    _generation += 1
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one computation."""
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self._results = TTLCache(ttl=ttl, maxsize=maxsize) if ttl > 0 else None
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, func: Callable[..., Any], *args, **kwargs):
+        """Return ``func(*args, **kwargs)``, sharing it with identical calls."""
+        key = (_generation, key)
+        if self._results is not None:
+            result = self._results.get(key, _MISSING)
+            if result is not _MISSING:
+                return result
+        loop = asyncio.get_running_loop()
+        future = self._in_flight.get(key)
+        if future is None or future.get_loop() is not loop:
+            future = asyncio.ensure_future(
+                run_in_threadpool(_run_and_close_session, func, *args, **kwargs)
+            )
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._done(key, done))
+        # a disconnecting client must not cancel the computation of the others
+        return await asyncio.shield(future)
+
+    def _done(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        if self._results is not None and key[0] == _generation:
+            self._results.set(key, future.result())
+
+    def invalidate(self) -> None:
+        if self._results is not None:
+            self._results.invalidate()
+
+
+class InvalidateOnWriteMiddleware:
+    """Start a new generation of the coalesced results on every write request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] in WRITE_METHODS:
+            bump_generation()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                # also drop what was computed while the write was running
+                bump_generation()
+            return
+        await self.app(scope, receive, send)
+
+
+def single_flight() -> SingleFlight:
+    """A coalescer with the configured result TTL."""
+    return SingleFlight(ttl=backend_settings.aiida_gui_coalesce_ttl)
@@ -0,0 +1,114 @@
+"""Compress the responses of the web server.
+
+API responses above a size threshold are compressed on the fly, with brotli
+when the optional ``brotli`` package is installed and the client accepts it,
+otherwise with gzip. Static files are not compressed per request, see
+``aiida_gui.app.static``.
+"""
+from __future__ import annotations
+
+import gzip
+from typing import Optional, Set
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """Parse an ``Accept-Encoding`` header, dropping encodings with ``q=0``."""
+    encodings = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        try:
+            quality = float(params.strip()[2:]) if params.strip()[:2] == "q=" else 1
+        except ValueError:
+            quality = 1
+        if name and quality > 0:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses of at least ``minimum_size`` bytes sent in one piece.
+
+    Streamed responses, e.g. large files, and responses that are already
+    encoded are passed through unchanged.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def choose_encoding(self, scope) -> Optional[str]:
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        encoding = self.choose_encoding(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # wait for the body to decide whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start)
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type"))
+            ):
+                await send(start)
+                await send(message)
+                return
+            body = self.compress(body, encoding)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -2,17 +2,275 @@
 """Declaration of FastAPI router for daemon endpoints."""
 from __future__ import annotations
 
+import threading
+import time
 import typing as t
+from collections import deque
 
 from aiida.cmdline.utils.decorators import with_dbenv
-from aiida.engine.daemon.client import DaemonException, get_daemon_client
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from aiida_gui.app.cache import TTLCache
+from aiida_gui.app.coalesce import close_thread_session, single_flight
+from aiida_gui.app.settings import backend_settings
+from aiida_gui.app.timeseries import RingBuffer
+
 
 router = APIRouter()
 
 
+class WorkerHistory:
+    """Resource usage time series of the daemon workers, in ring buffers.
+
+    For each worker the CPU percentage, the resident memory (bytes) and the
+    number of child processes are recorded. Workers that stopped are dropped
+    once all their samples are older than the window.
+    """
+
+    series = ("time", "cpu", "rss", "children")
+
+    def __init__(self, size: int, interval: float, max_workers: int = 64):
+        self.size = size
+        self.window = size * interval
+        self.max_workers = max_workers
+        self._workers: t.Dict[int, t.Dict[str, RingBuffer]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, workers: dict, now: float) -> None:
+        with self._lock:
+            for pid, info in workers.items():
+                pid = int(pid)
+                buffers = self._workers.get(pid)
+                if buffers is None:
+                    if len(self._workers) >= self.max_workers:
+                        continue
+                    buffers = {name: RingBuffer(self.size) for name in self.series}
+                    self._workers[pid] = buffers
+                buffers["time"].append(now)
+                buffers["cpu"].append(_to_float(info.get("cpu")))
+                buffers["rss"].append(_worker_rss(pid))
+                buffers["children"].append(len(info.get("children") or []))
+            # forget stopped workers once all their samples left the window
+            active = {int(pid) for pid in workers}
+            for pid in [pid for pid in self._workers if pid not in active]:
+                if now - self._workers[pid]["time"].values()[-1] > self.window:
+                    del self._workers[pid]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                pid: {name: buffer.values() for name, buffer in buffers.items()}
+                for pid, buffers in self._workers.items()
+            }
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        # circus reports "N/A" when it could not read the value
+        return 0.0
+
+
+def _worker_rss(pid: int) -> float:
+    import psutil
+
+    try:
+        return float(psutil.Process(pid).memory_info().rss)
+    except (psutil.Error, OSError):
+        return 0.0
+
+
+ACTIVE_STATES = ("created", "waiting", "running")
+TERMINATED_STATES = ("finished", "excepted", "killed")
+# longest window of the process metrics, in minutes
+MAX_METRICS_WINDOW = 1440
+
+
+class TerminationTracker:
+    """The times at which the processes are seen terminating.
+
+    AiiDA records no end time, and the ``mtime`` of a terminated process also
+    changes when e.g. its label or extras are edited afterwards. Each
+    ``observe`` reads the active processes: those active at the previous
+    observation and terminated now ended in between, and are stamped with
+    their ``mtime`` capped by the time of the observation.
+    """
+
+    def __init__(self, keep: float):
+        self.keep = keep
+        # time of the first observation, nothing is known before it
+        self.since = None
+        self._active: t.Optional[t.Set[int]] = None
+        self._ended: t.Deque = deque()
+        self._lock = threading.Lock()
+        # two overlapping observations could count a termination twice
+        self._observing = threading.Lock()
+
+    def observe(self) -> None:
+        with self._observing:
+            self._observe()
+
+    def _observe(self) -> None:
+        from datetime import timedelta
+        from aiida import orm
+        from aiida.common import timezone
+
+        now = timezone.now()
+        qb = orm.QueryBuilder()
+        qb.append(
+            orm.ProcessNode,
+            filters={"attributes.process_state": {"in": ACTIVE_STATES}},
+            project="id",
+        )
+        active = set(qb.all(flat=True))
+        with self._lock:
+            previous, self._active = self._active, active
+            if previous is None:
+                self.since = now
+                return
+        left = previous - active
+        ended = []
+        if left:
+            qb = orm.QueryBuilder()
+            qb.append(
+                orm.ProcessNode,
+                filters={
+                    "id": {"in": list(left)},
+                    "attributes.process_state": {"in": TERMINATED_STATES},
+                },
+                project="mtime",
+            )
+            ended = sorted(min(mtime, now) for mtime in qb.all(flat=True))
+        with self._lock:
+            self._ended.extend(ended)
+            while self._ended and self._ended[0] < now - timedelta(seconds=self.keep):
+                self._ended.popleft()
+
+    def count(self, since) -> int:
+        """The number of processes seen terminating after ``since``."""
+        with self._lock:
+            return sum(1 for ended in self._ended if ended > since)
+
+
+termination_tracker = TerminationTracker(keep=MAX_METRICS_WINDOW * 60)
+
+
+class DaemonMonitor:
+    """Poll the daemon status in a background thread.
+
+    Every browser tab on the daemon page polls the status each second. Instead
+    of calling the circus RPC for each of these requests, a single thread
+    refreshes a snapshot of the status every ``interval`` seconds and all read
+    endpoints are served from it. The thread pauses when nobody has read the
+    snapshot for ``idle_timeout`` seconds, except for sampling the worker
+    resource ``history`` every ``history_interval`` seconds. The processes
+    terminating are observed at the same pace, see ``TerminationTracker``.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        idle_timeout: float = 60,
+        history_interval: float = 10,
+        history_size: int = 360,
+    ):
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.history_interval = history_interval
+        self.history = WorkerHistory(history_size, history_interval)
+        self._next_sample = 0.0
+        self._snapshot: t.Optional[dict] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread: t.Optional[threading.Thread] = None
+        self._last_read = 0.0
+
+    def refresh(self) -> dict:
+        """Query the daemon and store a new snapshot."""
+        from aiida.engine.daemon.client import DaemonException, get_daemon_client
+
+        client = get_daemon_client()
+        snapshot = {"running": False, "num_workers": None, "workers": {}}
+        try:
+            if client.is_daemon_running:
+                info = client.get_worker_info()["info"]
+                snapshot = {"running": True, "num_workers": len(info), "workers": info}
+        except DaemonException:
+            pass
+        snapshot["updated"] = time.time()
+        with self._lock:
+            self._snapshot = snapshot
+            sample = time.monotonic() >= self._next_sample
+            if sample:
+                self._next_sample = time.monotonic() + self.history_interval
+        if sample:
+            self.history.record(snapshot["workers"], snapshot["updated"])
+            self._observe_terminations()
+        return snapshot
+
+    @staticmethod
+    def _observe_terminations() -> None:
+        try:
+            termination_tracker.observe()
+        except Exception as e:
+            print(f"Failed to observe the terminated processes: {e}")
+        finally:
+            # the poller thread must not keep a transaction open between samples
+            close_thread_session()
+
+    def start(self) -> None:
+        """Start the poller, e.g. at startup to record the history from the start."""
+        self._ensure_started()
+
+    def snapshot(self) -> dict:
+        """Return the latest snapshot, starting the poller if needed."""
+        self._last_read = time.monotonic()
+        self._ensure_started()
+        with self._lock:
+            snapshot = self._snapshot
+        # no snapshot yet, or an old one because the poller was idle
+        if snapshot is None or time.time() - snapshot["updated"] > 2 * self.interval:
+            snapshot = self.refresh()
+        return snapshot
+
+    def _ensure_started(self) -> None:
+        self._wake.set()
+        # concurrent first requests must not start two pollers
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._poll, name="aiida-gui-daemon-monitor", daemon=True
+                )
+                self._thread.start()
+
+    def _poll(self) -> None:
+        while True:
+            # readers refresh a missing or stale snapshot themselves
+            time.sleep(self.interval)
+            now = time.monotonic()
+            if now - self._last_read > self.idle_timeout and now < self._next_sample:
+                # idle: sleep until the next history sample, or a new reader
+                self._wake.clear()
+                self._wake.wait(timeout=self._next_sample - now)
+                continue
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Failed to refresh the daemon status: {e}")
+
+
+daemon_monitor = DaemonMonitor(
+    backend_settings.aiida_gui_daemon_poll_interval,
+    history_interval=backend_settings.aiida_gui_daemon_history_interval,
+    history_size=backend_settings.aiida_gui_daemon_history_size,
+)
+# the daemon page polls the workers every second in each open tab
+daemon_flight = single_flight()
+
+
 class DaemonStatusModel(BaseModel):
     """Response model for daemon status."""
 
@@ -26,34 +284,128 @@ class DaemonStatusModel(BaseModel):
 @with_dbenv()
 async def get_daemon_status() -> DaemonStatusModel:
     """Return the daemon status."""
-    client = get_daemon_client()
-
-    if not client.is_daemon_running:
-        return DaemonStatusModel(running=False, num_workers=None)
-
-    response = client.get_numprocesses()
-
-    return DaemonStatusModel(running=True, num_workers=response["numprocesses"])
+    snapshot = await daemon_flight.run("snapshot", daemon_monitor.snapshot)
+    return DaemonStatusModel(
+        running=snapshot["running"], num_workers=snapshot["num_workers"]
+    )
 
 
 @router.get("/api/daemon/worker")
 @with_dbenv()
 async def get_daemon_worker():
     """Return the daemon status."""
-    client = get_daemon_client()
+    snapshot = await daemon_flight.run("snapshot", daemon_monitor.snapshot)
+    return snapshot["workers"]
+
+
+@router.get("/api/daemon/worker-history")
+async def get_daemon_worker_history():
+    """Return the resource usage time series of each daemon worker, keyed by PID."""
+    daemon_monitor.start()
+    return daemon_monitor.history.to_dict()
+
+
+# the process metrics are aggregates over the whole database, recompute them
+# at most every ``METRICS_TTL`` seconds
+METRICS_TTL = 10
+_metrics_cache = TTLCache(ttl=METRICS_TTL, maxsize=16)
 
-    if not client.is_daemon_running:
-        return {}
 
-    response = client.get_worker_info()
+def _count_active_processes() -> t.Dict[str, int]:
+    """Count the active processes per state, with a single grouped query."""
+    from aiida.manage import get_manager
+    import sqlalchemy as sa
 
-    return response["info"]
+    # the QueryBuilder has no GROUP BY; the generic JSON type is rendered for
+    # the dialect of the storage backend, PostgreSQL or SQLite
+    nodes = sa.table(
+        "db_dbnode",
+        sa.column("node_type", sa.String),
+        sa.column("attributes", sa.JSON),
+    )
+    state = nodes.c.attributes["process_state"].as_string()
+    statement = (
+        sa.select(state, sa.func.count())
+        .where(nodes.c.node_type.like("process.%"), state.in_(ACTIVE_STATES))
+        .group_by(state)
+    )
+    session = get_manager().get_profile_storage().get_session()
+    return dict(session.execute(statement).all())
+
+
+def get_process_metrics(window: int) -> dict:
+    metrics = _metrics_cache.get(window)
+    if metrics is None:
+        metrics = compute_process_metrics(window)
+        _metrics_cache.set(window, metrics)
+    return metrics
+
+
+def compute_process_metrics(window: int) -> dict:
+    """
+    Count the processes created in the last ``window`` minutes, the active
+    ones per state with one grouped query, and the processes seen terminating
+    in the same window.
+    """
+    from datetime import timedelta
+    from aiida import orm
+    from aiida.common import timezone
+    from aiida.manage.configuration import get_config_option
+
+    now = timezone.now()
+    since = now - timedelta(minutes=window)
+    qb = orm.QueryBuilder()
+    qb.append(orm.ProcessNode, filters={"ctime": {">": since}})
+    created = qb.count()
+    counts = _count_active_processes()
+    states = {state: counts.get(state, 0) for state in ACTIVE_STATES}
+    active = sum(states.values())
+    # the terminations are only known since the first observation
+    termination_tracker.observe()
+    observed = (now - termination_tracker.since).total_seconds() / 60
+    finished_window = max(1.0, min(window, observed))
+    finished = termination_tracker.count(since)
+
+    snapshot = daemon_monitor.snapshot()
+    num_workers = snapshot["num_workers"] or 0
+    slots_per_worker = get_config_option("daemon.worker_process_slots")
+    total_slots = num_workers * slots_per_worker
+    return {
+        "window": window,
+        "created_per_minute": created / window,
+        "finished_per_minute": finished / finished_window,
+        "finished_window": finished_window,
+        "states": states,
+        "active": active,
+        "num_workers": num_workers,
+        "slots_per_worker": slots_per_worker,
+        "total_slots": total_slots,
+        "slot_usage": active / total_slots if total_slots else None,
+        "workers": {
+            pid: {"cpu": info.get("cpu"), "mem": info.get("mem")}
+            for pid, info in snapshot["workers"].items()
+        },
+        "updated": time.time(),
+    }
+
+
+@router.get("/api/daemon/metrics")
+@with_dbenv()
+async def get_daemon_metrics(window: int = Query(10, ge=1, le=MAX_METRICS_WINDOW)):
+    """
+    Return the process throughput (per minute, averaged over the last
+    ``window`` minutes), the backlog of active processes per state and the
+    usage of the daemon worker slots.
+    """
+    return await daemon_flight.run(("metrics", window), get_process_metrics, window)
 
 
 @router.post("/api/daemon/start", response_model=DaemonStatusModel)
 @with_dbenv()
 async def get_daemon_start() -> DaemonStatusModel:
     """Start the daemon."""
+    from aiida.engine.daemon.client import DaemonException, get_daemon_client
+
     client = get_daemon_client()
 
     if client.is_daemon_running:
@@ -65,6 +417,7 @@ async def get_daemon_start() -> DaemonStatusModel:
         raise HTTPException(status_code=500, detail=str(exception)) from exception
 
     response = client.get_numprocesses()
+    daemon_monitor.refresh()
 
     return DaemonStatusModel(running=True, num_workers=response["numprocesses"])
 
@@ -73,6 +426,8 @@ async def get_daemon_start() -> DaemonStatusModel:
 @with_dbenv()
 async def get_daemon_stop() -> DaemonStatusModel:
     """Stop the daemon."""
+    from aiida.engine.daemon.client import DaemonException, get_daemon_client
+
     client = get_daemon_client()
 
     if not client.is_daemon_running:
@@ -82,6 +437,7 @@ async def get_daemon_stop() -> DaemonStatusModel:
         client.stop_daemon()
     except DaemonException as exception:
         raise HTTPException(status_code=500, detail=str(exception)) from exception
+    daemon_monitor.refresh()
 
     return DaemonStatusModel(running=False, num_workers=None)
 
@@ -90,6 +446,8 @@ async def get_daemon_stop() -> DaemonStatusModel:
 @with_dbenv()
 async def increase_daemon_worker() -> DaemonStatusModel:
     """increase the daemon worker."""
+    from aiida.engine.daemon.client import DaemonException, get_daemon_client
+
     client = get_daemon_client()
 
     if not client.is_daemon_running:
@@ -99,6 +457,7 @@ async def increase_daemon_worker() -> DaemonStatusModel:
         client.increase_workers(1)
     except DaemonException as exception:
         raise HTTPException(status_code=500, detail=str(exception)) from exception
+    daemon_monitor.refresh()
 
     return DaemonStatusModel(running=False, num_workers=None)
 
@@ -107,6 +466,8 @@ async def increase_daemon_worker() -> DaemonStatusModel:
 @with_dbenv()
 async def decrease_daemon_worker() -> DaemonStatusModel:
     """decrease the daemon worker."""
+    from aiida.engine.daemon.client import DaemonException, get_daemon_client
+
     client = get_daemon_client()
 
     if not client.is_daemon_running:
@@ -116,5 +477,6 @@ async def decrease_daemon_worker() -> DaemonStatusModel:
         client.decrease_workers(1)
     except DaemonException as exception:
         raise HTTPException(status_code=500, detail=str(exception)) from exception
+    daemon_monitor.refresh()
 
     return DaemonStatusModel(running=False, num_workers=None)
@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import Dict, Any
 from fastapi import HTTPException
 from aiida_gui.app.node_table import make_node_router
-from weas_widget.utils import ASEAdapter
+from aiida_gui.app.responses import FastJSONResponse
 from aiida import orm
 
 project = ["id", "uuid", "ctime", "node_type", "label", "description"]
@@ -19,11 +19,14 @@ async def read_data_node_item(id: int) -> Dict[str, Any]:
         content["node_type"] = node.node_type
         # TrajectoryData
         if isinstance(node, orm.TrajectoryData):
+            # weas_widget pulls in ASE, so it is only imported when needed
+            from weas_widget.utils import ASEAdapter
+
             weas_atoms = []
             for i in range(node.numsteps):
                 atoms = node.get_step_structure(i).get_ase()
                 weas_atoms.append(ASEAdapter.to_weas(atoms))
             content["extras"] = weas_atoms
-        return content
+        return FastJSONResponse(content)
     except KeyError:
         raise HTTPException(status_code=404, detail=f"Data node {id} not found")
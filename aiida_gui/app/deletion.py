@@ -0,0 +1,78 @@
+"""Reuse the node set computed by a deletion dry run.
+
+Finding the nodes to delete means traversing the provenance graph, which is
+the expensive part of a deletion. The dry run stores the computed set under a
+token; confirming the deletion with that token deletes exactly this set,
+provided nothing changed in between, instead of traversing the graph again.
+"""
+from __future__ import annotations
+
+import uuid
+from typing import Iterable, Optional, Set, Tuple
+
+from aiida import orm
+from aiida_gui.app.cache import TTLCache
+
+# seconds a dry-run token stays valid
+DRY_RUN_TTL = 600
+_dry_runs = TTLCache(ttl=DRY_RUN_TTL, maxsize=256)
+
+
+def _max_node_id() -> int:
+    qb = orm.QueryBuilder()
+    qb.append(orm.Node, project="id", tag="node")
+    qb.order_by({"node": {"id": "desc"}})
+    qb.limit(1)
+    return qb.first(flat=True) or 0
+
+
+def dry_run_delete(pks: Iterable[int]) -> Tuple[Set[int], str]:
+    """Return the nodes that deleting ``pks`` would delete, and a token for them."""
+    from aiida.common import timezone
+    from aiida.tools import delete_nodes
+
+    pks = frozenset(pks)
+    # taken before the traversal, so changes made during it invalidate the token
+    issued = timezone.now()
+    max_id = _max_node_id()
+    nodes, _ = delete_nodes(pks, dry_run=True)
+    token = uuid.uuid4().hex
+    _dry_runs.set(
+        token,
+        {"pks": pks, "nodes": frozenset(nodes), "issued": issued, "max_id": max_id},
+    )
+    return set(nodes), token
+
+
+def pop_dry_run(token: str, pks: Iterable[int]) -> Optional[Set[int]]:
+    """
+    Return the node set stored under ``token`` if it was computed for ``pks``
+    and is still valid, otherwise None. A token can only be used once.
+    """
+    entry = _dry_runs.get(token)
+    _dry_runs.invalidate(token)
+    if entry is None or entry["pks"] != frozenset(pks):
+        return None
+    if not _is_unchanged(entry["nodes"], entry["issued"], entry["max_id"]):
+        return None
+    return set(entry["nodes"])
+
+
+def _is_unchanged(nodes, issued, max_id: int) -> bool:
+    """
+    Check that no node of the set was modified since the dry run and that no
+    new node was created from one of them, which would have to be deleted too.
+    """
+    if not nodes:
+        return True
+    ids = list(nodes)
+
+    qb = orm.QueryBuilder()
+    qb.append(orm.Node, filters={"id": {"in": ids}, "mtime": {">": issued}})
+    if qb.count():
+        return False
+
+    qb = orm.QueryBuilder()
+    qb.append(orm.Node, filters={"id": {"in": ids}}, tag="old")
+    qb.append(orm.Node, with_incoming="old", filters={"id": {">": max_id}})
+    return qb.count() == 0
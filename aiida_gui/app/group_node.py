@@ -1,12 +1,61 @@
 from __future__ import annotations
 from typing import Dict, Optional, Union, List
 from fastapi import HTTPException, Query
+from pydantic import BaseModel
 from aiida_gui.app.node_table import make_node_router
+from aiida_gui.app.cache import TTLCache
+from aiida_gui.app.responses import FastJSONResponse
 from aiida import orm
 import traceback
 
 project = ["id", "uuid", "time", "label", "description"]
 
+# Number of nodes per group. Counting the members of a large group is expensive,
+# so the result is cached and refreshed after ``GROUP_COUNT_TTL`` seconds, or
+# earlier when the members are changed through the GUI.
+GROUP_COUNT_TTL = 60
+group_count_cache = TTLCache(ttl=GROUP_COUNT_TTL, maxsize=4096)
+
+
+def count_group_nodes(group_ids: List[int]) -> Dict[int, int]:
+    """
+    Return the number of nodes of each group in ``group_ids``.
+    Cached counts are reused, the others are computed with a single
+    aggregated query and stored in the cache.
+    """
+    counts = {}
+    missing = []
+    for gid in group_ids:
+        count = group_count_cache.get(gid)
+        if count is None:
+            missing.append(gid)
+        else:
+            counts[gid] = count
+    if missing:
+        fresh = _query_group_counts(missing)
+        for gid in missing:
+            counts[gid] = fresh.get(gid, 0)
+            group_count_cache.set(gid, counts[gid])
+    return counts
+
+
+def _query_group_counts(group_ids: List[int]) -> Dict[int, int]:
+    """Count the members of several groups with one ``GROUP BY`` query."""
+    from sqlalchemy import bindparam, text
+    from aiida.manage import get_manager
+
+    try:
+        session = get_manager().get_profile_storage().get_session()
+    except AttributeError:
+        # storage backend without an SQLAlchemy session
+        return {gid: orm.load_group(gid).count() for gid in group_ids}
+
+    stmt = text(
+        "SELECT dbgroup_id, COUNT(*) FROM db_dbgroup_dbnodes "
+        "WHERE dbgroup_id IN :ids GROUP BY dbgroup_id"
+    ).bindparams(bindparam("ids", expanding=True))
+    return {gid: count for gid, count in session.execute(stmt, {"ids": group_ids})}
+
 
 def projected_data_to_dict(qb, project):
     """
@@ -41,6 +90,9 @@ def projected_data_to_dict_group(qb, project):
         item["pk"] = item.pop("id")
         item["ctime"] = time_ago(item.get("time"))
         results.append(item)
+    counts = count_group_nodes([item["pk"] for item in results])
+    for item in results:
+        item["count"] = counts[item["pk"]]
     return results
 
 
@@ -63,29 +115,22 @@ async def read_group_summary(id: int) -> Dict[str, Union[str, int]]:
             "label": g.label,
             "description": g.description or "",
             "type_string": g.type_string,
-            "count": g.count(),
+            "count": count_group_nodes([g.pk])[g.pk],
         }
         return summary
     except Exception:
         raise HTTPException(status_code=404, detail=f"Group {id} not found")
 
 
-# ---------------------------------------------------------------------------
-# ─ 3. paginated members
-#      GET /api/groupnode/{id}/members-data   (same contract as -data)
-# ---------------------------------------------------------------------------
-@router.get("/api/groupnode/{id}/members-data")
-async def read_group_members(
-    id: int,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(15, gt=0, le=500),
-    sortField: str = Query("pk"),
-    sortOrder: str = Query("desc", pattern="^(asc|desc)$"),
-    filterModel: Optional[str] = Query(None),
-):
+member_project = ["id", "ctime", "node_type", "label", "description"]
 
-    project = ["id", "ctime", "node_type", "label", "description"]
 
+def members_query(id: int, filterModel: Optional[str] = None):
+    """
+    Return a QueryBuilder over the nodes of group ``id``, restricted by the
+    DataGrid ``filterModel``, together with the translated node filters.
+    The nodes are tagged ``node`` and nothing is projected yet.
+    """
     qb = orm.QueryBuilder()
     qb.append(
         orm.Group,
@@ -96,35 +141,84 @@ async def read_group_members(
     )
     qb.append(
         orm.Node,
-        project=project,
         with_group="group",
         tag="node",
     )
 
     # server‑side filters coming from the DataGrid
+    filters = {}
     if filterModel:
         from aiida_gui.app.utils import (
             translate_datagrid_filter_json,
         )
 
-        qb.add_filter(
-            "node", translate_datagrid_filter_json(filterModel, project=project)
-        )
+        filters = translate_datagrid_filter_json(filterModel, project=member_project)
+        qb.add_filter("node", filters)
+    return qb, filters
 
+
+# ---------------------------------------------------------------------------
+# ─ 3. paginated members
+#      GET /api/groupnode/{id}/members-data   (same contract as -data)
+# ---------------------------------------------------------------------------
+@router.get("/api/groupnode/{id}/members-data")
+async def read_group_members(
+    id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(15, gt=0, le=500),
+    sortField: str = Query("pk"),
+    sortOrder: str = Query("desc", pattern="^(asc|desc)$"),
+    filterModel: Optional[str] = Query(None),
+):
+
+    qb, filters = members_query(id, filterModel)
+    qb.add_projection("node", member_project)
     qb.order_by({"node": {sortField: sortOrder}})
-    total = qb.count()
+    # without a filter the total is simply the (cached) size of the group
+    total = qb.count() if filters else count_group_nodes([id])[id]
     qb.offset(skip).limit(limit)
 
-    results = projected_data_to_dict(qb, project)
-    return {"total": total, "data": results}
+    results = projected_data_to_dict(qb, member_project)
+    return FastJSONResponse({"total": total, "data": results})
+
+
+def delete_group_job(id: int, delete_nodes: bool):
+    """Return a job function deleting group ``id`` and optionally its nodes."""
+    from aiida_gui.app.jobs import delete_nodes_job
+
+    def run(job):
+        result = {"deleted": True, "count": 0}
+        if delete_nodes:
+            qb = orm.QueryBuilder()
+            qb.append(orm.Group, filters={"id": id}, tag="group")
+            qb.append(orm.Node, with_group="group", project="id")
+            result = delete_nodes_job(qb.all(flat=True))(job)
+        orm.Group.collection.delete(id)
+        group_count_cache.invalidate(id)
+        return result
+
+    return run
 
 
 @router.delete("/api/groupnode/delete" + "/{id}")
 async def delete(
-    id: int, dry_run: bool = False, delete_nodes: bool = False
+    id: int, dry_run: bool = False, delete_nodes: bool = False, background: bool = False
 ) -> Dict[str, Union[bool, str, List[int]]]:
     from aiida.tools import delete_group_nodes
 
+    if background and not dry_run:
+        from aiida_gui.app.jobs import job_manager
+
+        job = job_manager.submit(
+            "delete",
+            f"Delete Group {id}" + (" and its nodes" if delete_nodes else ""),
+            delete_group_job(id, delete_nodes),
+        )
+        return {
+            "deleted": False,
+            "job_id": job.id,
+            "message": f"Queued deletion of Group {id}",
+        }
     try:
         if dry_run:
             return {
@@ -140,6 +234,7 @@ async def delete(
         else:
             orm.Group.collection.delete(id)
             ok = True
+        group_count_cache.invalidate(id)
         return {
             "deleted": ok,
             "message": (
@@ -161,6 +256,7 @@ async def delete_node(
     try:
         group = orm.load_group(group_id)
         group.remove_nodes([orm.load_node(node_id)])
+        group_count_cache.invalidate(group_id)
         return {
             "removed": True,
             "message": f"Removed node {node_id} from the group",
@@ -169,3 +265,169 @@ async def delete_node(
         error_traceback = traceback.format_exc()  # Capture the full traceback
         print(error_traceback)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+class GroupMembersPayload(BaseModel):
+    """Nodes to add to or remove from a group: explicit pks or a DataGrid filter."""
+
+    pks: Optional[List[int]] = None
+    filterModel: Optional[str] = None
+
+
+def _load_nodes(pks: List[int]) -> List[int]:
+    """Return the pks of the existing nodes among ``pks``, with a single query."""
+    qb = orm.QueryBuilder()
+    qb.append(orm.Node, filters={"id": {"in": list(set(pks))}}, project="id")
+    return qb.all(flat=True)
+
+
+# memberships changed per statement, two bound parameters per row stay well
+# below the limit of SQLite
+MEMBERS_CHUNK_SIZE = 500
+# the dialects supporting ``INSERT ... ON CONFLICT DO NOTHING``
+_INSERT_DIALECTS = {
+    "postgresql": "sqlalchemy.dialects.postgresql",
+    "sqlite": "sqlalchemy.dialects.sqlite",
+}
+
+
+def _chunks(items: List[int]):
+    for start in range(0, len(items), MEMBERS_CHUNK_SIZE):
+        yield items[start : start + MEMBERS_CHUNK_SIZE]
+
+
+def _members_table():
+    """The group-node table, the same in all the SQL storage backends."""
+    import sqlalchemy as sa
+
+    return sa.table(
+        "db_dbgroup_dbnodes", sa.column("dbgroup_id"), sa.column("dbnode_id")
+    )
+
+
+def _members_session():
+    """The SQLAlchemy session and dialect name, None without an SQL backend."""
+    from aiida.manage import get_manager
+
+    try:
+        session = get_manager().get_profile_storage().get_session()
+    except AttributeError:
+        return None, None
+    return session, session.get_bind().dialect.name
+
+
+def _load_members(group: orm.Group, pks: List[int]) -> List[orm.Node]:
+    """The nodes among ``pks`` that are members of ``group``."""
+    qb = orm.QueryBuilder()
+    qb.append(orm.Group, filters={"id": group.pk}, tag="group")
+    qb.append(orm.Node, with_group="group", filters={"id": {"in": pks}})
+    return qb.all(flat=True)
+
+
+def add_group_members(group: orm.Group, pks: List[int]) -> None:
+    """Add the nodes ``pks`` to ``group``, ignoring those already in it."""
+    import importlib
+    from aiida.manage import get_manager
+
+    session, dialect = _members_session()
+    if dialect not in _INSERT_DIALECTS:
+        # storage backend without an SQL session: through the ORM, in batches
+        for chunk in _chunks(pks):
+            qb = orm.QueryBuilder()
+            qb.append(orm.Node, filters={"id": {"in": chunk}})
+            group.add_nodes(qb.all(flat=True))
+        return
+    insert = importlib.import_module(_INSERT_DIALECTS[dialect]).insert
+    table = _members_table()
+    with get_manager().get_profile_storage().transaction():
+        for chunk in _chunks(pks):
+            rows = [{"dbgroup_id": group.pk, "dbnode_id": pk} for pk in chunk]
+            session.execute(insert(table).values(rows).on_conflict_do_nothing())
+
+
+def remove_group_members(group: orm.Group, pks: List[int]) -> int:
+    """Remove the nodes ``pks`` from ``group``, return how many were members."""
+    import sqlalchemy as sa
+    from aiida.manage import get_manager
+
+    session, dialect = _members_session()
+    count = 0
+    if session is None:
+        for chunk in _chunks(pks):
+            nodes = _load_members(group, chunk)
+            group.remove_nodes(nodes)
+            count += len(nodes)
+        return count
+    table = _members_table()
+    with get_manager().get_profile_storage().transaction():
+        for chunk in _chunks(pks):
+            statement = sa.delete(table).where(
+                table.c.dbgroup_id == group.pk, table.c.dbnode_id.in_(chunk)
+            )
+            count += session.execute(statement).rowcount
+    return count
+
+
+@router.post("/api/groupnode/{group_id}/members/add")
+async def add_nodes(
+    group_id: int, payload: GroupMembersPayload
+) -> Dict[str, Union[bool, str, int]]:
+    if not payload.pks:
+        raise HTTPException(status_code=400, detail="No nodes provided")
+    try:
+        group = orm.load_group(group_id)
+    except Exception:
+        raise HTTPException(status_code=404, detail=f"Group {group_id} not found")
+
+    try:
+        pks = _load_nodes(payload.pks)
+        missing = set(payload.pks) - set(pks)
+        if missing:
+            raise HTTPException(
+                status_code=404, detail=f"Nodes {sorted(missing)} not found"
+            )
+        add_group_members(group, pks)
+        group_count_cache.invalidate(group_id)
+        return {
+            "added": True,
+            "count": len(pks),
+            "message": f"Added {len(pks)} nodes to the group",
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_traceback = traceback.format_exc()  # Capture the full traceback
+        print(error_traceback)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/api/groupnode/{group_id}/members/remove")
+async def remove_nodes(
+    group_id: int, payload: GroupMembersPayload
+) -> Dict[str, Union[bool, str, int]]:
+    """Remove the nodes given by ``pks``, or all members matching ``filterModel``."""
+    if not payload.pks and payload.filterModel is None:
+        raise HTTPException(status_code=400, detail="No nodes provided")
+    try:
+        group = orm.load_group(group_id)
+    except Exception:
+        raise HTTPException(status_code=404, detail=f"Group {group_id} not found")
+
+    try:
+        if payload.pks:
+            members = sorted(set(payload.pks))
+        else:
+            qb, _ = members_query(group_id, payload.filterModel)
+            qb.add_projection("node", "id")
+            members = qb.all(flat=True)
+        count = remove_group_members(group, members)
+        group_count_cache.invalidate(group_id)
+        return {
+            "removed": True,
+            "count": count,
+            "message": f"Removed {count} nodes from the group",
+        }
+    except Exception as e:
+        error_traceback = traceback.format_exc()  # Capture the full traceback
+        print(error_traceback)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,347 @@
+"""Background jobs for long-running destructive operations.
+
+Deleting a large provenance graph can take minutes, so instead of running it
+inside the request, the delete endpoints can submit a job to an in-process
+queue. A single worker thread runs the jobs one after the other; the status
+and progress of each job are written to a JSON file so that they survive a
+restart of the web server, and can be polled through ``/api/jobs`` from any
+of the server worker processes. The files are kept per AiiDA profile, so the
+GUIs of different profiles do not see each other's jobs.
+"""
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from fastapi import APIRouter, HTTPException
+
+
+router = APIRouter()
+
+# number of nodes deleted per statement, progress is reported after each chunk
+DELETE_CHUNK_SIZE = 1000
+# number of finished jobs kept in the status file
+MAX_FINISHED_JOBS = 100
+
+FINAL_STATES = ("finished", "failed", "cancelled", "interrupted")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it was cancelled by the user."""
+
+
+class Job:
+    """A unit of work running in the background, with its status and progress."""
+
+    def __init__(self, kind: str, description: str, id: Optional[str] = None):
+        self.id = id or uuid.uuid4().hex
+        self.kind = kind
+        self.description = description
+        self.status = "queued"
+        self.stage = ""
+        # the stage has no measurable progress, e.g. the graph traversal
+        self.indeterminate = False
+        self.progress: Dict[str, int] = {}
+        self.message = ""
+        self.result: Any = None
+        self.created = time.time()
+        self.updated = self.created
+        # pid of the server process running the job
+        self.owner = os.getpid()
+        # set once the job cannot be cancelled anymore
+        self.committing = False
+        self._cancel = threading.Event()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def check_cancelled(self) -> None:
+        """Abort the job if its cancellation was requested."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "description": self.description,
+            "status": self.status,
+            "stage": self.stage,
+            "indeterminate": self.indeterminate,
+            "progress": self.progress,
+            "message": self.message,
+            "result": self.result,
+            "created": self.created,
+            "updated": self.updated,
+            "owner": self.owner,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        job = cls(data["kind"], data["description"], id=data["id"])
+        for key in (
+            "status",
+            "stage",
+            "indeterminate",
+            "progress",
+            "message",
+            "result",
+        ):
+            setattr(job, key, data.get(key, getattr(job, key)))
+        job.created = data.get("created", job.created)
+        job.updated = data.get("updated", job.updated)
+        job.owner = data.get("owner")
+        return job
+
+
+def get_jobs_dir_path(profile_name: Optional[str] = None) -> Path:
+    """Get the path of the directory that persists the job status of a profile."""
+    if profile_name is None:
+        from aiida.manage import get_manager
+
+        profile_name = get_manager().get_profile().name
+    return Path.home() / ".aiida" / "daemon" / "web_jobs" / profile_name
+
+
+class JobManager:
+    """Queue jobs and run them one by one in a worker thread.
+
+    Each job is stored in ``{path}/{id}.json``. When the server runs several
+    worker processes, a job is only known in memory by the process running
+    it; the others read its file, and request its cancellation by creating a
+    ``{id}.cancel`` file that the running process checks.
+
+    The ``path`` can also be given as a function, called on first use, e.g.
+    once the AiiDA profile is loaded.
+    """
+
+    def __init__(self, path: Union[Path, Callable[[], Path], None] = None):
+        self._path = path
+        self._jobs: Dict[str, Job] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.RLock()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def path(self) -> Optional[Path]:
+        if callable(self._path):
+            self._path = self._path()
+        return self._path
+
+    # ------------------------------------------------------------ public API
+    def submit(self, kind: str, description: str, func: Callable[[Job], Any]) -> Job:
+        """Queue ``func(job)`` and return the job, its return value becomes the result."""
+        job = Job(kind, description)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._save(job)
+        self._queue.put((job, func))
+        self._ensure_worker()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self.path is not None:
+            job = self._read(self.path / f"{job_id}.json")
+        return job
+
+    def list(self) -> List[Job]:
+        jobs = {}
+        if self.path is not None and self.path.is_dir():
+            for file in self.path.glob("*.json"):
+                job = self._read(file)
+                if job is not None:
+                    jobs[job.id] = job
+        # the worker thread adds and removes jobs meanwhile
+        with self._lock:
+            jobs.update(self._jobs)
+        return sorted(jobs.values(), key=lambda job: job.created, reverse=True)
+
+    def cancel(self, job_id: str) -> bool:
+        """Request the cancellation, return False if it is too late for that."""
+        job = self.get(job_id)
+        with self._lock:
+            if job.status in FINAL_STATES or job.committing:
+                return False
+            if job.id not in self._jobs:
+                # running in another server process
+                (self.path / f"{job.id}.cancel").touch()
+                return job.stage != "committing"
+            job._cancel.set()
+            if job.status == "queued":
+                self._update(job, status="cancelled", message="Cancelled")
+        return True
+
+    def check_cancelled(self, job: Job) -> None:
+        """Abort ``job`` if its cancellation was requested, from any process."""
+        if self.path is not None and (self.path / f"{job.id}.cancel").exists():
+            job._cancel.set()
+        job.check_cancelled()
+
+    def update(self, job: Job, **progress: int) -> None:
+        """Report progress counters of a running job."""
+        with self._lock:
+            job.progress.update(progress)
+            self._update(job)
+
+    def set_stage(self, job: Job, stage: str, indeterminate: bool = False) -> None:
+        with self._lock:
+            self._update(job, stage=stage, indeterminate=indeterminate)
+
+    def begin_commit(self, job: Job) -> None:
+        """Check a last time for cancellation, afterwards the job cannot be cancelled."""
+        with self._lock:
+            self.check_cancelled(job)
+            job.committing = True
+            self._update(job, stage="committing")
+
+    # ------------------------------------------------------------ internals
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._work, name="aiida-gui-jobs", daemon=True
+                )
+                self._worker.start()
+
+    def _work(self) -> None:
+        while True:
+            job, func = self._queue.get()
+            if job.cancel_requested:
+                self._forget(job)
+                continue
+            self._update(job, status="running")
+            try:
+                result = func(job)
+            except JobCancelled:
+                self._update(job, status="cancelled", message="Cancelled")
+            except Exception as e:
+                print(traceback.format_exc())
+                self._update(job, status="failed", message=str(e))
+            else:
+                self._update(job, status="finished", result=result)
+            if job.status in FINAL_STATES:
+                self._forget(job)
+
+    def _update(self, job: Job, **fields: Any) -> None:
+        with self._lock:
+            for key, value in fields.items():
+                setattr(job, key, value)
+            job.updated = time.time()
+            self._save(job)
+
+    def _forget(self, job: Job) -> None:
+        """Drop a finished job from memory, keeping its file, and prune old files."""
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        if self.path is None:
+            return
+        (self.path / f"{job.id}.cancel").unlink(missing_ok=True)
+        finished = [job for job in self.list() if job.status in FINAL_STATES]
+        for old in finished[MAX_FINISHED_JOBS:]:
+            (self.path / f"{old.id}.json").unlink(missing_ok=True)
+
+    def _read(self, file: Path) -> Optional[Job]:
+        try:
+            job = Job.from_dict(json.loads(file.read_text()))
+        except (OSError, ValueError, KeyError):
+            return None
+        if job.status not in FINAL_STATES and not _process_alive(job.owner):
+            # the process that ran the job is gone
+            job.status = "interrupted"
+            job.message = "The web server stopped before the job finished"
+        return job
+
+    def _save(self, job: Job) -> None:
+        if self.path is None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        file = self.path / f"{job.id}.json"
+        tmp = file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(job.to_dict()))
+        tmp.replace(file)
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    import psutil
+
+    return pid is not None and psutil.pid_exists(pid)
+
+
+job_manager = JobManager(get_jobs_dir_path)
+
+
+def delete_nodes_job(
+    pks: Iterable[int], nodes: Optional[Iterable[int]] = None
+) -> Callable[[Job], Dict[str, Any]]:
+    """
+    Return a job function deleting ``pks`` and the nodes that depend on them.
+
+    If the complete set of ``nodes`` to delete is already known, e.g. from a
+    dry run, the provenance graph is not traversed again.
+    The nodes are deleted in chunks inside a single transaction, so the job
+    can be cancelled, and everything rolled back, up to the commit.
+    """
+    pks = list(pks)
+
+    def run(job: Job) -> Dict[str, Any]:
+        from aiida.manage import get_manager
+        from aiida.tools.graph.graph_traversers import get_nodes_delete
+
+        backend = get_manager().get_profile_storage()
+
+        if nodes is None:
+            # the traversal reports no progress until it is done
+            job_manager.set_stage(job, "traversing", indeterminate=True)
+            to_delete = get_nodes_delete(pks, get_links=False, backend=backend)["nodes"]
+        else:
+            to_delete = nodes
+        job_manager.update(job, traversed=len(to_delete), deleted=0)
+        job_manager.check_cancelled(job)
+
+        job_manager.set_stage(job, "deleting")
+        ordered = sorted(to_delete)
+        with backend.transaction():
+            for start in range(0, len(ordered), DELETE_CHUNK_SIZE):
+                job_manager.check_cancelled(job)
+                chunk = ordered[start : start + DELETE_CHUNK_SIZE]
+                backend.delete_nodes_and_connections(chunk)
+                job_manager.update(job, deleted=start + len(chunk))
+            # last chance to cancel: leaving the block commits the transaction
+            job_manager.begin_commit(job)
+        return {"deleted": True, "count": len(ordered)}
+
+    return run
+
+
+@router.get("/api/jobs")
+async def read_jobs() -> List[Dict[str, Any]]:
+    return [job.to_dict() for job in job_manager.list()]
+
+
+@router.get("/api/jobs/{job_id}")
+async def read_job(job_id: str) -> Dict[str, Any]:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+
+@router.post("/api/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str) -> Dict[str, Any]:
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if not job_manager.cancel(job_id):
+        raise HTTPException(
+            status_code=409, detail=f"Job {job_id} can no longer be cancelled"
+        )
+    return {"cancelled": True, "message": f"Cancellation of job {job_id} requested"}
@@ -0,0 +1,151 @@
+"""Layered layout of the workflow graphs, computed on the server.
+
+Laying out a graph of thousands of nodes in the browser freezes the tab, so
+``layered_layout`` places the nodes in the classic Sugiyama way:
+
+1. the edges closing a cycle are ignored,
+2. each node goes to the layer after its deepest predecessor (longest path),
+3. the order inside the layers is improved by a few barycenter sweeps, which
+   reduces the crossings of the edges,
+4. the layers become columns from left to right, and the nodes of a column
+   are stacked from top to bottom according to their height.
+
+All steps are linear in the size of the graph, up to the sorting of the
+layers. The layout of a sealed workflow never changes, so it is cached by the
+uuid of the workflow.
+"""
+from __future__ import annotations
+
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+from aiida_gui.app.cache import TTLCache
+
+LAYER_GAP = 120
+NODE_GAP = 40
+BARYCENTER_SWEEPS = 4
+# keep the layouts for a day, they are only computed for sealed workflows
+layout_cache = TTLCache(ttl=24 * 3600, maxsize=256)
+
+
+def node_size(node: dict) -> Tuple[float, float]:
+    """The size of the node in the rete editor, see ``createDynamicNode``."""
+    sockets = node.get("inputs", []) + node.get("outputs", [])
+    longest = max((len(socket["name"]) for socket in sockets), default=0)
+    return 180 + longest * 5, max(140, 100 + len(sockets) * 35)
+
+
+def _acyclic_edges(
+    keys: List[Hashable], edges: Iterable[Tuple[Hashable, Hashable]]
+) -> Dict[Hashable, List[Hashable]]:
+    """Return the successors of each node, without the edges closing a cycle."""
+    successors: Dict[Hashable, List[Hashable]] = {key: [] for key in keys}
+    for source, target in edges:
+        if source in successors and target in successors and source != target:
+            successors[source].append(target)
+    # iterative depth-first search, dropping the edges to a node on the stack
+    state: Dict[Hashable, int] = {}  # 1: on the stack, 2: done
+    for root in keys:
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(list(successors[root])))]
+        while stack:
+            key, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                state[key] = 2
+                stack.pop()
+            elif state.get(child) == 1:
+                successors[key].remove(child)
+            elif child not in state:
+                state[child] = 1
+                stack.append((child, iter(list(successors[child]))))
+    return successors
+
+
+def _assign_layers(
+    keys: List[Hashable], successors: Dict[Hashable, List[Hashable]]
+) -> Dict[Hashable, int]:
+    """Longest path layering, in topological order."""
+    indegree = {key: 0 for key in keys}
+    for targets in successors.values():
+        for target in targets:
+            indegree[target] += 1
+    layer = {key: 0 for key in keys}
+    ready = [key for key in keys if indegree[key] == 0]
+    while ready:
+        key = ready.pop()
+        for target in successors[key]:
+            layer[target] = max(layer[target], layer[key] + 1)
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                ready.append(target)
+    return layer
+
+
+def _order_layers(
+    layers: List[List[Hashable]],
+    successors: Dict[Hashable, List[Hashable]],
+) -> None:
+    """Sort each layer by the mean position of the neighbours, in place."""
+    predecessors: Dict[Hashable, List[Hashable]] = {
+        key: [] for layer in layers for key in layer
+    }
+    for source, targets in successors.items():
+        for target in targets:
+            predecessors[target].append(source)
+    position = {key: i for layer in layers for i, key in enumerate(layer)}
+
+    def sweep(ordered_layers, neighbours):
+        for layer in ordered_layers:
+            barycenter = {}
+            for key in layer:
+                placed = [position[other] for other in neighbours[key]]
+                barycenter[key] = sum(placed) / len(placed) if placed else position[key]
+            layer.sort(key=barycenter.__getitem__)
+            for i, key in enumerate(layer):
+                position[key] = i
+
+    for _ in range(BARYCENTER_SWEEPS):
+        sweep(layers[1:], predecessors)
+        sweep(reversed(layers[:-1]), successors)
+
+
+def layered_layout(
+    nodes: Dict[Hashable, dict], links: List[dict]
+) -> Dict[Hashable, List[float]]:
+    """Return the ``[x, y]`` position of each node of a rete graph."""
+    keys = list(nodes)
+    if not keys:
+        return {}
+    successors = _acyclic_edges(
+        keys, ((link["from_node"], link["to_node"]) for link in links)
+    )
+    layer_of = _assign_layers(keys, successors)
+    layers: List[List[Hashable]] = [[] for _ in range(max(layer_of.values()) + 1)]
+    for key in keys:
+        layers[layer_of[key]].append(key)
+    _order_layers(layers, successors)
+
+    sizes = {key: node_size(nodes[key]) for key in keys}
+    positions = {}
+    x = 0.0
+    for layer in layers:
+        height = sum(sizes[key][1] for key in layer) + NODE_GAP * (len(layer) - 1)
+        # center the columns on the same horizontal line
+        y = -height / 2
+        for key in layer:
+            positions[key] = [x, y]
+            y += sizes[key][1] + NODE_GAP
+        x += max(sizes[key][0] for key in layer) + LAYER_GAP
+    return positions
+
+
+def get_layout(uuid: str, sealed: bool, graph_data: dict) -> Dict[Hashable, list]:
+    """The layout of a workflow graph, cached once the workflow is sealed."""
+    positions = layout_cache.get(uuid) if sealed else None
+    if positions is None:
+        positions = layered_layout(graph_data["nodes"], graph_data["links"])
+        if sealed:
+            layout_cache.set(uuid, positions)
+    return positions
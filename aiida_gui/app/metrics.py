@@ -0,0 +1,288 @@
+"""Request and database metrics, exposed in the Prometheus text format.
+
+``MetricsMiddleware`` records for each route the number of requests per
+status, a latency histogram and the number of requests in flight. The SQL
+statements executed while serving a request are counted and timed through
+SQLAlchemy events on the engine of the AiiDA storage, so that the routes
+loading the database can be identified.
+
+The metrics live in memory and are per server process; ``/metrics`` can be
+read with ``curl`` or scraped by Prometheus, no external service is needed.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, as used by Prometheus."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            result.append((str(bound), total))
+        return result
+
+
+class RequestStats:
+    """SQL statements executed, and timed phases, while serving one request."""
+
+    __slots__ = ("statements", "db_time", "timings")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        # seconds spent in the phases measured with ``timed``
+        self.timings: Dict[str, float] = {}
+
+
+# the stats of the request being served, also seen by the threadpool running
+# the sync endpoints since it copies the context
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "aiida_gui_request_stats", default=None
+)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current_request.get()
+
+
+@contextmanager
+def timed(name: str):
+    """Add the time spent in the block to the phase ``name`` of the current request.
+
+    Also usable as a decorator. Outside of a request it does nothing.
+    """
+    stats = _current_request.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.timings[name] = stats.timings.get(name, 0.0) + (
+            time.perf_counter() - start
+        )
+
+
+class Metrics:
+    """Thread-safe registry of the metrics of the routes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.statements: Dict[Tuple[str, str], Histogram] = {}
+        self.db_time: Dict[Tuple[str, str], float] = {}
+        self.in_flight = 0
+        # statements executed outside of a request, e.g. by background threads
+        self.background_statements = 0
+        self.background_db_time = 0.0
+
+    def start_request(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finish_request(
+        self, method: str, route: str, status: int, duration: float, stats
+    ) -> None:
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            status_key = (method, route, status)
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(duration)
+            self.statements.setdefault(key, Histogram(STATEMENT_BUCKETS)).observe(
+                stats.statements
+            )
+            self.db_time[key] = self.db_time.get(key, 0.0) + stats.db_time
+
+    def record_statement(self, duration: float) -> None:
+        stats = _current_request.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_time += duration
+            return
+        with self._lock:
+            self.background_statements += 1
+            self.background_db_time += duration
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name, histograms):
+            for (method, route), hist in sorted(histograms.items()):
+                labels = f'method="{method}",route="{_escape(route)}"'
+                for bound, count in hist.cumulative():
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        with self._lock:
+            header("aiida_gui_http_requests_total", "counter", "Requests per route.")
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'aiida_gui_http_requests_total{{method="{method}",'
+                    f'route="{_escape(route)}",status="{status}"}} {count}'
+                )
+            header(
+                "aiida_gui_http_requests_in_flight",
+                "gauge",
+                "Requests being served.",
+            )
+            lines.append(f"aiida_gui_http_requests_in_flight {self.in_flight}")
+            header(
+                "aiida_gui_http_request_duration_seconds",
+                "histogram",
+                "Latency of the requests per route.",
+            )
+            histogram("aiida_gui_http_request_duration_seconds", self.latency)
+            header(
+                "aiida_gui_db_statements_per_request",
+                "histogram",
+                "SQL statements executed per request.",
+            )
+            histogram("aiida_gui_db_statements_per_request", self.statements)
+            header(
+                "aiida_gui_db_statement_seconds_total",
+                "counter",
+                "Time spent executing SQL statements per route.",
+            )
+            for (method, route), seconds in sorted(self.db_time.items()):
+                lines.append(
+                    f'aiida_gui_db_statement_seconds_total{{method="{method}",'
+                    f'route="{_escape(route)}"}} {seconds}'
+                )
+            header(
+                "aiida_gui_db_background_statements_total",
+                "counter",
+                "SQL statements executed outside of a request.",
+            )
+            lines.append(
+                f"aiida_gui_db_background_statements_total {self.background_statements}"
+            )
+            header(
+                "aiida_gui_db_background_statement_seconds_total",
+                "counter",
+                "Time spent executing SQL statements outside of a request.",
+            )
+            lines.append(
+                "aiida_gui_db_background_statement_seconds_total "
+                f"{self.background_db_time}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+metrics = Metrics()
+_hooked_engines = set()
+_hook_lock = threading.Lock()
+
+
+def install_sql_hooks() -> None:
+    """Time the statements executed on the engine of the loaded AiiDA storage."""
+    from aiida.manage import get_manager
+    from sqlalchemy import event
+
+    try:
+        engine = get_manager().get_profile_storage().get_session().get_bind()
+    except Exception as e:
+        print(f"Failed to instrument the database engine: {e}")
+        return
+    with _hook_lock:
+        if id(engine) in _hooked_engines:
+            return
+        _hooked_engines.add(id(engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("aiida_gui_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        start = conn.info["aiida_gui_query_start"].pop()
+        metrics.record_statement(time.perf_counter() - start)
+
+
+def route_name(scope) -> str:
+    """The path template of the matched route, to keep the labels bounded."""
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    path = scope.get("path", "")
+    if path.startswith("/static/"):
+        return "/static"
+    if path.startswith("/plugins/"):
+        return "/plugins/" + path.split("/")[2]
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Record the latency, status and SQL statements of each HTTP request."""
+
+    def __init__(self, app, registry: Metrics = metrics):
+        self.app = app
+        self.registry = registry
+        self._hooked = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if not self._hooked:
+            # the storage is loaded by then
+            self._hooked = True
+            install_sql_hooks()
+
+        status = 500
+        stats = RequestStats()
+        token = _current_request.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.registry.start_request()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_request.reset(token)
+            self.registry.finish_request(
+                scope["method"],
+                route_name(scope),
+                status,
+                time.perf_counter() - start,
+                stats,
+            )
@@ -2,6 +2,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Query, Body, HTTPException
 from aiida import orm
 from typing import Type, Dict, List, Union, Optional
+from aiida_gui.app.responses import FastJSONResponse
 
 
 process_project = [
@@ -74,12 +75,7 @@ def make_node_router(
     POST pause/play and DELETE with dry‑run for any AiiDA node subclass.
     """
     from aiida.orm import QueryBuilder
-    from aiida.engine.processes.control import (
-        pause_processes,
-        play_processes,
-        kill_processes,
-    )
-    from aiida.tools import delete_nodes
+    from aiida_gui.app.coalesce import single_flight
     from aiida_gui.app.utils import (
         translate_datagrid_filter_json,
     )
@@ -87,16 +83,7 @@ def make_node_router(
     router = APIRouter()
 
     # -------------------- GET /…-data --------------------
-    @router.get(f"/api/{prefix}-data")
-    async def read_node_data(
-        skip: int = Query(0, ge=0),
-        limit: int = Query(15, gt=0, le=500),
-        sortField: str = Query(
-            "pk", pattern="^(pk|ctime|process_label|state|label|description)$"
-        ),
-        sortOrder: str = Query("desc", pattern="^(asc|desc)$"),
-        filterModel: Optional[str] = Query(None),
-    ):
+    def query_node_data(skip, limit, sortField, sortOrder, filterModel):
         qb = QueryBuilder()
         filters = (
             translate_datagrid_filter_json(filterModel, project=project)
@@ -117,6 +104,23 @@ def make_node_router(
         results = get_data_func(qb, project)
         return {"total": total, "data": results}
 
+    # all the tabs open on the same page poll the same query
+    node_data_flight = single_flight()
+
+    @router.get(f"/api/{prefix}-data")
+    async def read_node_data(
+        skip: int = Query(0, ge=0),
+        limit: int = Query(15, gt=0, le=500),
+        sortField: str = Query(
+            "pk", pattern="^(pk|ctime|process_label|state|label|description)$"
+        ),
+        sortOrder: str = Query("desc", pattern="^(asc|desc)$"),
+        filterModel: Optional[str] = Query(None),
+    ):
+        args = (skip, limit, sortField, sortOrder, filterModel)
+        data = await node_data_flight.run(args, query_node_data, *args)
+        return FastJSONResponse(data)
+
     # -------------------- PUT /…-data/{id} --------------------
     @router.put(f"/api/{prefix}-data" + "/{id}")
     async def update_node(
@@ -142,6 +146,8 @@ def make_node_router(
     # -------------------- pause / play / delete -------------
     @router.post(f"/api/{prefix}/pause" + "/{id}")
     async def pause(id: int):
+        from aiida.engine.processes.control import pause_processes
+
         try:
             pause_processes([orm.load_node(id)])
             return {"message": f"Paused {node_cls.__name__} {id}"}
@@ -150,6 +156,8 @@ def make_node_router(
 
     @router.post(f"/api/{prefix}/play" + "/{id}")
     async def play(id: int):
+        from aiida.engine.processes.control import play_processes
+
         try:
             play_processes([orm.load_node(id)])
             return {"message": f"Resumed {node_cls.__name__} {id}"}
@@ -158,6 +166,8 @@ def make_node_router(
 
     @router.post(f"/api/{prefix}/kill" + "/{id}")
     async def kill(id: int):
+        from aiida.engine.processes.control import kill_processes
+
         try:
             kill_processes([orm.load_node(id)])
             return {"message": f"Resumed {node_cls.__name__} {id}"}
@@ -168,17 +178,56 @@ def make_node_router(
 
         @router.delete(f"/api/{prefix}/delete" + "/{id}")
         async def delete(
-            id: int, dry_run: bool = False
+            id: int,
+            dry_run: bool = False,
+            background: bool = False,
+            token: Optional[str] = None,
         ) -> Dict[str, Union[bool, str, List[int]]]:
+            from aiida.tools import delete_nodes
+            from aiida_gui.app.deletion import dry_run_delete, pop_dry_run
+
+            if dry_run:
+                try:
+                    deleted, token = dry_run_delete([id])
+                except Exception as e:
+                    raise HTTPException(status_code=500, detail=str(e))
+                return {
+                    "deleted": False,
+                    "message": f"Did not delete {node_cls.__name__} {id} [dry‑run]",
+                    "deleted_nodes": sorted(deleted),
+                    "token": token,
+                }
+            # the node set of a still valid dry run saves a second traversal
+            nodes = pop_dry_run(token, [id]) if token else None
+            if background:
+                from aiida_gui.app.jobs import delete_nodes_job, job_manager
+
+                job = job_manager.submit(
+                    "delete",
+                    f"Delete {node_cls.__name__} {id}",
+                    delete_nodes_job([id], nodes=nodes),
+                )
+                return {
+                    "deleted": False,
+                    "job_id": job.id,
+                    "message": f"Queued deletion of {node_cls.__name__} {id}",
+                }
             try:
-                deleted, ok = delete_nodes([id], dry_run=dry_run)
+                if nodes is None:
+                    deleted, ok = delete_nodes([id], dry_run=False)
+                else:
+                    from aiida.manage import get_manager
+
+                    backend = get_manager().get_profile_storage()
+                    with backend.transaction():
+                        backend.delete_nodes_and_connections(nodes)
+                    deleted, ok = nodes, True
                 return {
                     "deleted": ok,
                     "message": (
                         f"{'Deleted' if ok else 'Did not delete'} {node_cls.__name__} {id}"
-                        + (" [dry‑run]" if dry_run else "")
                     ),
-                    "deleted_nodes": list(deleted),
+                    "deleted_nodes": sorted(deleted),
                 }
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
@@ -4,55 +4,161 @@ from fastapi.staticfiles import StaticFiles
 from starlette.routing import Mount, Route
 
 
-def get_plugins():
-    import importlib.metadata
+class PluginRegistry:
+    """
+    Registry of the plugins declared in the ``aiida_gui.plugins`` entry point group.
 
-    plugins = {}
+    The entry points are read once. Their metadata is available without
+    importing the plugins, which are only imported by ``load`` and then kept.
+    """
+
+    def __init__(self, group: str = "aiida_gui.plugins"):
+        self.group = group
+        self._entry_points = None
+        self._loaded = {}
+
+    def entry_points(self):
+        if self._entry_points is None:
+            self._entry_points = self._read_entry_points()
+        return self._entry_points
+
+    def _read_entry_points(self):
+        import importlib.metadata
 
-    try:
-        eps = importlib.metadata.entry_points()
-        if sys.version_info >= (3, 10):
-            eps = eps.select(group="aiida_gui.plugins")
-        else:
-            eps = eps.get("aiida_gui.plugins", [])
-    except Exception:
-        print("Failed to get entry points")
-        return plugins
-
-    for entry in eps:
-        plugin_name = entry.name
         try:
-            plugin_module = entry.load()
-            plugins[plugin_name] = plugin_module
-        except Exception as e:
-            print(traceback.format_exc())
-            print(f"Failed to load plugin {plugin_name}: {e}")
-            continue
+            eps = importlib.metadata.entry_points()
+            if sys.version_info >= (3, 10):
+                eps = eps.select(group=self.group)
+            else:
+                eps = eps.get(self.group, [])
+        except Exception:
+            print("Failed to get entry points")
+            return {}
+        return {entry.name: entry for entry in eps}
+
+    def names(self):
+        return list(self.entry_points())
+
+    def metadata(self):
+        """Describe the plugins without importing them."""
+        data = {}
+        for name, entry in self.entry_points().items():
+            dist = getattr(entry, "dist", None)
+            data[name] = {
+                "name": name,
+                "value": entry.value,
+                "distribution": dist.name if dist else None,
+                "version": dist.version if dist else None,
+                "loaded": name in self._loaded,
+            }
+        return data
+
+    def is_loaded(self, name):
+        return name in self._loaded
+
+    def load(self, name):
+        """Import the plugin ``name``, return None if it cannot be loaded."""
+        if name not in self._loaded:
+            entry = self.entry_points().get(name)
+            plugin_module = None
+            if entry is not None:
+                try:
+                    plugin_module = entry.load()
+                except Exception as e:
+                    print(traceback.format_exc())
+                    print(f"Failed to load plugin {name}: {e}")
+            # failures are remembered as well, to not retry on every request
+            self._loaded[name] = plugin_module
+        return self._loaded[name]
+
+    def refresh(self):
+        """Forget the entry points, e.g. after installing a new plugin."""
+        self._entry_points = None
+
+
+plugin_registry = PluginRegistry()
+
 
+def get_plugins():
+    plugins = {}
+    for plugin_name in plugin_registry.names():
+        plugin_module = plugin_registry.load(plugin_name)
+        if plugin_module is not None:
+            plugins[plugin_name] = plugin_module
     return plugins
 
 
-def mount_plugins(app):
-    plugins = get_plugins()
-    for plugin_name, plugin_module in plugins.items():
-        sub_apps = plugin_module.get("sub_apps", {})
-        routers = plugin_module.get("routers", {})
-        static_dirs = plugin_module.get("static_dirs", {})
+def mount_plugin(app, plugin_name, plugin_module):
+    """Mount the sub-apps, routers and static directories of a plugin."""
+    from aiida_gui.app.static import PrecompressedStaticFiles
 
-        for key, sub_app in sub_apps.items():
-            app.mount(
-                f"/plugins/{plugin_name}/{key}", sub_app, name=f"plugin_{plugin_name}"
-            )
+    sub_apps = plugin_module.get("sub_apps", {})
+    routers = plugin_module.get("routers", {})
+    static_dirs = plugin_module.get("static_dirs", {})
 
-        for key, router in routers.items():
-            app.include_router(router, prefix=f"/plugins/{key}")
+    for key, sub_app in sub_apps.items():
+        app.mount(
+            f"/plugins/{plugin_name}/{key}", sub_app, name=f"plugin_{plugin_name}"
+        )
 
-        for key, static_dir in static_dirs.items():
-            app.mount(
-                f"/plugins/{key}/static",
-                StaticFiles(directory=static_dir, html=True),
-                name=f"plugin_{key}",
-            )
+    for key, router in routers.items():
+        app.include_router(router, prefix=f"/plugins/{key}")
+
+    for key, static_dir in static_dirs.items():
+        app.mount(
+            f"/plugins/{key}/static",
+            PrecompressedStaticFiles(directory=static_dir, html=True),
+            name=f"plugin_{key}",
+        )
+
+
+class LazyPluginMiddleware:
+    """
+    Mount a plugin the first time a path under ``/plugins/{name}`` is requested,
+    so that the plugins are not imported when the app starts.
+
+    Routers and static directories of a plugin may use other prefixes than the
+    plugin name, so a request to an unknown prefix mounts all the plugins that
+    are not mounted yet.
+    """
+
+    def __init__(self, app, fastapi_app, registry=plugin_registry):
+        self.app = app
+        self.fastapi_app = fastapi_app
+        self.registry = registry
+        # first path segments served by the plugins mounted so far
+        self._prefixes = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path.startswith("/plugins/"):
+                self._mount_for(path.split("/")[2])
+        await self.app(scope, receive, send)
+
+    def _mount_for(self, segment):
+        if segment in self._prefixes:
+            return
+        names = self.registry.names()
+        if segment in names:
+            names = [segment]
+        for name in names:
+            if self.registry.is_loaded(name):
+                continue
+            plugin_module = self.registry.load(name)
+            if plugin_module is not None:
+                mount_plugin(self.fastapi_app, name, plugin_module)
+                self._prefixes.add(name)
+                self._prefixes.update(plugin_module.get("routers", {}))
+                self._prefixes.update(plugin_module.get("static_dirs", {}))
+
+
+def mount_plugins(app, lazy=False):
+    if lazy:
+        app.add_middleware(LazyPluginMiddleware, fastapi_app=app)
+        return
+    for plugin_name, plugin_module in get_plugins().items():
+        mount_plugin(app, plugin_name, plugin_module)
 
 
 def list_routes_and_statics(app, prefix: str = ""):
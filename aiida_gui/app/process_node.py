@@ -3,10 +3,18 @@ from aiida_gui.app.node_table import (
     process_project,
     projected_data_to_dict_process,
 )
+from aiida_gui.app.responses import FastJSONResponse
 import traceback
-from fastapi import HTTPException
+from typing import Dict, List, Optional
+from fastapi import HTTPException, Query
 from aiida import orm
-from .utils import get_node_summary
+from aiida_gui.app.coalesce import single_flight
+from .utils import (
+    format_log_line,
+    get_called_descendants,
+    get_log_levels,
+    get_node_summary,
+)
 
 router = make_node_router(
     node_cls=orm.ProcessNode,
@@ -24,19 +32,204 @@ async def read_process(id: int):
         raise HTTPException(status_code=404, detail=f"Process {id} not found")
 
     data = get_node_summary(node)
-    return data
+    return FastJSONResponse(data)
 
 
-@router.get("/api/process-logs/{id}")
-async def read_workgraph_logs(id: int):
-    from aiida.cmdline.utils.common import get_workchain_report
+def escape_like(text: str) -> str:
+    """Escape the wildcards of a (i)like pattern, with the default ``\\`` escape."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def count_log_levels(pks: List[int], text: Optional[str] = None) -> Dict[str, int]:
+    """Count the log records of the nodes ``pks`` per level, in one query."""
+    from aiida.manage import get_manager
+    from aiida.storage.psql_dos.models.log import DbLog
+    import sqlalchemy as sa
+
+    # the QueryBuilder has no GROUP BY
+    statement = (
+        sa.select(DbLog.levelname, sa.func.count())
+        .where(DbLog.dbnode_id.in_(pks))
+        .group_by(DbLog.levelname)
+    )
+    if text:
+        # SQLite has no default escape character for LIKE, unlike PostgreSQL
+        pattern = f"%{escape_like(text)}%"
+        statement = statement.where(DbLog.message.ilike(pattern, escape="\\"))
+    session = get_manager().get_profile_storage().get_session()
+    counts = dict(session.execute(statement).all())
+    return {name: counts[name] for name in get_log_levels("NOTSET") if name in counts}
+
+
+# Log ids are allocated before the commit, so a transaction can commit a lower
+# id after a higher one was already read. The entries recorded in the last
+# ``LOG_CURSOR_OVERLAP`` seconds before the entry at the cursor are read again,
+# and the client skips those it already has: an entry is only missed if it is
+# committed more than that after it was recorded.
+LOG_CURSOR_OVERLAP = 10
+
+
+def _report_log_rows(filters: dict, limit: Optional[int] = None) -> list:
+    qb = orm.QueryBuilder()
+    qb.append(
+        orm.Log,
+        filters=filters,
+        project=["id", "time", "dbnode_id", "levelname", "message"],
+        tag="log",
+    )
+    # the log id increases with the time of the insert, so it doubles as a cursor
+    qb.order_by({"log": {"id": "asc"}})
+    if limit:
+        qb.limit(limit)
+    return qb.all()
+
+
+def query_report_logs(id: int, after: Optional[int], limit: Optional[int]):
+    from datetime import timedelta
 
     try:
-        node = orm.load_node(id)
-        report = get_workchain_report(node, "REPORT")
-        logs = report.splitlines()
-        return logs
-    except KeyError as e:
+        orm.load_node(id)
+    except Exception as e:
         error_traceback = traceback.format_exc()  # Capture the full traceback
         print(error_traceback)
         raise HTTPException(status_code=404, detail=f"Workgraph {id} not found, {e}")
+
+    depths = get_called_descendants(id)
+    filters = {
+        "dbnode_id": {"in": list(depths)},
+        "levelname": {"in": get_log_levels("REPORT")},
+    }
+    rows = []
+    if after:
+        qb = orm.QueryBuilder()
+        qb.append(orm.Log, filters={"id": after}, project="time")
+        cursor_time = qb.first(flat=True)
+        if cursor_time is not None:
+            # the overlap does not count in the limit, so that the cursor advances
+            overlap = {
+                "id": {"<=": after},
+                "time": {">=": cursor_time - timedelta(seconds=LOG_CURSOR_OVERLAP)},
+            }
+            rows = _report_log_rows({**filters, **overlap})
+        filters["id"] = {">": after}
+    rows += _report_log_rows(filters, limit)
+
+    cursor = after or 0
+    lines = []
+    ids = []
+    for log_id, time, pk, levelname, message in rows:
+        lines.append(format_log_line(time, pk, levelname, message, depths[pk]))
+        ids.append(log_id)
+        cursor = max(cursor, log_id)
+
+    if after is None and limit is None:
+        return lines or ["No log messages recorded for this entry"]
+    return {"lines": lines, "ids": ids, "cursor": cursor}
+
+
+# tabs following the same process poll with the same cursor
+report_logs_flight = single_flight()
+
+
+@router.get("/api/process-logs/{id}")
+async def read_workgraph_logs(
+    id: int,
+    after: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, gt=0, le=10000),
+):
+    """
+    Return the REPORT (and higher) log lines of a process and its called processes.
+
+    Without ``after``/``limit`` the full report is returned as a list of lines.
+    Otherwise the lines of the log entries with an id larger than ``after`` are
+    returned, at most ``limit`` of them, together with their ``ids`` and the
+    ``cursor`` to pass as ``after`` in the next poll. The entries recorded in
+    the ``LOG_CURSOR_OVERLAP`` seconds before the entry ``after`` are returned
+    again, since they may have been committed after the previous poll; the
+    client skips the ids it already has.
+    """
+    return await report_logs_flight.run(
+        (id, after, limit), query_report_logs, id, after, limit
+    )
+
+
+@router.get("/api/process-log-records/{id}")
+async def read_process_log_records(
+    id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, gt=0, le=1000),
+    sortOrder: str = Query("asc", pattern="^(asc|desc)$"),
+    level: Optional[List[str]] = Query(None),
+    process: Optional[int] = Query(None),
+    text: Optional[str] = Query(None),
+):
+    """
+    Return a page of the log records of a process and its called processes.
+
+    The records can be restricted to some levels, to the subtree of one of the
+    called processes (``process``), and to messages containing ``text``.
+    ``level_counts`` gives the number of records per level with all filters
+    but the level one applied.
+    """
+    try:
+        orm.load_node(id)
+    except Exception:
+        raise HTTPException(status_code=404, detail=f"Process {id} not found")
+
+    depths = get_called_descendants(id)
+    pks = list(depths)
+    if process is not None:
+        if process not in depths:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Process {process} was not called by process {id}",
+            )
+        pks = list(get_called_descendants(process))
+
+    filters = {"dbnode_id": {"in": pks}}
+    if text:
+        filters["message"] = {"ilike": f"%{escape_like(text)}%"}
+
+    level_counts = count_log_levels(pks, text)
+
+    if level:
+        filters["levelname"] = {"in": [name.upper() for name in level]}
+    qb = orm.QueryBuilder()
+    qb.append(
+        orm.Log,
+        filters=filters,
+        project=["id", "time", "levelname", "dbnode_id", "message"],
+        tag="log",
+    )
+    qb.order_by({"log": {"id": sortOrder}})
+    total = qb.count()
+    qb.offset(skip).limit(limit)
+
+    records = [
+        {
+            "id": log_id,
+            "time": time,
+            "level": levelname,
+            "pk": pk,
+            "depth": depths[pk],
+            "message": message,
+        }
+        for log_id, time, levelname, pk, message in qb.iterall()
+    ]
+
+    # process labels of the processes on this page
+    labels = {}
+    if records:
+        qb = orm.QueryBuilder()
+        qb.append(
+            orm.ProcessNode,
+            filters={"id": {"in": list({record["pk"] for record in records})}},
+            project=["id", "attributes.process_label"],
+        )
+        labels = dict(qb.all())
+    for record in records:
+        record["process_label"] = labels.get(record["pk"])
+
+    return FastJSONResponse(
+        {"total": total, "data": records, "level_counts": level_counts}
+    )
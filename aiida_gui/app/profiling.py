@@ -0,0 +1,245 @@
+"""Per-request timing breakdowns and profiles of the slow requests.
+
+When ``server_timing`` is enabled, each response carries a ``Server-Timing``
+header with the time spent in the database, in the phases measured with
+``aiida_gui.app.metrics.timed`` (e.g. the link traversal of the summaries and
+the JSON serialization), and in total; the browser developer tools show it in
+the network panel.
+
+When ``profile_threshold`` is set, a sampling profiler watches the requests in
+flight: once a request has run for longer than the threshold, the stacks of
+the server threads are sampled until it finishes, and written to
+``profile_dir`` in the collapsed stack format read by ``flamegraph.pl`` or
+https://www.speedscope.app.
+
+Both can be switched on at runtime with ``PUT /debug/profiling``, without
+restarting the server. The endpoint only accepts the toggle and the
+thresholds; ``profile_dir`` is read from the ``AIIDA_GUI_PROFILE_DIR``
+setting only, so a client cannot make the server write files elsewhere.
+"""
+from __future__ import annotations
+
+import re
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import APIRouter
+from pydantic import BaseModel, ConfigDict, Field
+
+from aiida_gui.app.metrics import current_request_stats, route_name
+from aiida_gui.app.settings import backend_settings
+
+router = APIRouter()
+
+
+def get_profile_dir_path() -> Path:
+    """Get the default directory of the profiles of the slow requests."""
+    return Path.home() / ".aiida" / "daemon" / "web_profiles"
+
+
+class ProfilingConfig(BaseModel):
+    server_timing: bool = False
+    # seconds after which a request is profiled, None to disable
+    profile_threshold: Optional[float] = None
+    profile_dir: str = ""
+    # seconds between two samples of the stacks
+    sample_interval: float = 0.005
+
+
+class ProfilingUpdate(BaseModel):
+    """The fields that can be changed at runtime, any other field is rejected."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    server_timing: Optional[bool] = None
+    profile_threshold: Optional[float] = Field(default=None, gt=0)
+    # a shorter interval would keep a core busy sampling
+    sample_interval: Optional[float] = Field(default=None, ge=0.001, le=1)
+
+
+class _SlowRequest:
+    __slots__ = ("method", "path", "start", "samples")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.start = time.perf_counter()
+        self.samples: Counter = Counter()
+
+
+class SlowRequestProfiler:
+    """
+    Sample the stacks of all threads while a request runs longer than the
+    threshold. A single thread serves all requests; it only polls the
+    requests in flight every 50 ms as long as none of them is slow.
+    """
+
+    def __init__(self, config: ProfilingConfig):
+        self.config = config
+        self._active: Dict[int, _SlowRequest] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def begin(self, method: str, path: str) -> Optional[_SlowRequest]:
+        if self.config.profile_threshold is None:
+            return None
+        request = _SlowRequest(method, path)
+        with self._lock:
+            self._active[id(request)] = request
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._sample, name="aiida-gui-profiler", daemon=True
+            )
+            self._thread.start()
+        self._wake.set()
+        return request
+
+    def end(self, request: Optional[_SlowRequest], route: str) -> Optional[Path]:
+        """Stop watching ``request``, and write its profile if it was slow."""
+        if request is None:
+            return None
+        with self._lock:
+            self._active.pop(id(request), None)
+        if not request.samples:
+            return None
+        try:
+            return self._write(request, route, time.perf_counter() - request.start)
+        except OSError:
+            print(traceback.format_exc())
+            return None
+
+    def _write(self, request: _SlowRequest, route: str, duration: float) -> Path:
+        directory = Path(self.config.profile_dir or get_profile_dir_path())
+        directory.mkdir(parents=True, exist_ok=True)
+        name = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = (
+            directory / f"{stamp}-{request.method}-{name}-{duration * 1000:.0f}ms.txt"
+        )
+        lines = [f"{stack} {count}" for stack, count in request.samples.items()]
+        path.write_text("\n".join(lines) + "\n")
+        print(
+            f"aiida-gui: {request.method} {request.path} took {duration:.2f} s, "
+            f"profile written to {path}"
+        )
+        return path
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        while True:
+            threshold = self.config.profile_threshold
+            with self._lock:
+                active = list(self._active.values())
+            if threshold is None or not active:
+                self._wake.clear()
+                self._wake.wait()
+                continue
+            now = time.perf_counter()
+            slow = [request for request in active if now - request.start > threshold]
+            if not slow:
+                time.sleep(0.05)
+                continue
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = _collapse(frame, names.get(ident, str(ident)))
+                for request in slow:
+                    request.samples[stack] += 1
+            time.sleep(self.config.sample_interval)
+
+
+def _collapse(frame, thread_name: str) -> str:
+    """Format a stack as ``thread;outer;...;inner``."""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(
+            f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+        )
+        frame = frame.f_back
+    frames.append(thread_name)
+    return ";".join(reversed(frames)).replace(" ", "_")
+
+
+profiling_config = ProfilingConfig(
+    server_timing=backend_settings.aiida_gui_server_timing,
+    profile_threshold=backend_settings.aiida_gui_profile_threshold,
+    profile_dir=backend_settings.aiida_gui_profile_dir,
+)
+profiler = SlowRequestProfiler(profiling_config)
+
+
+def server_timing_header(stats, total: float) -> str:
+    entries = [
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.statements} statements"'
+    ]
+    for name, seconds in stats.timings.items():
+        entries.append(f"{name};dur={seconds * 1000:.1f}")
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class ProfilingMiddleware:
+    """
+    Add the ``Server-Timing`` header and profile the slow requests. It must
+    run inside ``MetricsMiddleware``, which collects the per-request stats.
+    """
+
+    def __init__(self, app, config: ProfilingConfig = profiling_config):
+        self.app = app
+        self.config = config
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if not self.config.server_timing and self.config.profile_threshold is None:
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        stats = current_request_stats()
+        request = profiler.begin(scope["method"], scope["path"])
+
+        async def send_wrapper(message):
+            if (
+                message["type"] == "http.response.start"
+                and self.config.server_timing
+                and stats is not None
+            ):
+                value = server_timing_header(stats, time.perf_counter() - start)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", value.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.end(request, route_name(scope))
+
+
+@router.get("/debug/profiling")
+async def read_profiling() -> ProfilingConfig:
+    return profiling_config
+
+
+@router.put("/debug/profiling")
+async def update_profiling(update: ProfilingUpdate) -> ProfilingConfig:
+    """Switch the Server-Timing header and the slow request profiler on or off.
+
+    Only the fields given are changed, ``"profile_threshold": null`` disables
+    the profiler.
+    """
+    for field, value in update.model_dump(exclude_unset=True).items():
+        if value is None and field != "profile_threshold":
+            continue
+        setattr(profiling_config, field, value)
+    profiler._wake.set()
+    return profiling_config
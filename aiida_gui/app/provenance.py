@@ -0,0 +1,150 @@
+"""The provenance graph around a node, for exploring it without clicking
+through the nodes one by one.
+
+The neighborhood is walked level by level: each level costs one query per
+direction, for all the nodes of the frontier together, and the nodes already
+reached are not visited again.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from aiida import orm
+from fastapi import APIRouter, HTTPException, Query
+
+from aiida_gui.app.responses import FastJSONResponse
+
+router = APIRouter()
+
+MAX_DEPTH = 10
+MAX_NODES = 5000
+NODE_PROJECT = [
+    "id",
+    "uuid",
+    "node_type",
+    "process_type",
+    "label",
+    "attributes.process_state",
+]
+
+
+def _node_dict(row: dict, depth: int) -> dict:
+    return {
+        "pk": row["id"],
+        "uuid": row["uuid"],
+        "node_type": row["node_type"],
+        "process_type": row["process_type"],
+        "label": row["label"],
+        "process_state": row["attributes.process_state"],
+        "depth": depth,
+    }
+
+
+def _neighbors(frontier: List[int], link_types: List[str], outgoing: bool, limit: int):
+    """Yield ``(source, target, type, label, node)`` for the links of the frontier."""
+    qb = orm.QueryBuilder()
+    qb.append(orm.Node, filters={"id": {"in": frontier}}, project="id", tag="start")
+    qb.append(
+        orm.Node,
+        edge_filters={"type": {"in": link_types}},
+        edge_project=["type", "label"],
+        edge_tag="link",
+        project=NODE_PROJECT,
+        tag="other",
+        **({"with_incoming": "start"} if outgoing else {"with_outgoing": "start"}),
+    )
+    qb.order_by({"other": {"id": "asc"}})
+    qb.limit(limit)
+    for row in qb.iterdict():
+        start, other, link = row["start"]["id"], row["other"], row["link"]
+        source, target = (start, other["id"]) if outgoing else (other["id"], start)
+        yield source, target, link["type"], link["label"], other
+
+
+def get_provenance_neighborhood(
+    pk: int,
+    depth: int = 1,
+    max_nodes: int = 500,
+    link_types: Optional[List[str]] = None,
+    direction: str = "both",
+) -> Optional[dict]:
+    """Return the nodes at most ``depth`` links away from node ``pk``, and the
+    links between them, or None if the node does not exist. At most
+    ``max_nodes`` nodes are returned, the closest ones first; ``truncated``
+    tells whether some were left out.
+    """
+    from aiida.common.links import LinkType
+
+    link_types = link_types or [link_type.value for link_type in LinkType]
+    qb = orm.QueryBuilder()
+    qb.append(orm.Node, filters={"id": pk}, project=NODE_PROJECT, tag="node")
+    root = qb.dict()
+    if not root:
+        return None
+
+    nodes: Dict[int, dict] = {pk: _node_dict(root[0]["node"], 0)}
+    links: Dict[Tuple[int, int, str, str], dict] = {}
+    truncated = False
+    frontier = [pk]
+    for level in range(1, depth + 1):
+        if not frontier:
+            break
+        reached = []
+        for outgoing in (True, False):
+            if direction == ("incoming" if outgoing else "outgoing"):
+                continue
+            # edges to nodes already reached are kept, so allow more rows
+            limit = 5 * max_nodes
+            rows = list(_neighbors(frontier, link_types, outgoing, limit))
+            truncated = truncated or len(rows) >= limit
+            for source, target, link_type, label, other in rows:
+                if other["id"] not in nodes:
+                    if len(nodes) >= max_nodes:
+                        truncated = True
+                        continue
+                    nodes[other["id"]] = _node_dict(other, level)
+                    reached.append(other["id"])
+                key = (source, target, link_type, label)
+                if key not in links:
+                    links[key] = {
+                        "source": source,
+                        "target": target,
+                        "type": link_type,
+                        "label": label,
+                    }
+        frontier = reached
+    return {
+        "root": pk,
+        "nodes": list(nodes.values()),
+        "links": list(links.values()),
+        "truncated": truncated,
+    }
+
+
+@router.get("/api/provenance/{id}")
+async def read_provenance(
+    id: int,
+    depth: int = Query(1, ge=1, le=MAX_DEPTH),
+    max_nodes: int = Query(500, gt=0, le=MAX_NODES),
+    link_type: Optional[List[str]] = Query(None),
+    direction: str = Query("both", pattern="^(both|incoming|outgoing)$"),
+):
+    """
+    Return the provenance graph within ``depth`` links of a node.
+
+    The links can be restricted to some types (``link_type``, e.g.
+    ``input_calc`` or ``create``, all by default) and to one ``direction``.
+    """
+    from aiida.common.links import LinkType
+
+    valid = {link_type.value for link_type in LinkType}
+    unknown = set(link_type or []) - valid
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown link types {sorted(unknown)}, valid are {sorted(valid)}",
+        )
+    content = get_provenance_neighborhood(id, depth, max_nodes, link_type, direction)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Node {id} not found")
+    return FastJSONResponse(content)
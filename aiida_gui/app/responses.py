@@ -0,0 +1,66 @@
+"""Fast JSON responses.
+
+The payloads of the tables and of the process summaries are large, and the
+stdlib ``json`` encoder is a visible share of the time spent on them.
+``FastJSONResponse`` renders with ``orjson`` when it is installed (``pip
+install aiida-gui[fast]``), which serializes datetimes, UUIDs and numpy arrays
+natively, and falls back to the stdlib encoder otherwise, or for the content
+``orjson`` rejects, e.g. integers over 64 bits.
+
+Endpoints returning a ``FastJSONResponse`` directly also skip the
+``jsonable_encoder`` pass of FastAPI; objects that neither encoder knows are
+converted with ``jsonable_encoder`` one by one.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from aiida_gui.app.metrics import timed
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Convert the objects the JSON encoders do not support."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "tolist"):
+        # numpy arrays and scalars, when falling back to the stdlib encoder
+        return obj.tolist()
+    return jsonable_encoder(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` to JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                content,
+                default=_default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:
+            # orjson.JSONEncodeError, e.g. an integer over 64 bits
+            pass
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with ``orjson`` when available."""
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            return dumps(content)
@@ -0,0 +1,31 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings
+
+
+class BackendSettings(BaseSettings):
+    """
+    Settings can be set by setting the environment variables in upper case.
+    For example for setting `aiida_workgraph_gui_profile` one has to export
+    the evironment variable `AIIDA_WORKGRAPH_GUI_PROFILE`.
+    """
+
+    aiida_workgraph_gui_profile: str = ""  # if empty aiida uses default profile
+    # seconds between two refreshes of the daemon status shared by all clients
+    aiida_gui_daemon_poll_interval: float = 1.0
+    # seconds between two samples of the worker resource history, and the
+    # number of samples kept per worker (one hour by default)
+    aiida_gui_daemon_history_interval: float = 10.0
+    aiida_gui_daemon_history_size: int = 360
+    # responses smaller than this (bytes) are not compressed
+    aiida_gui_compression_minimum_size: int = 1024
+    # seconds the result of a coalesced read is shared with later identical
+    # requests, 0 to only share it between concurrent ones
+    aiida_gui_coalesce_ttl: float = 1.0
+    # debugging of slow requests, see ``aiida_gui.app.profiling``
+    aiida_gui_server_timing: bool = False
+    aiida_gui_profile_threshold: Optional[float] = None
+    aiida_gui_profile_dir: str = ""
+
+
+backend_settings = BackendSettings()
@@ -0,0 +1,146 @@
+"""Serve the React build: the static assets and the single page app shell.
+
+The build writes ``.br`` and ``.gz`` siblings next to the assets, which are
+sent as they are to the clients accepting these encodings. Assets whose name
+contains a content hash never change and are cached by the browsers for a
+year; ``index.html`` and the shim files are kept in memory and revalidated
+with their ETag.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+
+from aiida_gui.app.compression import accepted_encodings, brotli
+
+# encodings of the precompressed static files, by order of preference
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+# e.g. main.3f2a9c1e.js, 787.8f0c3ef5.chunk.js or logo.6ce24c58023cc2f8.svg
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    Serve the ``.br``/``.gz`` sibling of a static file when the client accepts
+    it, and let the browsers keep the content-hashed files forever.
+    """
+
+    async def get_response(self, path: str, scope):
+        response = await self._get_encoded_response(path, scope)
+        if response.status_code in (200, 304):
+            hashed = HASHED_NAME.search(os.path.basename(path))
+            response.headers["cache-control"] = IMMUTABLE if hashed else REVALIDATE
+        return response
+
+    async def _get_encoded_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code != 200 or not isinstance(response, FileResponse):
+            return response
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding not in accepted:
+                continue
+            full_path = f"{response.path}{suffix}"
+            try:
+                stat_result = os.stat(full_path)
+            except OSError:
+                continue
+            compressed = FileResponse(
+                full_path,
+                stat_result=stat_result,
+                media_type=response.media_type,
+                headers={"content-encoding": encoding, "vary": "Accept-Encoding"},
+            )
+            if self.is_not_modified(compressed.headers, request_headers):
+                return NotModifiedResponse(compressed.headers)
+            return compressed
+        # the response depends on the header if the file has siblings
+        response.headers.add_vary_header("Accept-Encoding")
+        return response
+
+
+class InMemoryFile:
+    """
+    A small file kept in memory together with its ETag and its compressed
+    encodings. It is read again when its modification time changes, e.g.
+    after a new build.
+    """
+
+    def __init__(self, path: Path, media_type: str):
+        self.path = Path(path)
+        self.media_type = media_type
+        self._mtime: Optional[float] = None
+        self._etag: Optional[str] = None
+        self._encodings: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> bool:
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return False
+        if mtime != self._mtime:
+            with self._lock:
+                content = self.path.read_bytes()
+                encodings = {"identity": content, "gzip": gzip.compress(content, 9)}
+                if brotli is not None:
+                    encodings["br"] = brotli.compress(content)
+                self._encodings = encodings
+                self._etag = f'"{hashlib.md5(content).hexdigest()}"'
+                self._mtime = mtime
+        return True
+
+    def response(self, request_headers: Headers) -> Optional[Response]:
+        """Return the response to a request, None if the file does not exist."""
+        if not self._refresh():
+            return None
+        headers = {
+            "etag": self._etag,
+            "cache-control": REVALIDATE,
+            "vary": "Accept-Encoding",
+        }
+        if_none_match = request_headers.get("if-none-match", "")
+        if self._etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self._encodings:
+                headers["content-encoding"] = encoding
+                break
+        else:
+            encoding = "identity"
+        return Response(
+            self._encodings[encoding], media_type=self.media_type, headers=headers
+        )
+
+
+class SinglePageApp:
+    """
+    ASGI app answering the requests that no route matched with ``index.html``,
+    so that the client-side routes of React can be reloaded.
+    """
+
+    def __init__(self, index: InMemoryFile, default):
+        self.index = index
+        self.default = default
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.default(scope, receive, send)
+        response = self.index.response(Headers(scope=scope))
+        if response is None:
+            response = PlainTextResponse("Not Found", status_code=404)
+        await response(scope, receive, send)
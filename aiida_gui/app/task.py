@@ -1,10 +1,8 @@
 from .utils import get_node_summary_table, get_node_inputs, get_node_outputs
-from aiida.orm.utils.serialize import deserialize_unsafe
 from aiida import orm
 from fastapi import APIRouter, HTTPException
 import traceback
 from typing import List
-from aiida.engine.processes import control
 
 router = APIRouter()
 
@@ -13,6 +11,7 @@ router = APIRouter()
 async def read_task(id: int, path: str):
     from .utils import node_to_short_json
     from aiida.orm import load_node
+    from aiida.orm.utils.serialize import deserialize_unsafe
     from aiida_workgraph.orm.workgraph import WorkGraphNode
     from aiida_workgraph.utils import deserialize_input_values_recursively
 
@@ -89,6 +88,7 @@ async def read_task(id: int, path: str):
 
 # General function to manage task actions
 async def manage_task_action(action: str, id: int, tasks: List[str]):
+    from aiida.engine.processes import control
     from aiida_workgraph.utils.control import pause_tasks, play_tasks, kill_tasks
     from aiida_workgraph.orm.workgraph import WorkGraphNode
 
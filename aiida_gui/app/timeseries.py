@@ -0,0 +1,40 @@
+"""Fixed-size, array-backed time series."""
+from __future__ import annotations
+
+from array import array
+from typing import List
+
+
+class RingBuffer:
+    """Keep the last ``capacity`` float values in a preallocated array.
+
+    Appending overwrites the oldest value once the buffer is full, so the
+    memory used never grows.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def append(self, value: float) -> None:
+        end = (self._start + self._size) % self.capacity
+        self._data[end] = value
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def values(self) -> List[float]:
+        """Return the values from the oldest to the newest."""
+        end = self._start + self._size
+        if end <= self.capacity:
+            return self._data[self._start : end].tolist()
+        return (
+            self._data[self._start :].tolist()
+            + self._data[: end - self.capacity].tolist()
+        )
+
+    def __len__(self) -> int:
+        return self._size
@@ -5,6 +5,7 @@ from aiida.orm import load_node, Node
 from datetime import datetime
 from dateutil import relativedelta
 from dateutil.tz import tzlocal
+from aiida_gui.app.metrics import timed
 
 
 def get_executor_source(tdata: Any) -> Tuple[bool, Optional[str]]:
@@ -109,7 +110,8 @@ def get_node_outputs(pk: int | Node) -> Union[str, Dict[str, Union[List[int], st
     return result
 
 
-def get_workchain_data(node: Node) -> dict:
+@timed("links")
+def _get_workchain_graph(node: Node) -> dict:
     from aiida.common.links import LinkType
 
     graph_data = {
@@ -166,6 +168,20 @@ def get_workchain_data(node: Node) -> dict:
     return graph_data
 
 
+def get_workchain_data(node: Node) -> dict:
+    """The graph of the processes called by the workchain, laid out."""
+    from aiida_gui.app.layout import get_layout
+
+    graph_data = _get_workchain_graph(node)
+    with timed("layout"):
+        positions = get_layout(node.uuid, node.is_sealed, graph_data)
+    for pk, position in positions.items():
+        graph_data["nodes"][pk]["position"] = position
+    # the frontend skips its own (slow) auto-arrange when the positions are set
+    graph_data["layout"] = "layered"
+    return graph_data
+
+
 def node_to_short_json(workgraph_pk: int, tdata: Dict[str, Any]) -> Dict[str, Any]:
     """Export a node to a rete js node."""
     from aiida_workgraph.utils import get_processes_latest
@@ -200,13 +216,12 @@ def node_to_short_json(workgraph_pk: int, tdata: Dict[str, Any]) -> Dict[str, An
 
 
 def get_node_summary(node: Node) -> List[List[str]]:
-    summary = {
-        "table": get_node_summary_table(node),
-        "inputs": get_node_inputs(node),
-        "outputs": get_node_outputs(node),
-        "called": get_nodes_called(node),
-        "caller": get_nodes_caller(node),
-    }
+    summary = {"table": get_node_summary_table(node)}
+    with timed("links"):
+        summary["inputs"] = get_node_inputs(node)
+        summary["outputs"] = get_node_outputs(node)
+        summary["called"] = get_nodes_called(node)
+        summary["caller"] = get_nodes_caller(node)
     return summary
 
 
@@ -357,3 +372,40 @@ def get_parent_processes(pk: int) -> List[Dict[str, Union[str, int]]]:
     if len(links) > 0:
         parent_processes.extend(get_parent_processes(links[0].node.pk))
     return parent_processes
+
+
+def get_called_descendants(pk: int) -> Dict[int, int]:
+    """Return the pks of a process and of all processes it called, directly or
+    indirectly, mapped to their depth in the call tree.
+    The tree is walked level by level, with one query per level.
+    """
+    from aiida import orm
+
+    depths = {pk: 0}
+    frontier = [pk]
+    depth = 0
+    while frontier:
+        depth += 1
+        qb = orm.QueryBuilder()
+        qb.append(orm.ProcessNode, filters={"id": {"in": frontier}}, tag="caller")
+        qb.append(orm.ProcessNode, with_caller="caller", project="id")
+        frontier = [child for child in qb.all(flat=True) if child not in depths]
+        depths.update({child: depth for child in frontier})
+    return depths
+
+
+def get_log_levels(min_level: str = "REPORT") -> List[str]:
+    """Return the names of the log levels at or above ``min_level``."""
+    from aiida.common.log import LOG_LEVELS
+
+    return [
+        name for name, value in LOG_LEVELS.items() if value >= LOG_LEVELS[min_level]
+    ]
+
+
+def format_log_line(
+    time: datetime, pk: int, levelname: str, message: str, depth: int = 0
+) -> str:
+    """Format a log entry the same way as ``verdi process report``."""
+    indent = " " * (depth * 4)
+    return f"{time:%Y-%m-%d %H:%M:%S} [{pk} | {levelname:>8s}]:{indent} {message}"
@@ -7,8 +7,10 @@ from aiida_gui.app.node_table import (
     process_project,
     projected_data_to_dict_process,
 )
+from aiida_gui.app.responses import FastJSONResponse
 from aiida.orm import WorkChainNode
 from .utils import get_parent_processes
+from aiida_gui.app.coalesce import single_flight
 
 
 router = make_node_router(
@@ -37,19 +39,25 @@ async def read_workchain(id: int):
         content["summary"] = summary
         content["parent_workflows"] = parent_workflows
         content["processes_info"] = {}
-        return content
+        return FastJSONResponse(content)
     except KeyError as e:
         error_traceback = traceback.format_exc()  # Capture the full traceback
         print(error_traceback)
         raise HTTPException(status_code=404, detail=f"Workchain {id} not found, {e}")
 
 
+# polled every 5 s by each open workflow page
+tasks_state_flight = single_flight()
+
+
 @router.get("/api/workchain-state/{id}")
 async def read_tasks_state(id: int, item_type: str = "called_process"):
     from aiida_workgraph.utils import get_processes_latest
 
     try:
-        processes_info = get_processes_latest(id, item_type=item_type)
+        processes_info = await tasks_state_flight.run(
+            (id, item_type), get_processes_latest, id, item_type=item_type
+        )
         return processes_info
     except KeyError as e:
         error_traceback = traceback.format_exc()  # Capture the full traceback
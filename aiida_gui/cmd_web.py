@@ -28,6 +28,63 @@ def cli():
     pass
 
 
+def read_pid_file(pid_file_path):
+    """Return the (name, pid) pairs recorded in the PID file."""
+    entries = []
+    with open(pid_file_path, "r") as pid_file:
+        for line in pid_file:
+            if line.strip():
+                proc_name, pid = line.strip().split(":")
+                entries.append((proc_name, int(pid)))
+    return entries
+
+
+def get_worker_processes(backend_pid):
+    """
+    Return the worker processes spawned by the uvicorn master, leaving out the
+    other children of the master, e.g. the multiprocessing resource tracker.
+    """
+    import psutil
+
+    workers = []
+    for child in psutil.Process(backend_pid).children():
+        try:
+            cmdline = " ".join(child.cmdline())
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        if "resource_tracker" in cmdline:
+            continue
+        if "spawn_main" in cmdline or "multiprocessing.spawn" in cmdline:
+            workers.append(child)
+    return workers
+
+
+def write_pid_file(pid_file_path, backend_pid, num_workers=0, old=(), wait=10.0):
+    """
+    Record the uvicorn master and, once they are spawned, its ``num_workers``
+    worker processes, waiting for the ``old`` workers to be replaced.
+    """
+    import time
+    import psutil
+
+    workers = []
+    deadline = time.time() + wait
+    while num_workers and time.time() < deadline:
+        try:
+            workers = get_worker_processes(backend_pid)
+        except psutil.NoSuchProcess:
+            break
+        pids = {worker.pid for worker in workers}
+        if len(pids) >= num_workers and not pids & set(old):
+            break
+        time.sleep(0.2)
+    with open(pid_file_path, "w") as pid_file:
+        pid_file.write(f"backend:{backend_pid}\n")
+        for worker in workers:
+            pid_file.write(f"worker:{worker.pid}\n")
+    return [worker.pid for worker in workers]
+
+
 @cli.command()
 @click.option(
     "--watch",
@@ -42,34 +99,59 @@ def cli():
     default=False,
     help="Run the web application in the background and detach from terminal.",
 )
-def start(watch, background):
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes serving the requests (ignored with --watch).",
+)
+@click.option("--host", default="0.0.0.0", show_default=True, help="Bind address.")
+@click.option("--port", type=int, default=8000, show_default=True, help="Bind port.")
+@click.option(
+    "--uds",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Bind to this Unix domain socket instead of host and port, "
+    "e.g. behind a reverse proxy.",
+)
+def start(watch, background, workers, host, port, uds):
     """Start the web application (FastAPI backend)."""
     pid_file_path = get_pid_file_path()
-    command = [
-        "uvicorn",
-        "aiida_gui.app.api:app",
-        "--host",
-        "0.0.0.0",
-        "--port",
-        "8000",
-    ]
+    command = ["uvicorn", "aiida_gui.app.api:app"]
+    if uds:
+        command.extend(["--uds", uds])
+    else:
+        command.extend(["--host", host, "--port", str(port)])
 
     if watch:
         command.append("--reload")
         click.echo("Watch mode enabled: The application will reload on file changes.")
+        if workers > 1:
+            click.echo("Watch mode runs a single worker, --workers is ignored.")
     else:
         click.echo(
             "Watch mode disabled: The application will not reload on file changes."
         )
+        if workers > 1:
+            # requests are spread over the workers, and a slow request only
+            # blocks its own worker
+            command.extend(["--workers", str(workers)])
+            click.echo(f"Serving with {workers} worker processes.")
 
     if background:
         click.echo("Starting the web application in background...")
         # Launch uvicorn in the background
         backend_process = subprocess.Popen(command)
-        # Write the PID into our file for later stop
-        with open(pid_file_path, "w") as pid_file:
-            pid_file.write(f"backend:{backend_process.pid}\n")
+        # Write the PIDs into our file for later stop
+        multiprocess = workers > 1 and not watch
+        worker_pids = write_pid_file(
+            pid_file_path, backend_process.pid, workers if multiprocess else 0
+        )
         click.echo(f"Web backend started (PID {backend_process.pid}).")
+        if multiprocess:
+            click.echo(f"Worker PIDs: {', '.join(map(str, worker_pids))}")
     else:
         click.echo("Starting the web application in foreground. Press Ctrl+C to stop.")
         try:
@@ -88,18 +170,53 @@ def stop():
         click.echo("No running web application found.")
         return
 
-    with open(pid_file_path, "r") as pid_file:
-        for line in pid_file:
-            proc_name, pid = line.strip().split(":")
-            try:
-                os.kill(int(pid), signal.SIGTERM)
-                click.echo(f"Stopped {proc_name} (PID: {pid})")
-            except ProcessLookupError:
+    # stop the master first, it shuts down its workers; then any left behind
+    for proc_name, pid in read_pid_file(pid_file_path):
+        try:
+            os.kill(pid, signal.SIGTERM)
+            click.echo(f"Stopped {proc_name} (PID: {pid})")
+        except ProcessLookupError:
+            if proc_name == "backend":
                 click.echo(f"{proc_name} (PID: {pid}) was not found")
 
     os.remove(pid_file_path)
     click.echo("Cleaned up PID file.")
 
 
+@cli.command()
+def restart():
+    """Restart the worker processes of a background web application.
+
+    The uvicorn master replaces its workers one by one on SIGHUP, so the
+    application keeps serving requests during the restart.
+    """
+    pid_file_path = get_pid_file_path()
+
+    if not pid_file_path.exists():
+        click.echo("No running web application found.")
+        return
+
+    entries = read_pid_file(pid_file_path)
+    backend_pid = dict(entries).get("backend")
+    if not any(proc_name == "worker" for proc_name, _ in entries):
+        click.echo(
+            "Only a web backend started with --workers can be restarted without "
+            "downtime, use `aiida-gui stop` and `aiida-gui start` instead."
+        )
+        return
+    try:
+        os.kill(backend_pid, signal.SIGHUP)
+    except (ProcessLookupError, TypeError):
+        click.echo("The web backend is not running, start it with `aiida-gui start`.")
+        return
+    click.echo(f"Restarting the workers of the web backend (PID {backend_pid}).")
+    old = [pid for proc_name, pid in entries if proc_name == "worker"]
+    worker_pids = write_pid_file(
+        pid_file_path, backend_pid, len(old), old=old, wait=60.0
+    )
+    if worker_pids:
+        click.echo(f"Worker PIDs: {', '.join(map(str, worker_pids))}")
+
+
 if __name__ == "__main__":
     cli()
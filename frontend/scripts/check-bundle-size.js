@@ -0,0 +1,44 @@
+// Fail the build when the bundles grow over their budget, in kB gzipped.
+// The initial bundle is what the process list downloads before it becomes
+// interactive; the heavy pages (graph editor, 3D viewer) must stay in lazy
+// chunks. Override the budgets with BUNDLE_BUDGET_INITIAL / BUNDLE_BUDGET_CHUNK.
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+const INITIAL_BUDGET = Number(process.env.BUNDLE_BUDGET_INITIAL || 450);
+const CHUNK_BUDGET = Number(process.env.BUNDLE_BUDGET_CHUNK || 800);
+
+const root = process.argv[2] || 'build';
+const manifest = JSON.parse(
+  fs.readFileSync(path.join(root, 'asset-manifest.json'), 'utf8')
+);
+
+const gzippedSize = (file) =>
+  zlib.gzipSync(fs.readFileSync(path.join(root, file)), { level: 9 }).length / 1024;
+
+const initial = manifest.entrypoints.filter((file) => file.endsWith('.js'));
+const chunks = fs
+  .readdirSync(path.join(root, 'static', 'js'))
+  .filter((name) => name.endsWith('.js'))
+  .map((name) => `static/js/${name}`)
+  .filter((file) => !initial.includes(file));
+
+const errors = [];
+const initialSize = initial.reduce((total, file) => total + gzippedSize(file), 0);
+console.log(`initial bundle: ${initialSize.toFixed(1)} kB gzipped (budget ${INITIAL_BUDGET} kB)`);
+if (initialSize > INITIAL_BUDGET) {
+  errors.push(`the initial bundle is ${initialSize.toFixed(1)} kB, over ${INITIAL_BUDGET} kB`);
+}
+for (const file of chunks) {
+  const size = gzippedSize(file);
+  if (size > CHUNK_BUDGET) {
+    errors.push(`${file} is ${size.toFixed(1)} kB, over ${CHUNK_BUDGET} kB`);
+  }
+}
+console.log(`${chunks.length} lazy chunks (budget ${CHUNK_BUDGET} kB each)`);
+
+if (errors.length) {
+  errors.forEach((error) => console.error(`Bundle size budget exceeded: ${error}`));
+  process.exit(1);
+}
@@ -0,0 +1,39 @@
+// Write .br and .gz siblings of the compressible build assets, which the
+// server sends as they are to the clients accepting these encodings.
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+const EXTENSIONS = ['.js', '.css', '.html', '.json', '.svg', '.map', '.txt'];
+const MIN_SIZE = 1024;
+
+function* walk(dir) {
+  for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+    const file = path.join(dir, entry.name);
+    if (entry.isDirectory()) {
+      yield* walk(file);
+    } else {
+      yield file;
+    }
+  }
+}
+
+const root = process.argv[2] || 'build';
+let count = 0;
+for (const file of walk(root)) {
+  if (!EXTENSIONS.includes(path.extname(file))) continue;
+  const data = fs.readFileSync(file);
+  if (data.length < MIN_SIZE) continue;
+  fs.writeFileSync(`${file}.gz`, zlib.gzipSync(data, { level: 9 }));
+  fs.writeFileSync(
+    `${file}.br`,
+    zlib.brotliCompressSync(data, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: data.length,
+      },
+    }),
+  );
+  count += 1;
+}
+console.log(`Precompressed ${count} files in ${root}`);
@@ -1,15 +1,10 @@
-import React, { useState, useEffect, Suspense } from 'react';
+import React, { useState, useEffect, Suspense, lazy } from 'react';
 import { BrowserRouter as Router, Routes, Route } from 'react-router-dom';
 
 import Home from './components/Home';
 import DataNodeTable from './components/DataNodeTable';
 import GroupNodeTable from './components/GroupNodeTable';
-import GroupNodeDetail from './components/GroupNodeDetail';
 import { ProcessTable } from './components/ProcessTable';
-import ProcessNodeDetail from './components/ProcessItem';
-import WorkFlowItem from './components/WorkFlowItem';
-import DataNodeItem from './components/DataNodeItem';
-import Daemon from './components/Daemon';
 import Layout from './components/Layout';
 import hostComponents from './HostComponents'; // Import the host components
 
@@ -17,7 +12,18 @@ import { PluginProvider, usePluginContext } from './components/PluginContext';
 
 import './App.css';
 
+// The tables are in the main bundle, the detail pages (graph editor, 3D
+// viewer, charts, ...) are downloaded when first opened.
+const GroupNodeDetail = lazy(() => import('./components/GroupNodeDetail'));
+const ProcessNodeDetail = lazy(() => import('./components/ProcessItem'));
+const WorkFlowItem = lazy(() => import('./components/WorkFlowItem'));
+const DataNodeItem = lazy(() => import('./components/DataNodeItem'));
+const Daemon = lazy(() => import('./components/Daemon'));
+
 function NotFound() {
+  // the page may be one of the plugins still loading
+  const { loaded } = usePluginContext();
+  if (!loaded) return <div>Loading page…</div>;
   return <div>Sorry, that page doesn’t exist.</div>;
 }
 
@@ -69,6 +75,7 @@ function AppContent({error }) {
 }
 
 export default function App() {
+  // the built-in pages are rendered while the plugin list is fetched
   const [pluginNames, setPluginNames] = useState(null);
   const [error, setError] = useState(null);
 
@@ -87,10 +94,6 @@ export default function App() {
       });
   }, []);
 
-  if (pluginNames === null) {
-    return <div>Loading plugin list…</div>;
-  }
-
   return (
     <Router>
       <PluginProvider pluginNames={pluginNames}>
@@ -1,8 +1,11 @@
 
+import { lazy } from 'react';
 import NodeTable from './components/NodeTable';
-import WorkFlowItem from './components/WorkFlowItem';
 import { extraProcessActions } from './components/ProcessTable'; // the generic table
 
+// the graph editor is only downloaded when a plugin page renders it
+const WorkFlowItem = lazy(() => import('./components/WorkFlowItem'));
+
 // Any host-provided components available for plugins
 const hostComponents = {
 NodeTable,
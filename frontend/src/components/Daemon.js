@@ -1,22 +1,36 @@
-import React, { useState, useEffect } from 'react';
+import React from 'react';
 import { ToastContainer, toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
+import useQuery from '../hooks/useQuery';
 
-function Settings() {
-  const [workers, setWorkers] = useState([]);
+/** Tiny inline line chart of a series of numbers. */
+function Sparkline({ values, width = 120, height = 24, color = '#1976d2' }) {
+  if (!values || values.length < 2) return null;
+  const max = Math.max(...values);
+  const min = Math.min(...values);
+  const range = max - min || 1;
+  const points = values
+    .map((v, i) => {
+      const x = (i / (values.length - 1)) * width;
+      const y = height - ((v - min) / range) * (height - 2) - 1;
+      return `${x.toFixed(1)},${y.toFixed(1)}`;
+    })
+    .join(' ');
+  return (
+    <svg width={width} height={height} style={{ verticalAlign: 'middle' }}>
+      <polyline points={points} fill="none" stroke={color} strokeWidth="1.5" />
+    </svg>
+  );
+}
 
-  const fetchWorkers = () => {
-    fetch('/api/daemon/worker')
-      .then(response => response.json())
-      .then(data => setWorkers(Object.values(data)))
-      .catch(error => console.error('Failed to fetch workers:', error));
-  };
+const formatBytes = (bytes) => `${(bytes / 1024 / 1024).toFixed(0)} MB`;
 
-  useEffect(() => {
-    fetchWorkers();
-    const interval = setInterval(fetchWorkers, 1000); // Poll every 5 seconds
-    return () => clearInterval(interval); // Clear interval on component unmount
-  }, []);
+function Settings() {
+  // metrics are cached for 10 s, and the history is sampled every 10 s
+  const { data: metrics } = useQuery('/api/daemon/metrics', { refetchInterval: 10000 });
+  const { data: history = {} } = useQuery('/api/daemon/worker-history', { refetchInterval: 10000 });
+  const { data: workerData, refetch: fetchWorkers } = useQuery('/api/daemon/worker', { refetchInterval: 1000 });
+  const workers = Object.values(workerData ?? {});
 
   const handleDaemonControl = (action) => {
     fetch(`/api/daemon/${action}`, { method: 'POST' })
@@ -58,20 +72,51 @@ function Settings() {
             <th>PID</th>
             <th>Memory %</th>
             <th>CPU %</th>
+            <th>RSS</th>
+            <th>CPU history</th>
+            <th>Memory history</th>
             <th>Started</th>
           </tr>
         </thead>
         <tbody>
-          {workers.map(worker => (
-            <tr key={worker.pid}>
-              <td>{worker.pid}</td>
-              <td>{worker.mem}</td>
-              <td>{worker.cpu}</td>
-              <td>{new Date(worker.started * 1000).toLocaleString()}</td>
-            </tr>
-          ))}
+          {workers.map(worker => {
+            const series = history[worker.pid];
+            const rss = series?.rss ?? [];
+            return (
+              <tr key={worker.pid}>
+                <td>{worker.pid}</td>
+                <td>{worker.mem}</td>
+                <td>{worker.cpu}</td>
+                <td>{rss.length ? formatBytes(rss[rss.length - 1]) : '–'}</td>
+                <td><Sparkline values={series?.cpu} color="#ef6c00" /></td>
+                <td><Sparkline values={rss} /></td>
+                <td>{new Date(worker.started * 1000).toLocaleString()}</td>
+              </tr>
+            );
+          })}
         </tbody>
       </table>
+      {metrics && (
+        <>
+          <h3>Throughput</h3>
+          <table className="table">
+            <tbody>
+              <tr><td>Created / min (last {metrics.window} min)</td><td>{metrics.created_per_minute.toFixed(1)}</td></tr>
+              <tr><td>Finished / min (last {Math.round(metrics.finished_window)} min)</td><td>{metrics.finished_per_minute.toFixed(1)}</td></tr>
+              {Object.entries(metrics.states).map(([state, count]) => (
+                <tr key={state}><td>{state[0].toUpperCase() + state.slice(1)}</td><td>{count}</td></tr>
+              ))}
+              <tr>
+                <td>Worker slots used</td>
+                <td>
+                  {metrics.active} / {metrics.total_slots}
+                  {metrics.slot_usage !== null && ` (${(metrics.slot_usage * 100).toFixed(0)} %)`}
+                </td>
+              </tr>
+            </tbody>
+          </table>
+        </>
+      )}
       <button className="button button-start" onClick={() => handleDaemonControl('start')}>Start Daemon</button>
       <button className="button button-stop" onClick={() => handleDaemonControl('stop')}>Stop Daemon</button>
       <button className="button button-adjust" onClick={() => adjustWorkers('increase')}>Increase Workers</button>
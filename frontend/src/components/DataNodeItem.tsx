@@ -1,22 +1,17 @@
-import React, { useState, useEffect } from 'react';
+import React, { Suspense, lazy } from 'react';
 import { useParams } from 'react-router-dom';
-import AtomsItem from './AtomsItem.js'; // Adjust the path as necessary
+import useQuery from '../hooks/useQuery';
 
 import './DataNodeItem.css';
 import '../App.css';
 
+// the 3D viewer is only downloaded for the structures and trajectories
+const AtomsItem = lazy(() => import('./AtomsItem.js'));
+
 function DataNodeItem() {
   const { pk } = useParams();
-  const [NodeData, setNodeData] = useState({ node_type: "" });
-
-  useEffect(() => {
-    fetch(`/api/datanode/${pk}`)
-      .then(response => response.json())
-      .then(data => {
-        setNodeData(data);
-      })
-      .catch(error => console.error('Error fetching data:', error));
-  }, [pk]); // Only re-run when `pk` changes
+  const { data } = useQuery(`/api/datanode/${pk}`); // Only re-fetched when `pk` changes
+  const NodeData = data ?? { node_type: "" };
 
   // Safely convert any value to a string
   const stringifyValue = (value: unknown): string => {
@@ -46,9 +41,11 @@ function DataNodeItem() {
           ))}
         </tbody>
       </table>
-      {NodeData.node_type === 'data.core.structure.StructureData.' && <AtomsItem data={NodeData} />}
-      {NodeData.node_type === 'data.core.array.trajectory.TrajectoryData.' && <AtomsItem data={NodeData} />}
-      {NodeData.node_type === 'data.workgraph.ase.atoms.Atoms.AtomsData.' && <AtomsItem data={NodeData} />}
+      <Suspense fallback={<div>Loading viewer…</div>}>
+        {NodeData.node_type === 'data.core.structure.StructureData.' && <AtomsItem data={NodeData} />}
+        {NodeData.node_type === 'data.core.array.trajectory.TrajectoryData.' && <AtomsItem data={NodeData} />}
+        {NodeData.node_type === 'data.workgraph.ase.atoms.Atoms.AtomsData.' && <AtomsItem data={NodeData} />}
+      </Suspense>
     </div>
   );
 }
@@ -1,7 +1,7 @@
 import React, { useEffect, useState, useMemo } from 'react';
 import { useParams, Link } from 'react-router-dom';
 import NodeTable from './NodeTable';
-import { IconButton, Tooltip } from '@mui/material';
+import { Button, IconButton, TextField, Tooltip } from '@mui/material';
 import { RemoveCircleOutline } from '@mui/icons-material';
 import { toast } from 'react-toastify';
 import { Card, CardContent } from '@mui/material';
@@ -72,6 +72,79 @@ function memberActions(row, { actionBase, refetch, openConfirmModal }) {
   );
 }
 
+/* -------------------------------- bulk add / remove -------------------------------- */
+function postMembers(url, payload, refetch) {
+  return fetch(url, {
+    method : 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body   : JSON.stringify(payload),
+  })
+    .then(async r => {
+      const d = await r.json();
+      if (!r.ok) throw new Error(d.detail);
+      toast.success(d.message);
+    })
+    .catch(err => toast.error(err.message || 'Request failed'))
+    .finally(() => refetch());
+}
+
+function AddMembers({ actionBase, refetch }) {
+  const [value, setValue] = useState('');
+
+  const handleAdd = () => {
+    const pks = value.split(/[\s,]+/).filter(Boolean).map(Number);
+    if (!pks.length || pks.some(Number.isNaN)) {
+      toast.error('Enter a list of node PKs');
+      return;
+    }
+    postMembers(`${actionBase}/add`, { pks }, refetch).then(() => setValue(''));
+  };
+
+  return (
+    <>
+      <TextField
+        size="small" placeholder="PKs to add, e.g. 12, 15, 20"
+        value={value} onChange={e => setValue(e.target.value)}
+        sx={{ minWidth: 260 }}
+      />
+      <Button variant="outlined" onClick={handleAdd}>Add nodes</Button>
+    </>
+  );
+}
+
+function memberBulkActions(selected, { actionBase, filterModel, refetch, openConfirmModal }) {
+  const removeSelected = () => openConfirmModal(
+    'Confirm Removal',
+    <p>Remove {selected.length} selected nodes from this group?</p>,
+    () => postMembers(`${actionBase}/remove`, { pks: selected }, refetch),
+  );
+  const removeMatching = () => openConfirmModal(
+    'Confirm Removal',
+    <p>
+      Remove <b>all</b> nodes matching the current filter from this group? <br/>
+      <b>You can add them back later if needed.</b>
+    </p>,
+    () => postMembers(
+      `${actionBase}/remove`,
+      { filterModel: JSON.stringify(filterModel) },
+      refetch,
+    ),
+  );
+
+  return (
+    <>
+      <AddMembers actionBase={actionBase} refetch={refetch} />
+      <Button
+        color="warning" variant="outlined"
+        disabled={!selected.length} onClick={removeSelected}
+      >
+        Remove selected ({selected.length})
+      </Button>
+      <Button color="warning" onClick={removeMatching}>Remove all matching filter</Button>
+    </>
+  );
+}
+
 const editableFields = ['label', 'description'];
 
 export default function GroupNodeDetail() {
@@ -136,6 +209,7 @@ export default function GroupNodeDetail() {
         config={{
           columns: memberColumns,
           buildExtraActions: memberActions,
+          buildBulkActions: memberBulkActions,
           editableFields,
           includeDeleteButton: false,
         }}
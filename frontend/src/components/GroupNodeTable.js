@@ -7,6 +7,7 @@ const groupColumns = linkPrefix => ([
   { field:'pk', headerName:'PK', width:90,
     renderCell:p => <a href={`${linkPrefix}/${p.value}`}>{p.value}</a> },
   { field:'ctime',     headerName:'Created', width:150 },
+  { field:'count',      headerName:'Nodes',   width:100, sortable:false, filterable:false },
   { field:'label',      headerName:'Label',       width:250, editable:true },
   { field:'description',headerName:'Description', width:250, editable:true },
 ]);
@@ -44,6 +44,62 @@ function MuiFooter() {
   );
 }
 
+/* --------- background jobs (deletion) --------- */
+const JOB_FINAL_STATES = ['finished', 'failed', 'cancelled', 'interrupted'];
+
+function jobText(job) {
+  const { traversed, deleted } = job.progress ?? {};
+  let counts = traversed === undefined ? '' : ` ${deleted ?? 0}/${traversed} nodes`;
+  // e.g. the traversal of the provenance graph, its size is not known yet
+  if (job.indeterminate) counts = '…';
+  return `${job.description}: ${job.stage || job.status}${counts}`;
+}
+
+function JobToast({ job }) {
+  const cancel = () => fetch(`/api/jobs/${job.id}/cancel`, { method:'POST' })
+    .then(r => r.json())
+    .then(d => d.detail && toast.error(d.detail));
+  return (
+    <Box sx={{ display:'flex', alignItems:'center', gap:1 }}>
+      <Typography variant="body2">{jobText(job)}</Typography>
+      {job.stage !== 'committing' && (
+        <Typography
+          variant="body2" color="error" sx={{ cursor:'pointer' }} onClick={cancel}
+        >
+          Cancel
+        </Typography>
+      )}
+    </Box>
+  );
+}
+
+/** Poll a job until it is done, showing its progress in a toast. */
+function followJob(jobId, onDone) {
+  const toastId = toast.info('Deletion queued', { autoClose:false, closeOnClick:false });
+  return new Promise(resolve => {
+    const poll = () => fetch(`/api/jobs/${jobId}`)
+      .then(r => r.json())
+      .then(job => {
+        if (!JOB_FINAL_STATES.includes(job.status)) {
+          toast.update(toastId, { render: <JobToast job={job} /> });
+          setTimeout(poll, 1000);
+          return;
+        }
+        const ok = job.status === 'finished';
+        toast.update(toastId, {
+          render   : ok ? `${job.description}: deleted ${job.result?.count ?? 0} nodes`
+                        : `${job.description}: ${job.message || job.status}`,
+          type     : ok ? 'success' : 'error',
+          autoClose: 3000,
+        });
+        onDone?.();
+        resolve(job);
+      })
+      .catch(() => setTimeout(poll, 1000));
+    poll();
+  });
+}
+
 /* ---------------------------------------------------------------------------
    Generic table.
    Everything that varies is passed in through the `config` prop.
@@ -53,7 +109,7 @@ export default function NodeTable({
   endpointBase,
   linkPrefix,
   actionBase,
-  config, // { columns, buildExtraActions, editableFields, includeDeleteGroupNodesOption? }
+  config, // { columns, buildExtraActions, buildBulkActions?, editableFields, includeDeleteGroupNodesOption?, invalidates? }
 }) {
   const {
     rows, rowCount,
@@ -62,7 +118,7 @@ export default function NodeTable({
     sortModel, setSortModel,
     filterModel, setFilter,
     refetch,
-  } = useNodeTable(endpointBase);
+  } = useNodeTable(endpointBase, config.invalidates);
 
   /* ─────────────────────────── generic confirm‑modal state ────────────────────────── */
   const [modalOpen,   setModalOpen]   = useState(false);
@@ -70,6 +126,9 @@ export default function NodeTable({
   const [modalBody,   setModalBody]   = useState(null);
   const [onConfirm,   setOnConfirm]   = useState(() => () => {});
   const [deleteGroupNodes, setDeleteGroupNodes] = useState(false); // only used by group delete
+  /* multi‑select, only enabled when the caller supplies bulk actions */
+  const [rowSelectionModel, setRowSelectionModel] = useState([]);
+  const bulkEnabled = Boolean(config.buildBulkActions);
 
   /** open any confirm‑modal */
   const openConfirmModal = (title, body, confirmFn) => {
@@ -106,7 +165,7 @@ export default function NodeTable({
   const askDelete = (row, refetchLocal) => {
     fetch(`${endpointBase}/delete/${row.pk}?dry_run=True`, { method:'DELETE' })
       .then(r => r.json())
-      .then(({ deleted_nodes }) => {
+      .then(({ deleted_nodes, token }) => {
         const deps = deleted_nodes.filter(pk => pk !== row.pk);
 
         /* default body */
@@ -136,18 +195,22 @@ export default function NodeTable({
           );
         }
 
-        /* confirm handler */
+        /* confirm handler: the deletion runs as a background job */
         const confirmFn = () => {
-          const url = `${endpointBase}/delete/${row.pk}` +
+          /* the dry-run token lets the backend skip a second traversal */
+          const url = `${endpointBase}/delete/${row.pk}?background=True` +
+                      (token ? `&token=${token}` : '') +
                       (config.includeDeleteGroupNodesOption && deleteGroupNodes
-                        ? '?delete_nodes=True'
+                        ? '&delete_nodes=True'
                         : '');
 
           fetch(url, { method:'DELETE' })
             .then(r => r.json())
-            .then(({ deleted, message }) =>
-              deleted ? toast.success(message)
-                      : toast.error('Delete failed'))
+            .then(({ job_id, detail }) => {
+              if (!job_id) throw new Error(detail || 'Delete failed');
+              return followJob(job_id, refetchLocal);
+            })
+            .catch(err => toast.error(err.message))
             .finally(() => {
               refetchLocal();
             });
@@ -188,6 +251,15 @@ export default function NodeTable({
     <div style={{ padding:'1rem' }}>
       <h2>{title}</h2>
 
+      {bulkEnabled && (
+        <Box sx={{ display:'flex', alignItems:'center', gap:1, mb:1 }}>
+          {config.buildBulkActions(rowSelectionModel, {
+            actionBase, filterModel, openConfirmModal,
+            refetch: () => { setRowSelectionModel([]); refetch(); },
+          })}
+        </Box>
+      )}
+
       <DataGrid
         /* server‑side stuff */
         rows={rows} rowCount={rowCount}
@@ -200,6 +272,13 @@ export default function NodeTable({
         filterModel={filterModel}     onFilterModelChange={setFilter}
         pageSizeOptions={[15, 30, 50]}
 
+        /* multi‑select for bulk actions, kept across pages */
+        checkboxSelection={bulkEnabled}
+        disableRowSelectionOnClick
+        keepNonExistentRowsSelected
+        rowSelectionModel={rowSelectionModel}
+        onRowSelectionModelChange={setRowSelectionModel}
+
         /* columns */
         columns={columns}
         columnVisibilityModel={columnVisibilityModel}
@@ -4,16 +4,19 @@ import React, { createContext, useState, useEffect, useContext } from 'react';
 const PluginContext = createContext({
   dataViews: {},
   routes: {},
+  loaded: false,
 });
 
 /**
- * PluginProvider: dynamically imports plugins, merges dataViews & routes
+ * PluginProvider: dynamically imports plugins, merges dataViews & routes.
+ * `pluginNames` is null while the list of plugins is not known yet.
  */
 export function PluginProvider({ pluginNames, children }) {
   const [dataViews, setDataViews] = useState({});
   const [routes, setRoutes] = useState({});
   const [homeItems, setHomeItems] = useState({});
   const [sideBarItems, setSideBarItems] = useState({});
+  const [loaded, setLoaded] = useState(false);
 
   useEffect(() => {
     if (!pluginNames || pluginNames.length === 0) {
@@ -21,6 +24,7 @@ export function PluginProvider({ pluginNames, children }) {
       setRoutes({});
       setHomeItems({});
       setSideBarItems({});
+      setLoaded(pluginNames !== null);
       return;
     }
 
@@ -32,11 +36,20 @@ export function PluginProvider({ pluginNames, children }) {
       const mergedHomeItems = {};
       const mergedSideBarItems = {};
 
-      for (const name of pluginNames) {
+      // download the plugins in parallel, merge them in the order of the list
+      const modules = await Promise.all(pluginNames.map((name) =>
+        import(
+          /* webpackIgnore: true */ `/plugins/${name}/static/${name}.esm.js`
+        ).catch((err) => {
+          console.error(`Failed to load plugin "${name}":`, err);
+          return null;
+        })
+      ));
+
+      modules.forEach((mod, index) => {
+        if (!mod) return;
+        const name = pluginNames[index];
         try {
-          const mod = await import(
-            /* webpackIgnore: true */ `/plugins/${name}/static/${name}.esm.js`
-          );
           const def = mod.default || mod;
           if (def.dataView) Object.assign(mergedDataViews, def.dataView);
           if (def.routes)   Object.assign(mergedRoutes,   def.routes);
@@ -45,13 +58,14 @@ export function PluginProvider({ pluginNames, children }) {
         } catch (err) {
           console.error(`Failed to load plugin "${name}":`, err);
         }
-      }
+      });
 
       if (!cancelled) {
         setDataViews(mergedDataViews);
         setRoutes(mergedRoutes);
         setHomeItems(mergedHomeItems);
         setSideBarItems(mergedSideBarItems);
+        setLoaded(true);
       }
     }
 
@@ -60,7 +74,7 @@ export function PluginProvider({ pluginNames, children }) {
   }, [pluginNames]);
 
   return (
-    <PluginContext.Provider value={{ dataViews, routes, homeItems, sideBarItems }}>
+    <PluginContext.Provider value={{ dataViews, routes, homeItems, sideBarItems, loaded }}>
       {children}
     </PluginContext.Provider>
   );
@@ -2,6 +2,7 @@ import React, { useEffect, useState } from 'react';
 import Timeline from 'react-calendar-timeline';
 import 'react-calendar-timeline/lib/Timeline.css';
 import moment from 'moment';
+import useQuery, { queryKey } from '../hooks/useQuery';
 
 const NodeDurationGraph = ({ id }) => {
     const [processesInfo, setProcessesInfo] = useState({});
@@ -12,26 +13,19 @@ const NodeDurationGraph = ({ id }) => {
     const [initialLoad, setInitialLoad] = useState(true);
     const [useItemType, setUseItemType] = useState("called_process");
 
-    const fetchData = async () => {
-        try {
-            const response = await fetch(`/api/workchain-state/${id}?item_type=${useItemType}`);
-            if (!response.ok) {
-                throw new Error('Network response was not ok');
-            }
-            const data = await response.json();
-            setProcessesInfo(data);
-        } catch (error) {
-            console.error('Error fetching data:', error);
-        }
-    };
+    const { data } = useQuery(
+        queryKey(`/api/workchain-state/${id}`, { item_type: useItemType }),
+        { refetchInterval: 5000 }
+    );
 
     useEffect(() => {
         setInitialLoad(true);
-        fetchData();
-        const interval = setInterval(fetchData, 5000);
-        return () => clearInterval(interval);
     }, [id, useItemType]);
 
+    useEffect(() => {
+        if (data) setProcessesInfo(data);
+    }, [data]);
+
     useEffect(() => {
         if (Object.keys(processesInfo).length) {
             const newGroups = Object.keys(processesInfo).map((key, idx) => ({
@@ -1,21 +1,16 @@
-import { useEffect, useState } from 'react';
+import { useState } from 'react';
 import { useParams } from 'react-router-dom';
 import { Button } from 'antd';
 import { PageContainer, TopMenu } from './ProcessItemStyles';
 import ProcessSummary from './ProcessSummary';
 import ProcessLog from './ProcessLog';
+import useQuery from '../hooks/useQuery';
 
 export default function Process() {
   const { pk } = useParams();
   const [view, setView] = useState('Summary');
-  const [summary, setSummary] = useState(null);
-
-  /* fetch once */
-  useEffect(() => {
-    fetch(`/api/process/${pk}`)
-      .then(r => r.json())
-      .then(setSummary);
-  }, [pk]);
+  /* fetch once, shared with the other views of the process */
+  const { data: summary } = useQuery(`/api/process/${pk}`);
 
   return (
     <PageContainer>
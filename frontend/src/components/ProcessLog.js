@@ -1,6 +1,7 @@
 // ProcessLog.js
 import styled from "styled-components";
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
+import useQuery, { queryKey } from "../hooks/useQuery";
 
 
 export const ProcessLogStyle = styled.div`
@@ -23,42 +24,197 @@ export const ProcessLogStyle = styled.div`
 .log-content {
   flex-grow: 1;
 }
+
+.log-filters {
+  display: flex;
+  gap: 0.5em;
+  align-items: center;
+  margin-bottom: 0.5em;
+  font-family: sans-serif;
+  font-size: 0.8em;
+}
+
+.log-level {
+  cursor: pointer;
+  padding: 0.1em 0.5em;
+  border: 1px solid #ccc;
+  border-radius: 1em;
+}
+
+.log-level.active {
+  background: #444;
+  color: #fff;
+}
+
+.log-level-ERROR, .log-level-CRITICAL {
+  color: #c62828;
+}
+
+.log-level-WARNING {
+  color: #ef6c00;
+}
 `;
 
+// number of records per page when searching
+const SEARCH_PAGE_SIZE = 200;
+
+/** Filtered, paginated view of the log records, queried on the server. */
+function LogSearch({ id, text, levels, setLevelCounts }) {
+  const [page, setPage] = useState(0);
+
+  useEffect(() => { setPage(0); }, [id, text, levels]);
+
+  const { data: result } = useQuery(
+    queryKey(`/api/process-log-records/${id}`, {
+      skip: page * SEARCH_PAGE_SIZE,
+      limit: SEARCH_PAGE_SIZE,
+      text: text || null,
+      level: levels,
+    })
+  );
+  const records = result?.data ?? [];
+  const total = result?.total ?? 0;
+
+  useEffect(() => {
+    if (result) setLevelCounts(result.level_counts);
+  }, [result, setLevelCounts]);
+
+  const pages = Math.max(1, Math.ceil(total / SEARCH_PAGE_SIZE));
+  return (
+    <>
+      <div className="log-filters">
+        {total} records
+        <button disabled={page === 0} onClick={() => setPage(page - 1)}>Prev</button>
+        {page + 1} / {pages}
+        <button disabled={page + 1 >= pages} onClick={() => setPage(page + 1)}>Next</button>
+      </div>
+      <div className="log-content">
+        {records.map((record) => (
+          <div key={record.id} className={`log-level-${record.level}`}>
+            {`${record.time.slice(0, 19).replace("T", " ")} [${record.pk} | ${record.level.padStart(8)}]: ${record.message}`}
+          </div>
+        ))}
+      </div>
+    </>
+  );
+}
+
+// number of log lines fetched per request
+const PAGE_SIZE = 2000;
+
 function ProcessLog({ id }) {
   const [fetchedLogs, setFetchedLogs] = useState([]);
+  // id of the last log entry received, only newer entries are fetched
+  const cursorRef = useRef(0);
+  // the server sends the last entries before the cursor again, skip them
+  const seenIdsRef = useRef(new Set());
+  const isFetchingRef = useRef(false);
 
   useEffect(() => {
+    let cancelled = false;
+    cursorRef.current = 0;
+    seenIdsRef.current = new Set();
+    setFetchedLogs([]);
+
+    const fetchLogs = async () => {
+      if (isFetchingRef.current) return;
+      isFetchingRef.current = true;
+      try {
+        // keep reading pages until we are caught up
+        while (!cancelled) {
+          const response = await fetch(
+            `/api/process-logs/${id}?after=${cursorRef.current}&limit=${PAGE_SIZE}`
+          );
+          const { lines, ids, cursor } = await response.json();
+          if (cancelled) return;
+          cursorRef.current = cursor;
+          const seen = seenIdsRef.current;
+          const fresh = lines.filter((line, i) => !seen.has(ids[i]));
+          ids.forEach((logId) => seen.add(logId));
+          if (fresh.length) setFetchedLogs((logs) => logs.concat(fresh));
+          if (fresh.length < PAGE_SIZE) return;
+        }
+      } catch (error) {
+        console.error("Error fetching logs:", error);
+      } finally {
+        isFetchingRef.current = false;
+      }
+    };
+
     fetchLogs(); // Fetch logs immediately
 
     const interval = setInterval(() => {
-      fetchLogs();
+      // no polling in hidden tabs, the cursor catches up once shown again
+      if (!document.hidden) fetchLogs();
     }, 4000);
 
     return () => {
+      cancelled = true;
       clearInterval(interval);
     };
-  }, []);
-
-  const fetchLogs = async () => {
-    try {
-      const response = await fetch(`/api/process-logs/${id}`);
-      const data = await response.json();
-      setFetchedLogs(data);
-    } catch (error) {
-      console.error("Error fetching logs:", error);
-    }
-  };
+  }, [id]);
+
+  /* search & level filters, served by the structured log endpoint */
+  const [text, setText] = useState("");
+  const [searchText, setSearchText] = useState("");
+  const [levels, setLevels] = useState([]);
+  const [levelCounts, setLevelCounts] = useState({});
+  const searching = Boolean(searchText) || levels.length > 0;
+
+  useEffect(() => {
+    const timeout = setTimeout(() => setSearchText(text), 500);
+    return () => clearTimeout(timeout);
+  }, [text]);
+
+  // level counts of the whole report, while not searching
+  const { data: summary } = useQuery(
+    searching ? null : queryKey(`/api/process-log-records/${id}`, { limit: 1 })
+  );
+  useEffect(() => {
+    if (summary) setLevelCounts(summary.level_counts);
+  }, [summary]);
+
+  const toggleLevel = (level) =>
+    setLevels((current) =>
+      current.includes(level)
+        ? current.filter((l) => l !== level)
+        : [...current, level]
+    );
 
   return (
     <ProcessLogStyle>
       <div className="log-section">
         <h3>Log Information</h3>
-        <div className="log-content">
-          {fetchedLogs.map((log, index) => (
-            <div key={index}>{log}</div>
+        <div className="log-filters">
+          <input
+            placeholder="Search messages"
+            value={text}
+            onChange={(e) => setText(e.target.value)}
+          />
+          {Object.entries(levelCounts).map(([level, count]) => (
+            <span
+              key={level}
+              className={`log-level log-level-${level}${levels.includes(level) ? " active" : ""}`}
+              onClick={() => toggleLevel(level)}
+            >
+              {level} ({count})
+            </span>
           ))}
         </div>
+        {searching ? (
+          <LogSearch
+            id={id}
+            text={searchText}
+            levels={levels}
+            setLevelCounts={setLevelCounts}
+          />
+        ) : (
+          <div className="log-content">
+            {fetchedLogs.map((log, index) => (
+              <div key={index}>{log}</div>
+            ))}
+          </div>
+        )}
       </div>
     </ProcessLogStyle>
   );
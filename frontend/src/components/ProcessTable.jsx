@@ -133,6 +133,8 @@ export function ProcessTable() {
           columns       : processColumns,
           buildExtraActions: extraProcessActions,
           editableFields: ['label', 'description'],
+          // the actions also change the states shown by the open workflow pages
+          invalidates: ['/api/process', '/api/workchain-state'],
         }}
       />
     );
@@ -17,6 +17,7 @@ import {
   EditorWrapper,
 } from './ProcessItemStyles';
 import { ToastContainer, toast } from 'react-toastify';
+import useQuery, { fetchQuery, invalidateQueries } from '../hooks/useQuery';
 import 'react-toastify/dist/ReactToastify.css';
 
 
@@ -29,8 +30,8 @@ declare global {
 
 
 
-/* Modify the useRete function to support passing workflow data to createEditor */
-export function useRete<T extends { destroy(): void }>(
+/* Create the editor once per container, and load new workflow data into it in place */
+export function useRete<T extends { destroy(): void; load?(data: any): Promise<void> }>(
   create: (el: HTMLElement, data: any) => Promise<T>,
   workFlowData: any
 ) {
@@ -38,28 +39,41 @@ export function useRete<T extends { destroy(): void }>(
   const editorRef = useRef<T>();
   const [editor, setEditor] = useState<T | null>(null);
   const ref = useRef(null);
+  // the data shown by the editor, or being loaded into it
+  const dataRef = useRef(workFlowData);
+  dataRef.current = workFlowData;
+  const loadedRef = useRef<any>(null);
 
   useEffect(() => {
-    if (container) {
-      if (editorRef.current) {
-        editorRef.current.destroy();
-        container.innerHTML = '';
+    if (!container) return undefined;
+    let cancelled = false;
+    loadedRef.current = dataRef.current;
+    create(container, dataRef.current).then((value) => {
+      if (cancelled) {
+        value.destroy();
+        return;
       }
-      create(container, workFlowData).then((value) => {
-        editorRef.current = value;
-        setEditor(value);
-        window.editor = value;
-      });
-    }
-  }, [container, create, workFlowData]); // Add workFlowData as a dependency
-
-  useEffect(() => {
+      editorRef.current = value;
+      setEditor(value);
+      window.editor = value;
+    });
     return () => {
+      cancelled = true;
       if (editorRef.current) {
         editorRef.current.destroy();
+        editorRef.current = undefined;
+        setEditor(null);
+        container.innerHTML = '';
       }
     };
-  }, []);
+  }, [container, create]);
+
+  useEffect(() => {
+    if (editor && editor.load && loadedRef.current !== workFlowData) {
+      loadedRef.current = workFlowData;
+      editor.load(workFlowData);
+    }
+  }, [editor, workFlowData]);
 
   useEffect(() => {
     if (ref.current) {
@@ -95,76 +109,22 @@ function WorkflowItem({pathType = 'workchain', endPoint = 'workchain'}) {
   const subPath = location.pathname.startsWith(basePath)
     ? location.pathname.slice(basePath.length)
     : "";
+  // read by the node pick handler, which lives as long as the editor
+  const taskPathRef = useRef('');
+  taskPathRef.current = subPath ? `${pk}/${subPath}` : `${pk}`;
+
+  // Poll the state data from the backend while the realtime switch is on
+  const { data: stateData } = useQuery(
+    realtimeSwitch ? `${endPoint}-state/${pk}` : null,
+    { refetchInterval: 5000 }
+  );
 
-  // Fetch state data from the backend
-  const fetchStateData = async () => {
-    try {
-      const response = await fetch(`${endPoint}-state/${pk}`);
-      if (!response.ok) {
-        throw new Error('Failed to fetch state data');
-      }
-      const data = await response.json();
-      // Call changeTitleColor here to update title colors based on the new state data
-      changeTitleColor(data);
-    } catch (error) {
-      console.error('Error fetching state data:', error);
-    }
-  };
-
-  // Function to change the title color based on the state
-  const changeTitleColor = (stateData: any) => {
-    if (editor && editor.editor) {
-      const nodeEditor = editor.editor;
-      const nodes = nodeEditor.getNodes();
-      // Find all elements with data-testid="node"
-      const nodeElements = document.querySelectorAll('[data-testid="node"]');
-      console.log("stateData: ", stateData)
-      // Iterate through the elements and update title colors based on state
-      nodeElements.forEach((nodeElement) => {
-        const titleElement = nodeElement.querySelector('[data-testid="title"]')  as HTMLElement;
-        const nodeName = titleElement.textContent;
-        if (nodeName && nodeName in stateData) {
-            const nodeState = stateData[nodeName].state.toUpperCase();
-            if (nodeState === 'FINISHED') {
-              titleElement.style.background = 'green';
-            } else if (nodeState === 'RUNNING') {
-              titleElement.style.background = 'orange';
-            } else if (nodeState === 'CREATED') {
-              titleElement.style.background = 'blue';
-            } else if (nodeState === 'PLANNED') {
-              titleElement.style.background = 'gray';
-            } else if (nodeState === 'WAITING') {
-              titleElement.style.background = 'purple'; // Change to the desired color for "waiting"
-            } else if (nodeState === 'KILLED') {
-              titleElement.style.background = 'pink'; // Change to the desired color for "killed"
-            } else if (nodeState === 'PAUSED') {
-              titleElement.style.background = 'yellow'; // Change to the desired color for "paused"
-            } else if (nodeState === 'FAILED') {
-              titleElement.style.background = 'red'; // Change to the desired color for "failed"
-            } else {
-              // Handle any other states or provide a default color
-              titleElement.style.background = 'lightblue'; // Change to the desired default color
-            }
-        }
-      }
-      )};
-  }
-
-  // Setup interval for fetching real-time data when the switch is turned on
+  // Change the title color based on the state, in place
   useEffect(() => {
-    let intervalId: NodeJS.Timeout;
-    if (realtimeSwitch) {
-      // Fetch data initially
-      fetchStateData();
-      // Set up an interval to fetch data every 5 seconds
-      intervalId = setInterval(fetchStateData, 5000);
+    if (stateData && editor && editor.updateStates) {
+      editor.updateStates(stateData);
     }
-    return () => {
-      if (intervalId) {
-        clearInterval(intervalId); // Clear the interval when the component unmounts or the switch is turned off
-      }
-    };
-  }, [realtimeSwitch]); // Depend on the realtimeSwitch, pk, and editor
+  }, [stateData, editor]);
 
   // Setup interval for fetching real-time data when the switch is turned on
   useEffect(() => {
@@ -177,30 +137,30 @@ function WorkflowItem({pathType = 'workchain', endPoint = 'workchain'}) {
         console.log('Removing controls');
         removeControls(editor.editor, editor.area, workFlowData);
       }
-      // need to call layout to update the view
-      editor?.layout(true);
+      // need to call layout to update the view, the nodes changed size
+      editor?.layout(true, true);
     }
     return () => {
     };
   }, [detailNodeViewSwitch]); // Depend on the realtimeSwitch, pk, and editor
 
 
+  // The graph is fetched once, the states are polled separately. A refetch
+  // returning the same graph does not touch the editor.
+  const { data: fetchedWorkFlowData } = useQuery(
+    subPath ? `${endPoint}/${pk}/${subPath}` : `${endPoint}/${pk}`,
+    { staleTime: Infinity }
+  );
+  const workFlowJsonRef = useRef('');
   useEffect(() => {
-    let url;
-    if (subPath) {
-      url = `${endPoint}/${pk}/${subPath}`;
-    } else {
-      url = `${endPoint}/${pk}`;
+    if (fetchedWorkFlowData) {
+      const json = JSON.stringify(fetchedWorkFlowData);
+      if (json === workFlowJsonRef.current) return;
+      workFlowJsonRef.current = json;
+      setWorkFlowData(fetchedWorkFlowData);
+      setWorkFlowHierarchy(fetchedWorkFlowData.parent_workflows);
     }
-    console.log('Fetching workflow data from:', url);
-    fetch(url)
-      .then((response) => response.json())
-      .then((data) => {
-        setWorkFlowData(data);
-        setWorkFlowHierarchy(data.parent_workflows);
-      })
-      .catch((error) => console.error('Error fetching data:', error));
-  }, [pk, subPath]); // Only re-run when `pk` changes
+  }, [fetchedWorkFlowData]); // Only re-run when the data of `pk` changes
 
   // Setup editor event listener
   useEffect(() => {
@@ -214,21 +174,10 @@ function WorkflowItem({pathType = 'workchain', endPoint = 'workchain'}) {
 
           try {
             // Fetch data from the backend
-            let url;
-            if (subPath) {
-              url = `/api/task/${pk}/${subPath}/${node.label}`;
-            } else {
-              url = `/api/task/${pk}/${node.label}`;
-            }
+            const url = `/api/task/${taskPathRef.current}/${node.label}`;
             console.log('Fetching data from:', url);
-            const response = await fetch(url);
-            if (!response.ok) {
-              const errorText = await response.text(); // Read the error response
-              console.error(`Error fetching data from ${url}:`, errorText);
-              throw new Error(`Failed to fetch data: ${errorText}`);
-            }
-
-            const data = await response.json();
+            // shared with the other requests for the same task in flight
+            const data = await fetchQuery(url);
             // Update the component state with the fetched data
             setSelectedNode(data);
           } catch (error) {
@@ -286,6 +235,9 @@ function WorkflowItem({pathType = 'workchain', endPoint = 'workchain'}) {
               throw new Error(data.detail || `Failed to perform ${action}`);
             }
             console.log(data.message); // Display backend response message
+            // the states of the tasks changed, not the graph
+            invalidateQueries(`${endPoint}-state/${pk}`);
+            invalidateQueries('/api/process');
             toast.success(`${action} action performed successfully on nodes.`);
         } catch (error: any) {
             console.error('Error performing node action:', error);
@@ -335,7 +287,7 @@ function WorkflowItem({pathType = 'workchain', endPoint = 'workchain'}) {
                 </div>
               </div>
               <div>
-                <Button onClick={() => editor?.layout(true)}>Arrange</Button>
+                <Button onClick={() => editor?.layout(true, true)}>Arrange</Button>
                 <Button onClick={handlePause}>Pause</Button>
                 <Button onClick={handlePlay}>Play</Button>
                 <Button onClick={handleKill}>Kill</Button>
@@ -1,12 +1,14 @@
 import { useState, useRef, useEffect, useCallback } from 'react';
+import useQuery, { invalidateQueries, queryKey } from './useQuery';
 
-export default function useNodeTable(endpointBase) {
-  const [rows, setRows]           = useState([]);
-  const [rowCount, setRowCount]   = useState(0);
+/*
+ * `invalidates` are the prefixes of the queries refreshed after a change made
+ * from the table, by default the table and the pages of its nodes.
+ */
+export default function useNodeTable(endpointBase, invalidates = [endpointBase]) {
   const [pagination, setPagination] = useState({ page: 0, pageSize: 15 });
   const [sortModel, setSortModel] = useState([{ field: 'pk', sort: 'desc' }]);
   const [filterModel, setFilter]  = useState({ items: [] });
-  const isFetchingRef = useRef(false);
   /* hide description at first render – users can toggle in column menu */
   const [columnVisibilityModel, setColumnVisibilityModel] = useState({
     description: false,
@@ -15,35 +17,28 @@ export default function useNodeTable(endpointBase) {
     paused: false,
   });
 
-  const fetchData = useCallback(() => {
-    if (isFetchingRef.current) return;
-    isFetchingRef.current = true;
-
-    const { page, pageSize } = pagination;
-    const skip  = page * pageSize;
-    const sortField  = sortModel[0]?.field ?? 'pk';
-    const sortOrder  = sortModel[0]?.sort  ?? 'desc';
-    const url =
-      `${endpointBase}-data?skip=${skip}&limit=${pageSize}` +
-      `&sortField=${sortField}&sortOrder=${sortOrder}` +
-      `&filterModel=${encodeURIComponent(JSON.stringify(filterModel))}`;
-
-      fetch(url)
-      .then(r => r.json())
-      .then(({ data, total }) => {
-        setRows(data);
-        setRowCount(total);
-      })
-      .catch((e) => console.error("Fetch error", e))
-      .finally(() => { isFetchingRef.current = false; });
-  }, [endpointBase, pagination, sortModel, filterModel]);
+  const { page, pageSize } = pagination;
+  const key = queryKey(`${endpointBase}-data`, {
+    skip: page * pageSize,
+    limit: pageSize,
+    sortField: sortModel[0]?.field ?? 'pk',
+    sortOrder: sortModel[0]?.sort ?? 'desc',
+    filterModel,
+  });
+  /* fetch on mount & whenever deps change, then poll */
+  const { data } = useQuery(key, { refetchInterval: 3000 });
+  /* keep showing the previous page until the new one arrives */
+  const lastDataRef = useRef({ data: [], total: 0 });
+  if (data) lastDataRef.current = data;
+  const rows = lastDataRef.current.data;
+  const rowCount = lastDataRef.current.total;
+  /* after a change, refresh the queries it affects, e.g. the open process pages */
+  const prefixes = invalidates.join('\n');
+  const refetch = useCallback(
+    () => prefixes.split('\n').forEach((prefix) => invalidateQueries(prefix)),
+    [prefixes]
+  );
 
-  /* fetch on mount & whenever deps change */
-  useEffect(() => {
-    fetchData();
-    const interval = setInterval(fetchData, 3000);
-    return () => clearInterval(interval);
-  }, [fetchData]);
   /* reset to page 0 when a filter changes */
   useEffect(() => { setPagination(p => ({ ...p, page: 0 })); }, [filterModel]);
 
@@ -53,6 +48,6 @@ export default function useNodeTable(endpointBase) {
     columnVisibilityModel, setColumnVisibilityModel,
     sortModel, setSortModel,
     filterModel, setFilter,
-    refetch: fetchData,
+    refetch,
   };
 }
@@ -0,0 +1,154 @@
+import { useCallback, useEffect, useReducer } from 'react';
+
+/*
+ * Shared cache of the GET requests, keyed by endpoint + params.
+ *
+ * - identical requests in flight are deduplicated, whichever component sends them
+ * - cached data is returned at once and revalidated in the background when it
+ *   is older than `staleTime` (stale-while-revalidate)
+ * - polling pauses while the tab is hidden, and refreshes when it is shown again
+ * - entries no component uses are dropped after `CACHE_TIME`
+ */
+
+// keep unused entries for going back and forth between pages
+const CACHE_TIME = 5 * 60 * 1000;
+// data younger than this is served without a request
+const DEFAULT_STALE_TIME = 500;
+
+const cache = new Map();
+
+/** The cache key, i.e. the url, of `path` with the `params`, sorted by name. */
+export function queryKey(path, params = {}) {
+  const search = new URLSearchParams();
+  Object.keys(params).sort().forEach((name) => {
+    const value = params[name];
+    if (value === undefined || value === null) return;
+    (Array.isArray(value) ? value : [value]).forEach((item) =>
+      search.append(name, typeof item === 'object' ? JSON.stringify(item) : item)
+    );
+  });
+  const query = search.toString();
+  return query ? `${path}?${query}` : path;
+}
+
+function getEntry(key) {
+  let entry = cache.get(key);
+  if (!entry) {
+    entry = { data: undefined, error: null, updatedAt: 0, promise: null, listeners: new Set(), gcTimer: null };
+    cache.set(key, entry);
+  }
+  return entry;
+}
+
+/** Fetch `key`, or share the request in flight, or return the fresh cached data. */
+export function fetchQuery(key, { staleTime = DEFAULT_STALE_TIME } = {}) {
+  const entry = getEntry(key);
+  if (entry.promise) return entry.promise;
+  if (entry.updatedAt && Date.now() - entry.updatedAt < staleTime) {
+    return Promise.resolve(entry.data);
+  }
+  entry.promise = fetch(key)
+    .then(async (response) => {
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.detail || response.statusText);
+      return data;
+    })
+    .then(
+      (data) => {
+        entry.data = data;
+        entry.error = null;
+        entry.updatedAt = Date.now();
+        return data;
+      },
+      (error) => {
+        entry.error = error;
+        throw error;
+      }
+    )
+    .finally(() => {
+      entry.promise = null;
+      entry.listeners.forEach((listener) => listener());
+    });
+  return entry.promise;
+}
+
+/** Fetch `key` again, after the request in flight which may predate a change. */
+export function refetchQuery(key) {
+  const entry = getEntry(key);
+  entry.updatedAt = 0;
+  if (entry.promise) {
+    return entry.promise.catch(() => {}).then(() => fetchQuery(key, { staleTime: 0 }));
+  }
+  return fetchQuery(key, { staleTime: 0 });
+}
+
+/** Mark the entries starting with `prefix` stale, refetching those in use. */
+export function invalidateQueries(prefix = '') {
+  cache.forEach((entry, key) => {
+    if (!key.startsWith(prefix)) return;
+    entry.updatedAt = 0;
+    if (entry.listeners.size) {
+      refetchQuery(key).catch(() => {});
+    }
+  });
+}
+
+/**
+ * Read `key` through the shared cache, polling every `refetchInterval` ms
+ * while the tab is visible. A null `key` disables the query.
+ */
+export default function useQuery(key, { refetchInterval = 0, staleTime = DEFAULT_STALE_TIME } = {}) {
+  const [, rerender] = useReducer((count) => count + 1, 0);
+
+  useEffect(() => {
+    if (!key) return undefined;
+    const entry = getEntry(key);
+    entry.listeners.add(rerender);
+    clearTimeout(entry.gcTimer);
+
+    const refresh = () => {
+      fetchQuery(key, { staleTime }).catch((error) =>
+        console.error(`Error fetching ${key}:`, error)
+      );
+    };
+    let interval = null;
+    const start = () => {
+      if (refetchInterval && interval === null) interval = setInterval(refresh, refetchInterval);
+    };
+    const stop = () => {
+      clearInterval(interval);
+      interval = null;
+    };
+    const onVisibilityChange = () => {
+      if (document.hidden) {
+        stop();
+      } else {
+        refresh();
+        start();
+      }
+    };
+
+    refresh();
+    if (!document.hidden) start();
+    document.addEventListener('visibilitychange', onVisibilityChange);
+    return () => {
+      stop();
+      document.removeEventListener('visibilitychange', onVisibilityChange);
+      entry.listeners.delete(rerender);
+      if (!entry.listeners.size) {
+        entry.gcTimer = setTimeout(() => {
+          if (!entry.listeners.size && cache.get(key) === entry) cache.delete(key);
+        }, CACHE_TIME);
+      }
+    };
+  }, [key, refetchInterval, staleTime]);
+
+  const refetch = useCallback(() => (key ? refetchQuery(key) : Promise.resolve()), [key]);
+  const entry = key ? cache.get(key) : undefined;
+  return {
+    data: entry?.data,
+    error: entry?.error ?? null,
+    isLoading: Boolean(key) && entry?.data === undefined && !entry?.error,
+    refetch,
+  };
+}
@@ -18,7 +18,14 @@ import {
   Presets as ArrangePresets,
   ArrangeAppliers
 } from "rete-auto-arrange-plugin";
-import AtomsItem from './AtomsItem.js'; // Adjust the path as necessary
+import React, { Suspense, lazy } from "react";
+import { css } from "styled-components";
+
+// the 3D viewer is only downloaded when the detail view shows a structure
+const LazyAtomsItem = lazy(() => import('./AtomsItem.js'));
+function AtomsItem(props: any) {
+  return React.createElement(Suspense, { fallback: null }, React.createElement(LazyAtomsItem, props));
+}
 
 // May move these interfaces to a separate file
 interface NodeInput {
@@ -64,6 +71,10 @@ export async function loadJSON(editor: NodeEditor<any>, area: any, workgraphData
     const nodeData = workgraphData.nodes[nodeId];
     const node = createDynamicNode(nodeData);
     await editor.addNode(node);
+    if (workgraphData.layout === "layered") {
+      // positions computed by the server, see aiida_gui/app/layout.py
+      await area.translate(node.id, { x: nodeData.position[0], y: nodeData.position[1] });
+    }
     nodeMap[nodeId] = node; // Storing reference to the node
   }
   // Adding connections based on workgraphData
@@ -111,12 +122,51 @@ class Node extends ClassicPreset.Node <
   width = 180;
   height = 100;
   parent?: string;
+  // process state, shown as the color of the title
+  state?: string;
+  // outside of the viewport, only an empty box of the size of the node is rendered
+  culled = false;
 }
 class Connection<N extends Node> extends ClassicPreset.Connection<N, N> {}
 
 type Schemes = GetSchemes<Node, Connection<Node>>;
 type AreaExtra = ReactArea2D<any> | MinimapExtra | ContextMenuExtra;
 
+// below this zoom the sockets and controls are hidden, only the titles remain
+const COLLAPSE_ZOOM = 0.4;
+// smaller graphs are cheap enough to render completely
+const CULLING_MIN_NODES = 100;
+// margin around the viewport, in screen pixels, rendered ahead of panning
+const CULLING_MARGIN = 200;
+
+const stateColors: { [key: string]: string } = {
+  FINISHED: 'green',
+  RUNNING: 'orange',
+  CREATED: 'blue',
+  PLANNED: 'gray',
+  WAITING: 'purple',
+  KILLED: 'pink',
+  PAUSED: 'yellow',
+  FAILED: 'red',
+};
+
+export function stateColor(state: string) {
+  return stateColors[state.toUpperCase()] || 'lightblue';
+}
+
+/* The classic node, with the title colored by the process state of the node */
+function StateNode(props: any) {
+  const { culled, width, height, state } = props.data;
+  if (culled) {
+    // the sockets and controls are unmounted until the node is scrolled into view
+    return React.createElement('div', { style: { width: `${width}px`, height: `${height}px` } });
+  }
+  return React.createElement(Presets.classic.Node, {
+    ...props,
+    styles: state ? () => css`.title { background: ${stateColor(state)}; }` : undefined,
+  });
+}
+
 
 export function addControls(editor: NodeEditor<any>, area: any,
           workgraphData: any) {
@@ -200,6 +250,15 @@ const customPadding = () => ({
   bottom: 50
 });
 
+/* The graph without the process states, two graphs with the same structure are only updated in place */
+function graphStructure(workgraphData: any) {
+  const nodes = workgraphData.nodes || {};
+  return JSON.stringify({
+    nodes: Object.keys(nodes).map((label) => [label, nodes[label].inputs, nodes[label].outputs]),
+    links: workgraphData.links || [],
+  });
+}
+
 export async function createEditor(container: HTMLElement, workgraphData: any) {
   container.innerHTML = ''
 
@@ -222,12 +281,14 @@ export async function createEditor(container: HTMLElement, workgraphData: any) {
   });
   AreaExtensions.showInputControl(area);
 
-  render.addPreset(Presets.classic.setup());
   render.addPreset(Presets.contextMenu.setup());
   render.addPreset(Presets.minimap.setup({ size: 200 }));
   render.addPreset(
     Presets.classic.setup({
       customize: {
+        node() {
+          return StateNode;
+        },
         control(data) {
           if (data.payload instanceof AtomsControl) {
             return AtomsItem;
@@ -264,17 +325,105 @@ export async function createEditor(container: HTMLElement, workgraphData: any) {
 
   await loadJSON(editor, area, workgraphData);
 
-  async function layout(animate: boolean) {
-    await arrange.layout({ applier: animate ? applier : undefined });
+  // arranging a large graph in the browser is slow, keep the server layout
+  // unless the user asks for it or the size of the nodes changed
+  async function layout(animate: boolean, force: boolean = false) {
+    if (force || workgraphData.layout !== "layered") {
+      await arrange.layout({ applier: animate ? applier : undefined });
+    }
     AreaExtensions.zoomAt(area, editor.getNodes());
   };
 
   await layout(true)
 
+  // Viewport culling: the nodes outside of the view are rendered as empty
+  // boxes, the connections between them are hidden, and zooming out
+  // collapses the nodes to their title.
+  const culled = new Set<string>();
+  let cullingFrame: number | null = null;
+
+  function cull() {
+    cullingFrame = null;
+    const { k, x, y } = area.area.transform;
+    container.classList.toggle('rete-collapsed', k < COLLAPSE_ZOOM);
+    const nodes = editor.getNodes();
+    if (nodes.length < CULLING_MIN_NODES) return;
+    const left = (-x - CULLING_MARGIN) / k;
+    const top = (-y - CULLING_MARGIN) / k;
+    const right = (container.clientWidth - x + CULLING_MARGIN) / k;
+    const bottom = (container.clientHeight - y + CULLING_MARGIN) / k;
+    for (const node of nodes) {
+      const view = area.nodeViews.get(node.id);
+      if (!view) continue;
+      const { x: nodeX, y: nodeY } = view.position;
+      const visible = nodeX < right && nodeX + node.width > left
+        && nodeY < bottom && nodeY + node.height > top;
+      if (visible === culled.has(node.id)) {
+        node.culled = !visible;
+        if (visible) {
+          culled.delete(node.id);
+        } else {
+          culled.add(node.id);
+        }
+        area.update('node', node.id);
+      }
+    }
+    for (const connection of editor.getConnections()) {
+      const view = area.connectionViews.get(connection.id);
+      if (!view) continue;
+      // the sockets of a culled node are not rendered, so neither is its position
+      const hidden = culled.has(connection.source) || culled.has(connection.target);
+      view.element.style.visibility = hidden ? 'hidden' : '';
+    }
+  }
+
+  area.addPipe((context) => {
+    if (['translated', 'zoomed', 'nodetranslated', 'resized'].includes(context.type)
+        && cullingFrame === null) {
+      cullingFrame = requestAnimationFrame(cull);
+    }
+    return context;
+  });
+  cull();
+
+  // Update the process states in place, re-rendering only the changed nodes
+  let nodesByLabel = new Map(editor.getNodes().map((node) => [node.label, node]));
+  async function updateStates(stateData: any) {
+    for (const label in stateData) {
+      const node = nodesByLabel.get(label);
+      const state = stateData[label].state;
+      if (node && node.state !== state) {
+        node.state = state;
+        await area.update('node', node.id);
+      }
+    }
+  }
+
+  // Show new data in the same editor: the same graph keeps the nodes and the
+  // viewport, another graph replaces the nodes
+  let structure = graphStructure(workgraphData);
+  async function load(data: any) {
+    const newStructure = graphStructure(data);
+    workgraphData = data;
+    if (newStructure === structure) return;
+    structure = newStructure;
+    culled.clear();
+    await editor.clear();
+    await loadJSON(editor, area, data);
+    nodesByLabel = new Map(editor.getNodes().map((node) => [node.label, node]));
+    await layout(false);
+    cull();
+  }
+
   return {
     editor: editor,
     area: area,
     layout: layout,
-    destroy: () => area.destroy()
+    load: load,
+    updateStates: updateStates,
+    destroy: () => {
+      if (cullingFrame !== null) cancelAnimationFrame(cullingFrame);
+      area.destroy();
+    }
   };
 }
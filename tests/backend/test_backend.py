@@ -14,3 +14,685 @@ def test_workgraph_route(client):
     """Sample test case for the root route"""
     response = client.get("/api/workchain-data")
     assert response.status_code == 200
+
+
+@pytest.mark.backend
+def test_groupnode_counts(client):
+    """The group table rows and the summary carry the number of members."""
+    from aiida import orm
+
+    group = orm.Group(label="test_groupnode_counts").store()
+    nodes = [orm.Int(i).store() for i in range(3)]
+    group.add_nodes(nodes)
+
+    response = client.get("/api/groupnode-data?limit=500")
+    assert response.status_code == 200
+    rows = {row["pk"]: row for row in response.json()["data"]}
+    assert rows[group.pk]["count"] == 3
+
+    response = client.delete(f"/api/groupnode/{group.pk}/members/remove/{nodes[0].pk}")
+    assert response.status_code == 200
+    # removing through the GUI invalidates the cached count
+    assert client.get(f"/api/groupnode/{group.pk}").json()["count"] == 2
+    members = client.get(f"/api/groupnode/{group.pk}/members-data").json()
+    assert members["total"] == 2
+
+
+@pytest.mark.backend
+def test_groupnode_bulk_members(client):
+    """Nodes can be added and removed in bulk, by pks or by a DataGrid filter."""
+    import json
+    from aiida import orm
+
+    group = orm.Group(label="test_groupnode_bulk_members").store()
+    nodes = [orm.Int(i).store() for i in range(4)]
+    nodes[0].label = "keep"
+
+    url = f"/api/groupnode/{group.pk}/members"
+    response = client.post(f"{url}/add", json={"pks": [n.pk for n in nodes]})
+    assert response.status_code == 200
+    assert group.count() == 4
+    # the nodes already in the group are skipped
+    response = client.post(f"{url}/add", json={"pks": [nodes[0].pk]})
+    assert response.status_code == 200
+    assert group.count() == 4
+
+    response = client.post(f"{url}/remove", json={"pks": [nodes[1].pk]})
+    assert response.json()["count"] == 1
+    assert group.count() == 3
+
+    # the filtered removal only touches the memberships of this group
+    other = orm.Group(label="test_groupnode_bulk_members_other").store()
+    other.add_nodes([nodes[0]])
+    filter_model = {"items": [{"field": "label", "value": "keep"}]}
+    response = client.post(
+        f"{url}/remove", json={"filterModel": json.dumps(filter_model)}
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert {n.pk for n in group.nodes} == {nodes[2].pk, nodes[3].pk}
+    assert other.count() == 1
+
+
+@pytest.mark.backend
+def test_delete_in_background(client):
+    """A background deletion returns a job that can be polled until it finishes."""
+    import time
+    from aiida import orm
+    from aiida.common.exceptions import NotExistent
+
+    node = orm.Int(1).store()
+    response = client.delete(f"/api/datanode/delete/{node.pk}?background=True")
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+
+    for _ in range(100):
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] not in ("queued", "running"):
+            break
+        time.sleep(0.1)
+    assert job["status"] == "finished"
+    assert job["progress"] == {"traversed": 1, "deleted": 1}
+    with pytest.raises(NotExistent):
+        orm.load_node(node.pk)
+
+
+@pytest.mark.backend
+def test_delete_with_dry_run_token(client):
+    """The dry-run token is only reused while the node set is unchanged."""
+    from aiida import orm
+    from aiida.common.exceptions import NotExistent
+    from aiida_gui.app.deletion import dry_run_delete, pop_dry_run
+
+    node = orm.Int(1).store()
+    _, token = dry_run_delete([node.pk])
+    node.label = "modified"
+    assert pop_dry_run(token, [node.pk]) is None
+
+    response = client.delete(f"/api/datanode/delete/{node.pk}?dry_run=True")
+    data = response.json()
+    assert data["deleted_nodes"] == [node.pk]
+    response = client.delete(f"/api/datanode/delete/{node.pk}?token={data['token']}")
+    assert response.json()["deleted"] is True
+    with pytest.raises(NotExistent):
+        orm.load_node(node.pk)
+
+
+@pytest.mark.backend
+def test_process_logs_cursor(client):
+    """Polling with a cursor only returns the log lines added since."""
+    from datetime import timedelta
+    from aiida import orm
+    from aiida.common.links import LinkType
+    from aiida.common import timezone
+
+    def report(node, message, time=None):
+        time = time or timezone.now()
+        orm.Log(time, "aiida.test", "REPORT", node.pk, message).store()
+
+    parent = orm.WorkflowNode().store()
+    child = orm.CalculationNode()
+    child.base.links.add_incoming(parent, link_type=LinkType.CALL_CALC, link_label="c")
+    child.store()
+    report(parent, "old message", timezone.now() - timedelta(hours=1))
+    report(parent, "parent message")
+    report(child, "child message")
+
+    data = client.get(f"/api/process-logs/{parent.pk}?after=0").json()
+    assert [line.split("]:")[-1].strip() for line in data["lines"]] == [
+        "old message",
+        "parent message",
+        "child message",
+    ]
+
+    report(child, "new message")
+    cursor = data["cursor"]
+    data = client.get(f"/api/process-logs/{parent.pk}?after={cursor}&limit=1").json()
+    # the entries recorded shortly before the cursor are sent again, for the
+    # late commits, but not the older ones
+    new = [line for line, id in zip(data["lines"], data["ids"]) if id > cursor]
+    assert len(new) == 1
+    assert new[0].endswith("new message")
+    assert [line.split("]:")[-1].strip() for line in data["lines"]] == [
+        "parent message",
+        "child message",
+        "new message",
+    ]
+    assert data["cursor"] == max(data["ids"])
+
+
+@pytest.mark.backend
+def test_process_log_records(client):
+    """Log records can be filtered by level, text and process subtree."""
+    from aiida import orm
+    from aiida.common.links import LinkType
+    from aiida.common import timezone
+
+    def log(node, levelname, message):
+        orm.Log(timezone.now(), "aiida.test", levelname, node.pk, message).store()
+
+    parent = orm.WorkflowNode().store()
+    child = orm.CalculationNode()
+    child.base.links.add_incoming(parent, link_type=LinkType.CALL_CALC, link_label="c")
+    child.store()
+    log(parent, "REPORT", "submitted child")
+    log(child, "ERROR", "child failed badly")
+    log(child, "REPORT", "child retrying")
+
+    url = f"/api/process-log-records/{parent.pk}"
+    data = client.get(url).json()
+    assert data["total"] == 3
+    assert data["level_counts"] == {"REPORT": 2, "ERROR": 1}
+
+    data = client.get(url, params={"level": "ERROR"}).json()
+    assert [r["message"] for r in data["data"]] == ["child failed badly"]
+    assert data["data"][0]["depth"] == 1
+
+    data = client.get(url, params={"text": "child", "process": child.pk}).json()
+    assert data["total"] == 2
+    assert data["level_counts"] == {"REPORT": 1, "ERROR": 1}
+
+    # the wildcards of the search text match literally
+    log(parent, "REPORT", "progress 100% of step_1")
+    assert client.get(url, params={"text": "100%"}).json()["total"] == 1
+    assert client.get(url, params={"text": "%"}).json()["total"] == 1
+    data = client.get(url, params={"text": "_"}).json()
+    assert [r["message"] for r in data["data"]] == ["progress 100% of step_1"]
+    assert data["level_counts"] == {"REPORT": 1}
+
+
+@pytest.mark.backend
+def test_daemon_status_snapshot(client):
+    """Daemon reads are served from a shared snapshot."""
+    from aiida_gui.app.daemon import DaemonMonitor
+
+    monitor = DaemonMonitor(interval=60)
+    first = monitor.snapshot()
+    assert monitor.snapshot() is first
+
+    response = client.get("/api/daemon/status")
+    assert response.status_code == 200
+    assert response.json()["running"] is False
+
+
+@pytest.mark.backend
+def test_worker_history_ring_buffer():
+    """The worker history keeps a bounded number of samples per worker."""
+    from aiida_gui.app.daemon import WorkerHistory
+
+    history = WorkerHistory(size=3, interval=1)
+    for now in range(5):
+        history.record({"1": {"cpu": now, "children": []}}, now)
+    series = history.to_dict()[1]
+    assert series["time"] == [2, 3, 4]
+    assert series["cpu"] == [2, 3, 4]
+
+    # a stopped worker is forgotten once its samples left the window
+    history.record({}, 10)
+    assert history.to_dict() == {}
+
+
+@pytest.mark.backend
+def test_daemon_metrics(client):
+    """The metrics count the processes per state and the recent throughput."""
+    from aiida import orm
+
+    node = orm.WorkflowNode()
+    node.set_process_state("waiting")
+    node.store()
+
+    data = client.get("/api/daemon/metrics?window=5").json()
+    assert data["states"]["waiting"] >= 1
+    assert data["created_per_minute"] >= 1 / 5
+    assert data["active"] == sum(data["states"].values())
+
+
+@pytest.mark.backend
+def test_termination_tracker():
+    """Finished processes are counted when they terminate, not when edited."""
+    from datetime import timedelta
+    from aiida import orm
+    from aiida.common import timezone
+    from aiida_gui.app.daemon import TerminationTracker
+
+    running = orm.WorkflowNode()
+    running.set_process_state("running")
+    running.store()
+    done = orm.WorkflowNode()
+    done.set_process_state("finished")
+    done.store()
+
+    tracker = TerminationTracker(keep=3600)
+    tracker.observe()
+    running.set_process_state("finished")
+    # editing a process that ended before does not make it finish again
+    done.base.extras.set("edited", True)
+    tracker.observe()
+    assert tracker.count(timezone.now() - timedelta(minutes=5)) == 1
+
+
+@pytest.mark.backend
+def test_daemon_monitor_starts_one_poller():
+    """Concurrent first reads start a single poller thread."""
+    import threading
+    from aiida_gui.app.daemon import DaemonMonitor
+
+    monitor = DaemonMonitor(interval=60)
+    started = []
+    stop = threading.Event()
+
+    def poll():
+        started.append(threading.get_ident())
+        stop.wait()
+
+    monitor._poll = poll
+    barrier = threading.Barrier(8)
+
+    def start():
+        barrier.wait()
+        monitor.start()
+
+    threads = [threading.Thread(target=start) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stop.set()
+    assert len(started) == 1
+
+
+@pytest.mark.backend
+def test_plugin_registry_is_lazy(monkeypatch):
+    """Plugins are listed from their entry points and imported only on demand."""
+    from importlib.metadata import EntryPoint
+    from aiida_gui.app.plugin import PluginRegistry
+
+    loaded = []
+    entry = EntryPoint("dummy", "dummy_plugin:plugin", "aiida_gui.plugins")
+    monkeypatch.setattr(EntryPoint, "load", lambda self: loaded.append(1) or {})
+
+    registry = PluginRegistry()
+    monkeypatch.setattr(registry, "_read_entry_points", lambda: {"dummy": entry})
+    assert registry.names() == ["dummy"]
+    assert registry.metadata()["dummy"]["loaded"] is False
+    assert loaded == []
+
+    registry.load("dummy")
+    registry.load("dummy")
+    assert loaded == [1]
+
+
+@pytest.mark.backend
+def test_metrics_middleware_is_outermost(client):
+    """The metrics include the other middlewares, e.g. the lazy plugin import."""
+    from aiida_gui.app.metrics import MetricsMiddleware
+    from aiida_gui.app.plugin import LazyPluginMiddleware
+
+    middleware = [entry.cls for entry in client.app.user_middleware]
+    assert middleware[0] is MetricsMiddleware
+    assert LazyPluginMiddleware in middleware[1:]
+
+
+@pytest.mark.backend
+def test_router_import_time():
+    """Importing the routers and the app does not pull in heavy optional dependencies."""
+    import json
+    import subprocess
+    import sys
+
+    code = """
+import json, sys, time
+heavy = ("ase", "scipy", "weas_widget", "aiida_workgraph")
+result = {}
+start = time.perf_counter()
+import aiida_gui.app.daemon, aiida_gui.app.data_node, aiida_gui.app.group_node
+import aiida_gui.app.jobs, aiida_gui.app.process_node, aiida_gui.app.task
+import aiida_gui.app.workchain
+result["routers"] = time.perf_counter() - start
+# the app mounts the plugins lazily, so they are not imported either
+start = time.perf_counter()
+import aiida_gui.app.api
+result["api"] = time.perf_counter() - start
+result["heavy"] = [name for name in heavy if name in sys.modules]
+print(json.dumps(result))
+"""
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+    print(f"Importing the routers took {result['routers']:.2f} s")
+    print(f"Importing the app took {result['api']:.2f} s")
+    assert result["heavy"] == []
+
+
+@pytest.mark.backend
+def test_jobs_dir_per_profile(tmp_path):
+    """The jobs of different profiles are kept in different directories."""
+    from aiida.manage import get_manager
+    from aiida_gui.app.jobs import JobManager, get_jobs_dir_path, job_manager
+
+    assert get_jobs_dir_path("one") != get_jobs_dir_path("two")
+    assert job_manager.path.name == get_manager().get_profile().name
+    # the directory is resolved on first use, once the profile is loaded
+    assert JobManager(lambda: tmp_path).path == tmp_path
+
+
+@pytest.mark.backend
+def test_jobs_shared_between_processes(tmp_path):
+    """Jobs are read from their files, and cancelled through a marker file."""
+    import json
+    import threading
+    import time
+    from aiida_gui.app.jobs import Job, JobManager
+
+    # a job left running by a server process that is gone
+    dead = Job("delete", "dead").to_dict()
+    dead.update(status="running", owner=2**22 + 1)
+    (tmp_path / f"{dead['id']}.json").write_text(json.dumps(dead))
+
+    started = threading.Event()
+
+    def wait_for_cancel(job):
+        started.set()
+        while True:
+            running.check_cancelled(job)
+
+    running = JobManager(tmp_path)
+    job = running.submit("delete", "running", wait_for_cancel)
+    started.wait(timeout=5)
+
+    other = JobManager(tmp_path)
+    jobs = {job.id: job for job in other.list()}
+    assert jobs[dead["id"]].status == "interrupted"
+    assert jobs[job.id].status == "running"
+    assert other.cancel(job.id)
+    for _ in range(50):
+        if other.get(job.id).status == "cancelled":
+            break
+        time.sleep(0.1)
+    assert other.get(job.id).status == "cancelled"
+
+
+@pytest.mark.backend
+def test_compression(client, tmp_path):
+    """Large JSON is compressed, static files are served precompressed."""
+    import gzip
+    from starlette.applications import Starlette
+    from starlette.testclient import TestClient
+    from aiida_gui.app.static import PrecompressedStaticFiles
+
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "paths" in response.json()
+    response = client.get("/api", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    content = b"console.log('aiida');" * 100
+    (tmp_path / "main.js").write_bytes(content)
+    (tmp_path / "main.js.gz").write_bytes(gzip.compress(content))
+    static_app = Starlette()
+    static_app.mount("/static", PrecompressedStaticFiles(directory=tmp_path))
+    static_client = TestClient(static_app)
+    response = static_client.get("/static/main.js", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/javascript") or (
+        response.headers["content-type"].startswith("application/javascript")
+    )
+    assert response.content == content
+    response = static_client.get(
+        "/static/main.js", headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in response.headers
+    assert response.content == content
+
+
+@pytest.mark.backend
+def test_static_cache_headers(tmp_path):
+    """Hashed assets are immutable, the app shell is revalidated with its ETag."""
+    from starlette.applications import Starlette
+    from starlette.testclient import TestClient
+    from aiida_gui.app.static import (
+        InMemoryFile,
+        PrecompressedStaticFiles,
+        SinglePageApp,
+    )
+
+    (tmp_path / "main.3f2a9c1e.js").write_text("console.log('aiida');")
+    (tmp_path / "index.html").write_text("<html>aiida</html>")
+    static_app = Starlette()
+    static_app.mount("/static", PrecompressedStaticFiles(directory=tmp_path))
+    static_app.router.default = SinglePageApp(
+        InMemoryFile(tmp_path / "index.html", "text/html"), static_app.router.default
+    )
+    client = TestClient(static_app)
+
+    response = client.get("/static/main.3f2a9c1e.js")
+    assert "immutable" in response.headers["cache-control"]
+    response = client.get("/static/index.html")
+    assert response.headers["cache-control"] == "no-cache"
+
+    response = client.get("/processes/12")
+    assert response.status_code == 200
+    assert response.text == "<html>aiida</html>"
+    etag = response.headers["etag"]
+    response = client.get("/processes/12", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.backend
+def test_fast_json_response():
+    """Datetimes, numpy arrays and sets are serialized without jsonable_encoder."""
+    import datetime
+    import json
+    import numpy as np
+    from aiida_gui.app.responses import FastJSONResponse
+
+    now = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+    response = FastJSONResponse(
+        {"time": now, "positions": np.eye(2), "pks": {1}, 3: "int key"}
+    )
+    data = json.loads(response.body)
+    assert data["time"].startswith("2024-01-02T03:04:05")
+    assert data["positions"] == [[1.0, 0.0], [0.0, 1.0]]
+    assert data["pks"] == [1]
+    assert data["3"] == "int key"
+    # orjson rejects integers over 64 bits, the stdlib encoder takes over
+    assert json.loads(FastJSONResponse({"big": 2**70}).body) == {"big": 2**70}
+
+
+@pytest.mark.backend
+def test_metrics_endpoint(client):
+    """Requests are counted per route template, with their SQL statements."""
+    from aiida import orm
+
+    node = orm.Int(1).store()
+    assert client.get(f"/api/datanode/{node.pk}").status_code == 200
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert (
+        'aiida_gui_http_requests_total{method="GET",route="/api/datanode/{id}",'
+        'status="200"}' in text
+    )
+    assert "aiida_gui_http_requests_in_flight 1" in text
+    for line in text.splitlines():
+        if line.startswith(
+            'aiida_gui_db_statements_per_request_count{method="GET",'
+            'route="/api/datanode/{id}"}'
+        ):
+            break
+    else:
+        raise AssertionError("no statement histogram for the route")
+    # loading the node executed at least one statement
+    assert (
+        'aiida_gui_db_statements_per_request_bucket{method="GET",'
+        'route="/api/datanode/{id}",le="0"} 0' in text
+    )
+
+
+@pytest.mark.backend
+def test_server_timing_and_slow_request_profile(client, tmp_path):
+    """The Server-Timing header is switched on at runtime, slow requests profiled."""
+    import time
+    from aiida import orm
+    from aiida_gui.app.profiling import ProfilingConfig, SlowRequestProfiler
+
+    node = orm.Int(1).store()
+    response = client.put("/debug/profiling", json={"server_timing": True})
+    assert response.status_code == 200
+    try:
+        response = client.get(f"/api/process/{node.pk}")
+        timing = response.headers["server-timing"]
+        assert timing.startswith("db;dur=")
+        assert "links;dur=" in timing
+        assert "serialize;dur=" in timing
+    finally:
+        client.put("/debug/profiling", json={"server_timing": False})
+    assert "server-timing" not in client.get("/api").headers
+
+    # the profile directory comes from the settings only
+    response = client.put(
+        "/debug/profiling", json={"profile_threshold": 1, "profile_dir": "/tmp"}
+    )
+    assert response.status_code == 422
+    assert client.get("/debug/profiling").json()["profile_threshold"] is None
+    for interval in (1e-9, 60):
+        response = client.put("/debug/profiling", json={"sample_interval": interval})
+        assert response.status_code == 422
+
+    profiler = SlowRequestProfiler(
+        ProfilingConfig(profile_threshold=0.05, profile_dir=str(tmp_path))
+    )
+    fast = profiler.begin("GET", "/api/fast")
+    assert profiler.end(fast, "/api/fast") is None
+    slow = profiler.begin("GET", "/api/workchain/1")
+    time.sleep(0.5)
+    path = profiler.end(slow, "/api/workchain/{id}")
+    assert path.parent == tmp_path
+    assert "api_workchain_id" in path.name
+    assert "test_server_timing_and_slow_request_profile" in path.read_text()
+
+
+@pytest.mark.backend
+def test_single_flight_coalescing(client):
+    """Identical concurrent reads share one computation, writes invalidate it."""
+    import asyncio
+    import threading
+    import time
+    from aiida import orm
+    from aiida_gui.app.coalesce import SingleFlight, bump_generation
+
+    calls = []
+    lock = threading.Lock()
+
+    def compute(value):
+        with lock:
+            calls.append(value)
+        time.sleep(0.2)
+        return {"value": value}
+
+    flight = SingleFlight(ttl=60)
+
+    async def concurrent_reads():
+        return await asyncio.gather(*[flight.run("key", compute, 1) for _ in range(5)])
+
+    results = asyncio.run(concurrent_reads())
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+    # served from the result kept for the TTL, until a write happens
+    assert asyncio.run(flight.run("key", compute, 1)) is results[0]
+    bump_generation()
+    asyncio.run(flight.run("key", compute, 1))
+    assert calls == [1, 1]
+
+    # the session of the threadpool thread is closed after the computation
+    def query_session():
+        from aiida.manage import get_manager
+
+        orm.QueryBuilder().append(orm.Node).count()
+        return get_manager().get_profile_storage().get_session()
+
+    session = asyncio.run(flight.run("session", query_session))
+    assert not session.in_transaction()
+
+    # a write through the API invalidates the table pages
+    node = orm.Int(1).store()
+    url = "/api/datanode-data?limit=500"
+    assert node.pk in [row["pk"] for row in client.get(url).json()["data"]]
+    client.put(f"/api/datanode-data/{node.pk}", json={"label": "renamed"})
+    rows = {row["pk"]: row for row in client.get(url).json()["data"]}
+    assert rows[node.pk]["label"] == "renamed"
+
+
+@pytest.mark.backend
+def test_layered_layout():
+    """Nodes are placed in layers following the links, without overlaps."""
+    from aiida_gui.app.layout import layered_layout, get_layout, layout_cache
+
+    def task(*sockets):
+        return {"inputs": [{"name": name} for name in sockets], "outputs": []}
+
+    nodes = {1: task(), 2: task("x"), 3: task("x"), 4: task("x", "y")}
+    links = [
+        {"from_node": 1, "to_node": 2},
+        {"from_node": 1, "to_node": 3},
+        {"from_node": 2, "to_node": 4},
+        {"from_node": 3, "to_node": 4},
+        # a cycle must not break the layering
+        {"from_node": 4, "to_node": 1},
+    ]
+    positions = layered_layout(nodes, links)
+    assert positions[1][0] < positions[2][0] == positions[3][0] < positions[4][0]
+    assert positions[2][1] != positions[3][1]
+
+    layout_cache.invalidate()
+    graph = {"nodes": nodes, "links": links}
+    cached = get_layout("uuid", True, graph)
+    assert get_layout("uuid", True, {"nodes": {}, "links": []}) is cached
+    assert get_layout("other", False, graph) is not get_layout("other", False, graph)
+
+
+@pytest.mark.backend
+def test_provenance_neighborhood(client):
+    """The neighborhood is bounded by the depth, the link types and max_nodes."""
+    from aiida import orm
+    from aiida.common.links import LinkType
+
+    # x -> calc -> result -> calc2 -> result2
+    x = orm.Int(1).store()
+    calc = orm.CalculationNode()
+    calc.base.links.add_incoming(x, link_type=LinkType.INPUT_CALC, link_label="x")
+    calc.store()
+    result = orm.Int(2)
+    result.base.links.add_incoming(calc, link_type=LinkType.CREATE, link_label="y")
+    result.store()
+    calc2 = orm.CalculationNode()
+    calc2.base.links.add_incoming(result, link_type=LinkType.INPUT_CALC, link_label="x")
+    calc2.store()
+    result2 = orm.Int(3)
+    result2.base.links.add_incoming(calc2, link_type=LinkType.CREATE, link_label="y")
+    result2.store()
+
+    data = client.get(f"/api/provenance/{calc.pk}").json()
+    assert {node["pk"] for node in data["nodes"]} == {x.pk, calc.pk, result.pk}
+    assert {(link["source"], link["target"]) for link in data["links"]} == {
+        (x.pk, calc.pk),
+        (calc.pk, result.pk),
+    }
+    assert not data["truncated"]
+
+    data = client.get(
+        f"/api/provenance/{calc.pk}?depth=3&direction=outgoing&link_type=create"
+    ).json()
+    assert {node["pk"]: node["depth"] for node in data["nodes"]} == {
+        calc.pk: 0,
+        result.pk: 1,
+    }
+
+    data = client.get(f"/api/provenance/{x.pk}?depth=4&max_nodes=3").json()
+    assert [node["pk"] for node in data["nodes"]] == [x.pk, calc.pk, result.pk]
+    assert data["truncated"]
+
+    assert client.get(f"/api/provenance/{x.pk}?link_type=unknown").status_code == 400
+    assert client.get("/api/provenance/999999999").status_code == 404
@@ -0,0 +1,92 @@
+"""Compare the JSON serialization of representative payloads.
+
+Run with ``python tests/benchmarks/bench_json_serialization.py``. For each
+payload it times the default FastAPI path (``jsonable_encoder`` followed by
+the stdlib ``JSONResponse``), ``FastJSONResponse`` after ``jsonable_encoder``
+(the default response class of the app), and ``FastJSONResponse`` returned
+directly by the endpoint.
+"""
+import datetime
+import timeit
+import uuid
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from aiida_gui.app.responses import FastJSONResponse, orjson
+
+
+def process_table(rows=500):
+    """A page of ``/api/process-data``."""
+    return {
+        "total": 100000,
+        "data": [
+            {
+                "pk": pk,
+                "uuid": str(uuid.uuid4()),
+                "ctime": f"{pk % 60} minutes ago",
+                "node_type": "process.workflow.workchain.WorkChainNode.",
+                "process_label": "PwBaseWorkChain",
+                "process_state": "Finished",
+                "process_status": None,
+                "exit_status": 0,
+                "exit_message": None,
+                "paused": False,
+                "label": f"scf calculation {pk}",
+                "description": "",
+            }
+            for pk in range(rows)
+        ],
+    }
+
+
+def node_summary(links=300):
+    """The ``get_node_summary`` of a workflow with many inputs and outputs."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    link = [
+        [f"link_{i}", i, "Dict", now - datetime.timedelta(seconds=i)]
+        for i in range(links)
+    ]
+    return {
+        "table": [["pk", "1"], ["ctime", now], ["mtime", now]],
+        "inputs": link,
+        "outputs": link,
+        "called": link,
+        "caller": [],
+    }
+
+
+def trajectory(steps=200, atoms=64):
+    """A ``TrajectoryData`` with numpy positions."""
+    return {
+        "node_type": "data.core.array.trajectory.TrajectoryData.",
+        "extras": [
+            {"positions": np.random.rand(atoms, 3), "cell": np.eye(3) * 10}
+            for _ in range(steps)
+        ],
+    }
+
+
+def benchmark(name, payload, number=20):
+    timings = {
+        "stdlib": lambda: JSONResponse(jsonable_encoder(payload)),
+        "fast (default class)": lambda: FastJSONResponse(jsonable_encoder(payload)),
+        "fast (direct)": lambda: FastJSONResponse(payload),
+    }
+    if name == "trajectory":
+        # the stdlib encoder cannot serialize numpy arrays on its own
+        timings["stdlib"] = lambda: JSONResponse(
+            jsonable_encoder(payload, custom_encoder={np.ndarray: np.ndarray.tolist})
+        )
+    print(f"{name}:")
+    for label, func in timings.items():
+        seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+        print(f"  {label:<22}{seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    print(f"orjson: {'installed' if orjson is not None else 'not installed'}")
+    benchmark("process table", process_table())
+    benchmark("node summary", node_summary())
+    benchmark("trajectory", trajectory())
@@ -0,0 +1,46 @@
+import importlib.util
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+# the benchmarks need the pytest-benchmark plugin
+if importlib.util.find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_bench_*.py"]
+
+
+def pytest_collection_modifyitems(items):
+    # select or deselect the suite with `-m benchmark`
+    for item in items:
+        if "benchmarks" in str(item.fspath):
+            item.add_marker(pytest.mark.benchmark)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def aiida_profile(aiida_config, aiida_profile_factory):
+    """Create and load a profile for the benchmarks."""
+    with aiida_profile_factory(aiida_config, broker_backend="core.rabbitmq") as profile:
+        os.environ["AIIDA_WORKGRAPH_GUI_PROFILE"] = profile.name
+        yield profile
+
+
+@pytest.fixture(scope="session")
+def client(aiida_profile):
+    from aiida_gui.app.api import app
+
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def sizes():
+    from synthetic import get_sizes
+
+    return get_sizes()
+
+
+@pytest.fixture(scope="session")
+def dataset(aiida_profile, sizes):
+    """The synthetic provenance, built once for the whole suite."""
+    from synthetic import create_dataset
+
+    return create_dataset(sizes)
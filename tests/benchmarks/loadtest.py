@@ -0,0 +1,243 @@
+"""Simulate many browser sessions polling the GUI at the same time.
+
+Each session is a browser tab open on one page, and replays the polling of
+that page in the frontend:
+
+- ``table``: the process table, ``useNodeTable.js`` every 3 s
+- ``workflow``: a workchain page, the ``-state`` polling of ``WorkFlowItem.tsx``
+  every 5 s (``ProcessDuration.js`` polls the same endpoint), and the log
+  tailing of ``ProcessLog.js`` every 4 s, which only asks for the entries
+  after the ``cursor`` of its previous response
+- ``daemon``: the daemon page, ``Daemon.js`` polls the workers every second,
+  the metrics and the worker history every 10 s
+
+Like the frontend, a poller skips a tick while its previous request is still
+running. At the end the throughput, the p50/p99 latency per endpoint and the
+SQL statement rate read from ``/metrics`` are reported.
+
+Against a running server::
+
+    python tests/benchmarks/loadtest.py --url http://127.0.0.1:8000 --sessions 50
+
+or in-process, on the profile ``AIIDA_WORKGRAPH_GUI_PROFILE`` (or the default
+one)::
+
+    python tests/benchmarks/loadtest.py --sessions 50 --duration 60
+
+In-process, the app shares the event loop of the simulated sessions, like a
+single server worker.
+"""
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from urllib.parse import quote
+
+import click
+import httpx
+
+TABLE_FILTER = quote(json.dumps({"items": []}))
+# lines per request of ``ProcessLog.js``
+LOG_PAGE_SIZE = 2000
+
+
+class LogTail:
+    """The url of the log tailing, advanced to the cursor of each response."""
+
+    def __init__(self, process):
+        self.process = process
+        self.cursor = 0
+
+    def __call__(self):
+        return f"/api/process-logs/{self.process}?after={self.cursor}&limit={LOG_PAGE_SIZE}"
+
+    def advance(self, response):
+        self.cursor = response.json().get("cursor", self.cursor)
+
+
+def page_pollers(page, workchain):
+    """The (name, url, interval) polled by a tab open on ``page``.
+
+    The url is either a string or, for the pollers that depend on their
+    previous response, a callable with an ``advance(response)`` method.
+    """
+    if page == "table":
+        return [
+            (
+                "process-data",
+                "/api/process-data?skip=0&limit=15&sortField=pk&sortOrder=desc"
+                f"&filterModel={TABLE_FILTER}",
+                3,
+            )
+        ]
+    if page == "workflow":
+        return [
+            ("workchain-state", f"/api/workchain-state/{workchain}", 5),
+            ("process-logs", LogTail(workchain), 4),
+        ]
+    if page == "daemon":
+        return [
+            ("daemon-worker", "/api/daemon/worker", 1),
+            ("daemon-metrics", "/api/daemon/metrics", 10),
+            ("daemon-worker-history", "/api/daemon/worker-history", 10),
+        ]
+    raise ValueError(f"Unknown page {page}")
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.skipped = defaultdict(int)
+
+
+async def poll(client, recorder, name, url, interval, deadline):
+    # the tabs were not all opened at the same instant
+    await asyncio.sleep(random.uniform(0, interval))
+    next_tick = time.perf_counter()
+    while next_tick < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url() if callable(url) else url)
+            if response.status_code >= 400:
+                recorder.errors[name] += 1
+            elif callable(url):
+                url.advance(response)
+        except httpx.HTTPError:
+            recorder.errors[name] += 1
+        elapsed = time.perf_counter() - start
+        recorder.latencies[name].append(elapsed)
+        next_tick += interval
+        now = time.perf_counter()
+        while next_tick < now:
+            # the browser timer fired while the request was running
+            recorder.skipped[name] += 1
+            next_tick += interval
+        await asyncio.sleep(max(0.0, next_tick - now))
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def scrape_statements(client):
+    """Return the SQL statements executed so far, and the time spent in them."""
+    response = await client.get("/metrics")
+    statements = seconds = 0.0
+    for line in response.text.splitlines():
+        if line.startswith(
+            (
+                "aiida_gui_db_statements_per_request_sum",
+                "aiida_gui_db_background_statements_total",
+            )
+        ):
+            statements += float(line.rsplit(" ", 1)[1])
+        elif line.startswith(
+            (
+                "aiida_gui_db_statement_seconds_total",
+                "aiida_gui_db_background_statement_seconds_total",
+            )
+        ):
+            seconds += float(line.rsplit(" ", 1)[1])
+    return statements, seconds
+
+
+def latest_workchain():
+    from aiida import orm
+
+    qb = orm.QueryBuilder()
+    qb.append(orm.WorkflowNode, project="id", tag="process")
+    qb.order_by({"process": {"id": "desc"}})
+    return qb.first(flat=True)
+
+
+async def run(client, sessions, duration, mix, workchain):
+    pages = [page for page, weight in mix.items() for _ in range(weight)]
+    recorder = Recorder()
+    statements_before, seconds_before = await scrape_statements(client)
+    start = time.perf_counter()
+    deadline = start + duration
+    tasks = []
+    for i in range(sessions):
+        page = pages[i % len(pages)]
+        for name, url, interval in page_pollers(page, workchain):
+            tasks.append(poll(client, recorder, name, url, interval, deadline))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    statements_after, seconds_after = await scrape_statements(client)
+
+    total = sum(len(values) for values in recorder.latencies.values())
+    click.echo(f"{sessions} sessions for {elapsed:.1f} s, {total / elapsed:.1f} req/s")
+    click.echo(
+        f"{'endpoint':<28}{'requests':>9}{'req/s':>8}{'p50 ms':>9}{'p99 ms':>9}"
+        f"{'errors':>8}{'skipped':>9}"
+    )
+    for name, values in sorted(recorder.latencies.items()):
+        click.echo(
+            f"{name:<28}{len(values):>9}{len(values) / elapsed:>8.1f}"
+            f"{percentile(values, 0.5) * 1000:>9.1f}"
+            f"{percentile(values, 0.99) * 1000:>9.1f}"
+            f"{recorder.errors[name]:>8}{recorder.skipped[name]:>9}"
+        )
+    statements = statements_after - statements_before
+    click.echo(
+        f"SQL: {statements / elapsed:.1f} statements/s, "
+        f"{(seconds_after - seconds_before) / elapsed:.2f} s of database time per second"
+        " (from /metrics, of one server worker)"
+    )
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        page, _, weight = item.partition("=")
+        page_pollers(page, 0)  # validate the page name
+        mix[page] = int(weight or 1)
+    return mix
+
+
+@click.command()
+@click.option("--url", default=None, help="Server to load, in-process if not given.")
+@click.option("--sessions", "-n", default=20, show_default=True, type=int)
+@click.option("--duration", "-d", default=30.0, show_default=True, type=float)
+@click.option(
+    "--mix",
+    default="table=5,workflow=3,daemon=2",
+    show_default=True,
+    help="Weights of the pages open in the sessions.",
+)
+@click.option("--workchain", type=int, help="Process of the workflow pages.")
+def main(url, sessions, duration, mix, workchain):
+    """Simulate browser sessions polling the GUI and report the latencies."""
+    mix = parse_mix(mix)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if url is None:
+        from aiida_gui.app.api import app
+
+        transport = httpx.ASGITransport(app=app)
+        url = "http://aiida-gui"
+    else:
+        transport = None
+
+    async def main_async():
+        async with httpx.AsyncClient(
+            base_url=url, transport=transport, limits=limits, timeout=60
+        ) as client:
+            nonlocal workchain
+            if workchain is None and "workflow" in mix:
+                if transport is None:
+                    raise click.UsageError("--workchain is required with --url")
+                workchain = latest_workchain()
+                if workchain is None:
+                    raise click.UsageError(
+                        "No workflow in the profile, pass --workchain"
+                    )
+            await run(client, sessions, duration, mix, workchain)
+
+    asyncio.run(main_async())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Build synthetic provenance graphs at scale for the benchmarks.
+
+The sizes are those of a large production profile, multiplied by the
+``AIIDA_GUI_BENCH_SCALE`` environment variable (0.01 by default, 1 for the
+full size). The nodes are stored in batches inside storage transactions.
+"""
+import os
+
+from aiida import orm
+from aiida.common import timezone
+from aiida.common.links import LinkType
+
+FULL_SIZES = {
+    "processes": 100_000,
+    "workchain_children": 5_000,
+    "workgraph_tasks": 1_000,
+    "group_members": 200_000,
+    "trajectory_frames": 10_000,
+    "log_records": 10_000,
+}
+BATCH_SIZE = 1_000
+# an entry point that exists in aiida-core, so that ``process_class`` loads
+PROCESS_TYPE = "aiida.calculations:core.arithmetic.add"
+
+
+def get_sizes(scale=None):
+    if scale is None:
+        scale = float(os.environ.get("AIIDA_GUI_BENCH_SCALE", "0.01"))
+    return {name: max(1, int(size * scale)) for name, size in FULL_SIZES.items()}
+
+
+def _batches(n):
+    for start in range(0, n, BATCH_SIZE):
+        yield range(start, min(start + BATCH_SIZE, n))
+
+
+def _transaction():
+    from aiida.manage import get_manager
+
+    return get_manager().get_profile_storage().transaction()
+
+
+def _process(node_cls, index, state="finished"):
+    node = node_cls()
+    node.set_process_type(PROCESS_TYPE)
+    node.set_process_label(f"{node_cls.__name__}{index % 7}")
+    node.set_process_state(state)
+    if state == "finished":
+        node.set_exit_status(index % 3)
+    node.label = f"process {index}"
+    return node
+
+
+def create_processes(n):
+    """Stand-alone calculations in various states, for the process tables."""
+    states = ["finished", "finished", "finished", "excepted", "waiting", "running"]
+    pks = []
+    for batch in _batches(n):
+        with _transaction():
+            for i in batch:
+                node = _process(orm.CalcFunctionNode, i, states[i % len(states)])
+                pks.append(node.store().pk)
+    return pks
+
+
+def create_workchain(children):
+    """A workchain calling ``children`` calculations, each using the previous result."""
+    parent = _process(orm.WorkChainNode, 0, "running")
+    parent.store()
+    previous = orm.Int(0).store()
+    for batch in _batches(children):
+        with _transaction():
+            for i in batch:
+                child = _process(orm.CalcFunctionNode, i)
+                child.base.links.add_incoming(
+                    parent, link_type=LinkType.CALL_CALC, link_label=f"step_{i}"
+                )
+                child.base.links.add_incoming(
+                    previous, link_type=LinkType.INPUT_CALC, link_label="x"
+                )
+                child.store()
+                result = orm.Int(i)
+                result.base.links.add_incoming(
+                    child, link_type=LinkType.CREATE, link_label="result"
+                )
+                previous = result.store()
+    return parent.pk
+
+
+def create_log_records(node_pk, n):
+    """Log records of all levels attached to one process."""
+    levels = ["REPORT", "REPORT", "INFO", "WARNING", "ERROR"]
+    for batch in _batches(n):
+        with _transaction():
+            for i in batch:
+                orm.Log(
+                    timezone.now(),
+                    "aiida.bench",
+                    levels[i % len(levels)],
+                    node_pk,
+                    f"message {i}: iteration converged after {i % 50} steps",
+                ).store()
+
+
+def create_group(members):
+    """A group of ``members`` data nodes."""
+    group = orm.Group(label=f"bench-group-{members}").store()
+    for batch in _batches(members):
+        with _transaction():
+            nodes = [orm.Int(i).store() for i in batch]
+        group.add_nodes(nodes)
+    return group.pk
+
+
+def create_trajectory(frames, atoms=8):
+    """A trajectory of ``frames`` steps with ``atoms`` atoms each."""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    trajectory = orm.TrajectoryData()
+    trajectory.set_trajectory(
+        symbols=["Si"] * atoms,
+        positions=rng.random((frames, atoms, 3)) * 5,
+        cells=np.tile(np.eye(3) * 5, (frames, 1, 1)),
+    )
+    return trajectory.store().pk
+
+
+def create_workgraph(tasks):
+    """A saved, not run, workgraph with a chain of ``tasks`` tasks."""
+    from aiida_workgraph import WorkGraph
+
+    wg = WorkGraph(name="bench_workgraph")
+    previous = wg.add_task("workgraph.test_sum_diff", "task_0", x=1, y=2)
+    for i in range(1, tasks):
+        task = wg.add_task("workgraph.test_sum_diff", f"task_{i}", x=1)
+        wg.add_link(previous.outputs[0], task.inputs[1])
+        previous = task
+    wg.save()
+    return wg.pk
+
+
+def create_dataset(sizes):
+    """Build all the synthetic data, return the pks used by the benchmarks."""
+    workchain = create_workchain(sizes["workchain_children"])
+    create_log_records(workchain, sizes["log_records"])
+    create_processes(sizes["processes"])
+    return {
+        "workchain": workchain,
+        "group": create_group(sizes["group_members"]),
+        "trajectory": create_trajectory(sizes["trajectory_frames"]),
+        "workgraph": create_workgraph(sizes["workgraph_tasks"]),
+    }
@@ -0,0 +1,116 @@
+"""Benchmark the routers on a synthetic large profile.
+
+Run with ``pytest tests/benchmarks``, and set ``AIIDA_GUI_BENCH_SCALE=1``
+for the full-size profile. Compare against a saved run with
+``--benchmark-autosave`` and ``--benchmark-compare``.
+"""
+import json
+
+import pytest
+
+
+def get_ok(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.text
+    return response
+
+
+TABLES = ["process", "workchain", "datanode", "groupnode"]
+
+
+@pytest.mark.benchmark(group="tables")
+@pytest.mark.parametrize("prefix", TABLES)
+def test_table_first_page(benchmark, client, dataset, prefix):
+    url = f"/api/{prefix}-data?skip=0&limit=100&sortField=pk&sortOrder=desc"
+    benchmark(get_ok, client, url)
+
+
+@pytest.mark.benchmark(group="tables")
+def test_process_table_filtered(benchmark, client, dataset):
+    filter_model = {
+        "items": [{"field": "process_label", "operator": "contains", "value": "Calc"}]
+    }
+    url = f"/api/process-data?limit=100&filterModel={json.dumps(filter_model)}"
+    benchmark(get_ok, client, url)
+
+
+@pytest.mark.benchmark(group="tables")
+def test_process_table_last_page(benchmark, client, dataset, sizes):
+    skip = max(0, sizes["processes"] - 100)
+    benchmark(get_ok, client, f"/api/process-data?skip={skip}&limit=100")
+
+
+@pytest.mark.benchmark(group="workchain")
+def test_workchain_detail(benchmark, client, dataset):
+    benchmark(get_ok, client, f"/api/workchain/{dataset['workchain']}")
+
+
+@pytest.mark.benchmark(group="workchain")
+def test_process_summary(benchmark, client, dataset):
+    benchmark(get_ok, client, f"/api/process/{dataset['workchain']}")
+
+
+@pytest.mark.benchmark(group="workchain")
+def test_workchain_task(benchmark, client, dataset):
+    response = get_ok(client, f"/api/workchain/{dataset['workchain']}")
+    pk = next(iter(response.json()["nodes"]))
+    benchmark(get_ok, client, f"/api/task/{dataset['workchain']}/step-{pk}")
+
+
+@pytest.mark.benchmark(group="workgraph")
+def test_workgraph_task(benchmark, client, dataset, sizes):
+    task = f"task_{sizes['workgraph_tasks'] - 1}"
+    benchmark(get_ok, client, f"/api/task/{dataset['workgraph']}/{task}")
+
+
+@pytest.mark.benchmark(group="workgraph")
+def test_workgraph_state(benchmark, client, dataset):
+    benchmark(get_ok, client, f"/api/workchain-state/{dataset['workgraph']}")
+
+
+@pytest.mark.benchmark(group="logs")
+def test_process_logs(benchmark, client, dataset):
+    benchmark(get_ok, client, f"/api/process-logs/{dataset['workchain']}")
+
+
+@pytest.mark.benchmark(group="logs")
+def test_process_logs_tail(benchmark, client, dataset):
+    url = f"/api/process-logs/{dataset['workchain']}?after=0&limit=1000"
+    benchmark(get_ok, client, url)
+
+
+@pytest.mark.benchmark(group="logs")
+def test_process_log_records(benchmark, client, dataset):
+    url = (
+        f"/api/process-log-records/{dataset['workchain']}"
+        "?skip=0&limit=100&level=ERROR&text=converged"
+    )
+    benchmark(get_ok, client, url)
+
+
+@pytest.mark.benchmark(group="groups")
+def test_group_summary(benchmark, client, dataset):
+    benchmark(get_ok, client, f"/api/groupnode/{dataset['group']}")
+
+
+@pytest.mark.benchmark(group="groups")
+def test_group_members_page(benchmark, client, dataset):
+    url = f"/api/groupnode/{dataset['group']}/members-data?limit=100"
+    benchmark(get_ok, client, url)
+
+
+@pytest.mark.benchmark(group="datanode")
+def test_trajectory(benchmark, client, dataset):
+    benchmark.pedantic(
+        get_ok, args=(client, f"/api/datanode/{dataset['trajectory']}"), rounds=3
+    )
+
+
+@pytest.mark.benchmark(group="serialization")
+@pytest.mark.parametrize("payload", ["process_table", "node_summary", "trajectory"])
+def test_json_serialization(benchmark, payload):
+    import bench_json_serialization
+    from aiida_gui.app.responses import FastJSONResponse
+
+    content = getattr(bench_json_serialization, payload)()
+    benchmark(FastJSONResponse, content)
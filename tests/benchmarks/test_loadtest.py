@@ -0,0 +1,39 @@
+def test_loadtest_in_process(client):
+    """A short in-process run reports every polled endpoint."""
+    import asyncio
+    import httpx
+    from click.testing import CliRunner
+    from aiida import orm
+    from loadtest import main, page_pollers, run
+
+    workchain = orm.WorkflowNode().store().pk
+    assert [name for name, _, _ in page_pollers("daemon", workchain)] == [
+        "daemon-worker",
+        "daemon-metrics",
+        "daemon-worker-history",
+    ]
+    result = CliRunner().invoke(
+        main, ["--sessions", "3", "--duration", "2", "--mix", "table,daemon"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "process-data" in result.output
+    assert "daemon-worker" in result.output
+    assert "statements/s" in result.output
+
+    async def workflow_run():
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(
+            base_url="http://aiida-gui", transport=transport
+        ) as async_client:
+            await run(async_client, 1, 1, {"workflow": 1}, workchain)
+
+    asyncio.run(workflow_run())
+
+    # the log tailing continues from the cursor of the previous response
+    node = orm.load_node(workchain)
+    node.logger.report("first")
+    _, tail, _ = page_pollers("workflow", workchain)[-1]
+    assert "after=0" in tail()
+    tail.advance(client.get(tail()))
+    assert tail.cursor > 0
+    assert f"after={tail.cursor}" in tail()